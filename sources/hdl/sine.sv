@@ -37,9 +37,10 @@ module sine_lut(input wire [9:0] phase_in, input wire clk_in, output logic signe
   // Initialize ROM with sine values (0 to π/2)
   // Values calculated as: round(sin(i * π / 512) * 2^31-1)
   initial begin
-     sine_rom[0] = 32'sd0; sine_rom[1] = 32'sd13176712; sine_rom[2] = 32'sd26352928; sine_rom[3] = 32'sd39528151;
-    sine_rom[4] = 32'sd52701887; sine_rom[5] = 32'sd65873638; sine_rom[6] = 32'sd79042909; sine_rom[7] = 32'sd92209205;        
-    sine_rom[8] = 32'sd105372028; sine_rom[9] = 32'sd118530885; sine_rom[10] = 32'sd131685278; sine_rom[11] = 32'sd144834714;  
+    // lutgen:begin sine_quarter f7679ffdf93bf275 -- generated by sources/scripts/lutgen, do not edit
+    sine_rom[0] = 32'sd0; sine_rom[1] = 32'sd13176712; sine_rom[2] = 32'sd26352928; sine_rom[3] = 32'sd39528151;
+    sine_rom[4] = 32'sd52701887; sine_rom[5] = 32'sd65873638; sine_rom[6] = 32'sd79042909; sine_rom[7] = 32'sd92209205;
+    sine_rom[8] = 32'sd105372028; sine_rom[9] = 32'sd118530885; sine_rom[10] = 32'sd131685278; sine_rom[11] = 32'sd144834714;
     sine_rom[12] = 32'sd157978697; sine_rom[13] = 32'sd171116732; sine_rom[14] = 32'sd184248325; sine_rom[15] = 32'sd197372981;
     sine_rom[16] = 32'sd210490206; sine_rom[17] = 32'sd223599506; sine_rom[18] = 32'sd236700388; sine_rom[19] = 32'sd249792358;
     sine_rom[20] = 32'sd262874923; sine_rom[21] = 32'sd275947592; sine_rom[22] = 32'sd289009871; sine_rom[23] = 32'sd302061269;
@@ -101,6 +102,7 @@ module sine_lut(input wire [9:0] phase_in, input wire clk_in, output logic signe
     sine_rom[244] = 32'sd2141664947; sine_rom[245] = 32'sd2142593970; sine_rom[246] = 32'sd2143442325; sine_rom[247] = 32'sd2144209981;
     sine_rom[248] = 32'sd2144896909; sine_rom[249] = 32'sd2145503082; sine_rom[250] = 32'sd2146028479; sine_rom[251] = 32'sd2146473079;
     sine_rom[252] = 32'sd2146836865; sine_rom[253] = 32'sd2147119824; sine_rom[254] = 32'sd2147321945; sine_rom[255] = 32'sd2147443221;
+    // lutgen:end sine_quarter
   end
 
   logic [1:0] quadrant_delayed;
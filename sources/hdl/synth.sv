@@ -63,134 +63,136 @@ module synth #(
 
     // Frequency Lookup
     logic [127:0][31:0] note_freqs; 
-    assign note_freqs[0] = 32'd702;
-    assign note_freqs[1] = 32'd743;
-    assign note_freqs[2] = 32'd788;
-    assign note_freqs[3] = 32'd835;
-    assign note_freqs[4] = 32'd884;
-    assign note_freqs[5] = 32'd937;
-    assign note_freqs[6] = 32'd993;
-    assign note_freqs[7] = 32'd1052;
-    assign note_freqs[8] = 32'd1114;
-    assign note_freqs[9] = 32'd1181;
-    assign note_freqs[10] = 32'd1251;
-    assign note_freqs[11] = 32'd1325;
-    assign note_freqs[12] = 32'd1404;
-    assign note_freqs[13] = 32'd1487;
-    assign note_freqs[14] = 32'd1576;
-    assign note_freqs[15] = 32'd1670;
-    assign note_freqs[16] = 32'd1769;
-    assign note_freqs[17] = 32'd1874;
-    assign note_freqs[18] = 32'd1986;
-    assign note_freqs[19] = 32'd2104;
-    assign note_freqs[20] = 32'd2229;
-    assign note_freqs[21] = 32'd2362;
-    assign note_freqs[22] = 32'd2502;
-    assign note_freqs[23] = 32'd2651;
-    assign note_freqs[24] = 32'd2808;
-    assign note_freqs[25] = 32'd2975;
-    assign note_freqs[26] = 32'd3152;
-    assign note_freqs[27] = 32'd3340;
-    assign note_freqs[28] = 32'd3539;
-    assign note_freqs[29] = 32'd3749;
-    assign note_freqs[30] = 32'd3972;
-    assign note_freqs[31] = 32'd4208;
-    assign note_freqs[32] = 32'd4458;
-    assign note_freqs[33] = 32'd4724;
-    assign note_freqs[34] = 32'd5004;
-    assign note_freqs[35] = 32'd5302;
-    assign note_freqs[36] = 32'd5617;
-    assign note_freqs[37] = 32'd5951;
-    assign note_freqs[38] = 32'd6305;
-    assign note_freqs[39] = 32'd6680;
-    assign note_freqs[40] = 32'd7078;
-    assign note_freqs[41] = 32'd7498;
-    assign note_freqs[42] = 32'd7944;
-    assign note_freqs[43] = 32'd8417;
-    assign note_freqs[44] = 32'd8917;
-    assign note_freqs[45] = 32'd9448;
-    assign note_freqs[46] = 32'd10009;
-    assign note_freqs[47] = 32'd10605;
-    assign note_freqs[48] = 32'd11235;
-    assign note_freqs[49] = 32'd11903;
-    assign note_freqs[50] = 32'd12611;
-    assign note_freqs[51] = 32'd13361;
-    assign note_freqs[52] = 32'd14156;
-    assign note_freqs[53] = 32'd14997;
-    assign note_freqs[54] = 32'd15889;
-    assign note_freqs[55] = 32'd16834;
-    assign note_freqs[56] = 32'd17835;
-    assign note_freqs[57] = 32'd18896;
-    assign note_freqs[58] = 32'd20019;
-    assign note_freqs[59] = 32'd21210;
-    assign note_freqs[60] = 32'd22471;
-    assign note_freqs[61] = 32'd23807;
-    assign note_freqs[62] = 32'd25223;
-    assign note_freqs[63] = 32'd26722;
-    assign note_freqs[64] = 32'd28312;
-    assign note_freqs[65] = 32'd29995;
-    assign note_freqs[66] = 32'd31779;
-    assign note_freqs[67] = 32'd33668;
-    assign note_freqs[68] = 32'd35670;
-    assign note_freqs[69] = 32'd37792;
-    assign note_freqs[70] = 32'd40039;
-    assign note_freqs[71] = 32'd42420;
-    assign note_freqs[72] = 32'd44942;
-    assign note_freqs[73] = 32'd47614;
-    assign note_freqs[74] = 32'd50446;
-    assign note_freqs[75] = 32'd53445;
-    assign note_freqs[76] = 32'd56624;
-    assign note_freqs[77] = 32'd59991;
-    assign note_freqs[78] = 32'd63558;
-    assign note_freqs[79] = 32'd67337;
-    assign note_freqs[80] = 32'd71341;
-    assign note_freqs[81] = 32'd75584;
-    assign note_freqs[82] = 32'd80078;
-    assign note_freqs[83] = 32'd84840;
-    assign note_freqs[84] = 32'd89885;
-    assign note_freqs[85] = 32'd95229;
-    assign note_freqs[86] = 32'd100892;
-    assign note_freqs[87] = 32'd106891;
-    assign note_freqs[88] = 32'd113248;
-    assign note_freqs[89] = 32'd119982;
-    assign note_freqs[90] = 32'd127116;
-    assign note_freqs[91] = 32'd134675;
-    assign note_freqs[92] = 32'd142683;
-    assign note_freqs[93] = 32'd151168;
-    assign note_freqs[94] = 32'd160156;
-    assign note_freqs[95] = 32'd169680;
-    assign note_freqs[96] = 32'd179770;
-    assign note_freqs[97] = 32'd190459;
-    assign note_freqs[98] = 32'd201785;
-    assign note_freqs[99] = 32'd213783;
-    assign note_freqs[100] = 32'd226496;
-    assign note_freqs[101] = 32'd239964;
-    assign note_freqs[102] = 32'd254233;
-    assign note_freqs[103] = 32'd269350;
-    assign note_freqs[104] = 32'd285367;
-    assign note_freqs[105] = 32'd302336;
-    assign note_freqs[106] = 32'd320313;
-    assign note_freqs[107] = 32'd339360;
-    assign note_freqs[108] = 32'd359540;
-    assign note_freqs[109] = 32'd380919;
-    assign note_freqs[110] = 32'd403570;
-    assign note_freqs[111] = 32'd427567;
-    assign note_freqs[112] = 32'd452992;
-    assign note_freqs[113] = 32'd479928;
-    assign note_freqs[114] = 32'd508466;
-    assign note_freqs[115] = 32'd538701;
-    assign note_freqs[116] = 32'd570734;
-    assign note_freqs[117] = 32'd604672;
-    assign note_freqs[118] = 32'd640627;
-    assign note_freqs[119] = 32'd678721;
-    assign note_freqs[120] = 32'd719080;
-    assign note_freqs[121] = 32'd761839;
-    assign note_freqs[122] = 32'd807140;
-    assign note_freqs[123] = 32'd855135;
-    assign note_freqs[124] = 32'd905984;
-    assign note_freqs[125] = 32'd959857;
-    assign note_freqs[126] = 32'd1016933;
-    assign note_freqs[127] = 32'd1077403;
+    // lutgen:begin note_phase_incr cb917dd5371e7146 -- generated by sources/scripts/lutgen (SAMPLE_RATE 48000 Hz, A4 = 440 Hz, 12-EDO), do not edit
+    assign note_freqs[0] = 32'd731558;
+    assign note_freqs[1] = 32'd775059;
+    assign note_freqs[2] = 32'd821146;
+    assign note_freqs[3] = 32'd869974;
+    assign note_freqs[4] = 32'd921705;
+    assign note_freqs[5] = 32'd976513;
+    assign note_freqs[6] = 32'd1034579;
+    assign note_freqs[7] = 32'd1096099;
+    assign note_freqs[8] = 32'd1161276;
+    assign note_freqs[9] = 32'd1230329;
+    assign note_freqs[10] = 32'd1303488;
+    assign note_freqs[11] = 32'd1380998;
+    assign note_freqs[12] = 32'd1463116;
+    assign note_freqs[13] = 32'd1550118;
+    assign note_freqs[14] = 32'd1642292;
+    assign note_freqs[15] = 32'd1739948;
+    assign note_freqs[16] = 32'd1843411;
+    assign note_freqs[17] = 32'd1953026;
+    assign note_freqs[18] = 32'd2069159;
+    assign note_freqs[19] = 32'd2192197;
+    assign note_freqs[20] = 32'd2322552;
+    assign note_freqs[21] = 32'd2460658;
+    assign note_freqs[22] = 32'd2606977;
+    assign note_freqs[23] = 32'd2761996;
+    assign note_freqs[24] = 32'd2926232;
+    assign note_freqs[25] = 32'd3100235;
+    assign note_freqs[26] = 32'd3284585;
+    assign note_freqs[27] = 32'd3479896;
+    assign note_freqs[28] = 32'd3686822;
+    assign note_freqs[29] = 32'd3906052;
+    assign note_freqs[30] = 32'd4138318;
+    assign note_freqs[31] = 32'd4384395;
+    assign note_freqs[32] = 32'd4645104;
+    assign note_freqs[33] = 32'd4921317;
+    assign note_freqs[34] = 32'd5213953;
+    assign note_freqs[35] = 32'd5523991;
+    assign note_freqs[36] = 32'd5852465;
+    assign note_freqs[37] = 32'd6200470;
+    assign note_freqs[38] = 32'd6569170;
+    assign note_freqs[39] = 32'd6959793;
+    assign note_freqs[40] = 32'd7373644;
+    assign note_freqs[41] = 32'd7812103;
+    assign note_freqs[42] = 32'd8276635;
+    assign note_freqs[43] = 32'd8768789;
+    assign note_freqs[44] = 32'd9290209;
+    assign note_freqs[45] = 32'd9842633;
+    assign note_freqs[46] = 32'd10427907;
+    assign note_freqs[47] = 32'd11047982;
+    assign note_freqs[48] = 32'd11704930;
+    assign note_freqs[49] = 32'd12400941;
+    assign note_freqs[50] = 32'd13138339;
+    assign note_freqs[51] = 32'd13919586;
+    assign note_freqs[52] = 32'd14747287;
+    assign note_freqs[53] = 32'd15624207;
+    assign note_freqs[54] = 32'd16553270;
+    assign note_freqs[55] = 32'd17537579;
+    assign note_freqs[56] = 32'd18580418;
+    assign note_freqs[57] = 32'd19685267;
+    assign note_freqs[58] = 32'd20855814;
+    assign note_freqs[59] = 32'd22095965;
+    assign note_freqs[60] = 32'd23409859;
+    assign note_freqs[61] = 32'd24801882;
+    assign note_freqs[62] = 32'd26276679;
+    assign note_freqs[63] = 32'd27839171;
+    assign note_freqs[64] = 32'd29494575;
+    assign note_freqs[65] = 32'd31248413;
+    assign note_freqs[66] = 32'd33106541;
+    assign note_freqs[67] = 32'd35075158;
+    assign note_freqs[68] = 32'd37160835;
+    assign note_freqs[69] = 32'd39370534;
+    assign note_freqs[70] = 32'd41711627;
+    assign note_freqs[71] = 32'd44191930;
+    assign note_freqs[72] = 32'd46819719;
+    assign note_freqs[73] = 32'd49603764;
+    assign note_freqs[74] = 32'd52553357;
+    assign note_freqs[75] = 32'd55678342;
+    assign note_freqs[76] = 32'd58989149;
+    assign note_freqs[77] = 32'd62496826;
+    assign note_freqs[78] = 32'd66213081;
+    assign note_freqs[79] = 32'd70150316;
+    assign note_freqs[80] = 32'd74321671;
+    assign note_freqs[81] = 32'd78741067;
+    assign note_freqs[82] = 32'd83423255;
+    assign note_freqs[83] = 32'd88383859;
+    assign note_freqs[84] = 32'd93639437;
+    assign note_freqs[85] = 32'd99207528;
+    assign note_freqs[86] = 32'd105106715;
+    assign note_freqs[87] = 32'd111356685;
+    assign note_freqs[88] = 32'd117978298;
+    assign note_freqs[89] = 32'd124993653;
+    assign note_freqs[90] = 32'd132426162;
+    assign note_freqs[91] = 32'd140300631;
+    assign note_freqs[92] = 32'd148643341;
+    assign note_freqs[93] = 32'd157482134;
+    assign note_freqs[94] = 32'd166846509;
+    assign note_freqs[95] = 32'd176767719;
+    assign note_freqs[96] = 32'd187278874;
+    assign note_freqs[97] = 32'd198415056;
+    assign note_freqs[98] = 32'd210213429;
+    assign note_freqs[99] = 32'd222713370;
+    assign note_freqs[100] = 32'd235956596;
+    assign note_freqs[101] = 32'd249987305;
+    assign note_freqs[102] = 32'd264852324;
+    assign note_freqs[103] = 32'd280601263;
+    assign note_freqs[104] = 32'd297286682;
+    assign note_freqs[105] = 32'd314964268;
+    assign note_freqs[106] = 32'd333693018;
+    assign note_freqs[107] = 32'd353535438;
+    assign note_freqs[108] = 32'd374557749;
+    assign note_freqs[109] = 32'd396830112;
+    assign note_freqs[110] = 32'd420426858;
+    assign note_freqs[111] = 32'd445426740;
+    assign note_freqs[112] = 32'd471913192;
+    assign note_freqs[113] = 32'd499974611;
+    assign note_freqs[114] = 32'd529704648;
+    assign note_freqs[115] = 32'd561202526;
+    assign note_freqs[116] = 32'd594573365;
+    assign note_freqs[117] = 32'd629928537;
+    assign note_freqs[118] = 32'd667386037;
+    assign note_freqs[119] = 32'd707070876;
+    assign note_freqs[120] = 32'd749115498;
+    assign note_freqs[121] = 32'd793660223;
+    assign note_freqs[122] = 32'd840853716;
+    assign note_freqs[123] = 32'd890853480;
+    assign note_freqs[124] = 32'd943826385;
+    assign note_freqs[125] = 32'd999949222;
+    assign note_freqs[126] = 32'd1059409297;
+    assign note_freqs[127] = 32'd1122405052;
+    // lutgen:end note_phase_incr
 
 
     logic signed [7:0][AUDIO_WIDTH-1:0] osc_out; 
@@ -0,0 +1,218 @@
+"""Coefficient upload for audio_fir over MMIO.
+
+Register map (as the notebook's controller assumed): tap i at offset i * 4,
+control at CTRL_OFFSET (1 = filter enabled, 0 = bypass).
+
+FIRController keeps a shadow copy of the words last written to the taps and
+only writes the ones that changed, as few block writes as possible: changed
+taps closer than merge_gap words apart go out in one block. The control
+register is written on every commit, so each upload leaves the filter on.
+update() is for slider callbacks; it debounces, so a drag that fires dozens
+of updates in a few milliseconds commits only the last one.
+
+Any object with write(offset, value) is a backend. write_block(offset,
+words) is used when it has one, a PYNQ MMIO's .array view when it has that,
+and single writes otherwise. MemoryMMIO stands in for the board and counts
+every transaction, so write counts and update latency can be measured here:
+
+    python fir_controller.py --updates 2000       # naive vs diffed uploads
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+NUM_TAPS = 64
+CTRL_OFFSET = 0x100
+WORD_MASK = 0xFFFF
+
+
+class MemoryMMIO:
+    """In-memory register file with the PYNQ MMIO interface, counting every access"""
+
+    def __init__(self, length=CTRL_OFFSET + 4):
+        self.array = np.zeros((length + 3) // 4, dtype=np.uint32)
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.transactions = 0
+        self.words = 0
+
+    def read(self, offset, length=4):
+        return int(self.array[offset >> 2])
+
+    def write(self, offset, value):
+        self.array[offset >> 2] = value
+        self.transactions += 1
+        self.words += 1
+
+    def write_block(self, offset, words):
+        words = np.asarray(words, dtype=np.uint32)
+        self.array[offset >> 2:(offset >> 2) + len(words)] = words
+        self.transactions += 1
+        self.words += len(words)
+
+
+def write_block(mmio, offset, words):
+    """Write consecutive 32-bit words with the cheapest call the backend has"""
+    if hasattr(mmio, "write_block"):
+        mmio.write_block(offset, words)
+    elif hasattr(mmio, "array"):
+        mmio.array[offset >> 2:(offset >> 2) + len(words)] = words
+    else:
+        for i, word in enumerate(words):
+            mmio.write(offset + 4 * i, int(word))
+
+
+def changed_runs(old, new, merge_gap=2):
+    """(start, stop) index ranges covering every word where old and new differ"""
+    changed = np.flatnonzero(old != new) if old is not None else np.arange(len(new))
+    if not len(changed):
+        return []
+    # Split wherever more than merge_gap unchanged words separate two changes
+    breaks = np.flatnonzero(np.diff(changed) > merge_gap + 1)
+    starts = np.concatenate(([changed[0]], changed[breaks + 1]))
+    stops = np.concatenate((changed[breaks], [changed[-1]])) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+class FIRController:
+    """Uploads tap sets to one audio_fir, writing only what changed.
+
+    load_coefficients(coeffs) writes at once; update(coeffs) commits after
+    debounce seconds without another update. Both take Q1.15 taps, signed
+    or as the unsigned words float_to_q1_15 gives.
+    """
+
+    def __init__(self, fir_mmio_base, num_taps=NUM_TAPS, debounce=0.05, merge_gap=2, verbose=False):
+        """
+        fir_mmio_base: PYNQ MMIO object for FIR IP, or any backend (see module docstring)
+        """
+        self.fir = fir_mmio_base
+        self.num_taps = num_taps
+        self.debounce = debounce
+        self.merge_gap = merge_gap
+        self.verbose = verbose
+        self.shadow = None  # unknown until the first full upload
+        self.commits = 0
+        self.words_written = 0
+        self._pending = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _words(self, coeffs):
+        words = np.zeros(self.num_taps, dtype=np.uint32)
+        coeffs = np.asarray(coeffs, dtype=np.int64)[:self.num_taps]
+        words[:len(coeffs)] = coeffs & WORD_MASK
+        return words
+
+    def load_coefficients(self, coeffs, force=False):
+        """Write the taps that differ from the shadow copy and enable the filter; returns words written"""
+        with self._lock:
+            self._cancel()
+            self._take()  # superseded: a later flush() must not write it over these taps
+            return self._commit(self._words(coeffs), force)
+
+    def _commit(self, words, force=False):
+        written = 0
+        for start, stop in changed_runs(None if force else self.shadow, words, self.merge_gap):
+            write_block(self.fir, start * 4, words[start:stop])
+            written += stop - start
+        self.shadow = words
+        # Always re-enable: the filter may have been bypassed behind our back
+        self.fir.write(CTRL_OFFSET, 1)  # Enable filter
+        self.commits += 1
+        self.words_written += written
+        if self.verbose:
+            print(f"Loaded {written} of {self.num_taps} coefficients to FPGA")
+        return written
+
+    def update(self, coeffs):
+        """Queue coeffs for upload; rapid calls collapse into one commit of the latest"""
+        with self._lock:
+            self._pending = self._words(coeffs)
+            if self.debounce <= 0:
+                self._commit(self._take())
+                return
+            self._cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _take(self):
+        pending, self._pending = self._pending, None
+        return pending
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self):
+        """Commit a pending update now; returns words written (0 if none was pending)"""
+        with self._lock:
+            self._cancel()
+            pending = self._take()
+            return 0 if pending is None else self._commit(pending)
+
+    def invalidate(self):
+        """Forget the shadow copy (e.g. after reprogramming the bitstream) so the next load writes every tap"""
+        with self._lock:
+            self.shadow = None
+
+    def bypass(self, enable=True):
+        """Enable/disable bypass mode"""
+        with self._lock:
+            self.fir.write(CTRL_OFFSET, 0 if enable else 1)
+
+
+def slider_walk(updates, bands=10, step=0.5, limit=12, seed=0):
+    """Gains after each of updates single-slider steps, like dragging a graphic EQ"""
+    rng = np.random.default_rng(seed)
+    moves = np.zeros((updates, bands))
+    moves[np.arange(updates), rng.integers(0, bands, updates)] = rng.choice([-step, step], updates)
+    return np.clip(np.cumsum(moves, axis=0), -limit, limit)
+
+
+def benchmark(settings, designer, merge_gap=2):
+    """Words, transactions and seconds per update for per-tap writes vs diffed uploads"""
+    taps = designer.design_batch(settings)
+    results = {}
+    naive = MemoryMMIO()
+    start = time.perf_counter()
+    for coeffs in taps:
+        for i, word in enumerate((coeffs & WORD_MASK).tolist()):
+            naive.write(i * 4, word)
+        naive.write(CTRL_OFFSET, 1)
+    results["per-tap"] = (naive.words, naive.transactions, time.perf_counter() - start)
+    mmio = MemoryMMIO()
+    controller = FIRController(mmio, taps.shape[-1], debounce=0, merge_gap=merge_gap)
+    start = time.perf_counter()
+    for coeffs in taps:
+        controller.load_coefficients(coeffs)
+    results["diffed"] = (mmio.words, mmio.transactions, time.perf_counter() - start)
+    if not np.array_equal(mmio.array, naive.array):
+        raise AssertionError("diffed upload left different registers than per-tap writes")
+    return {name: (w / len(taps), t / len(taps), s / len(taps)) for name, (w, t, s) in results.items()}
+
+
+def main():
+    from fir_taps import FIRDesigner
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=1000, help="slider steps to replay")
+    parser.add_argument("--merge-gap", type=int, default=2, help="unchanged words a block may span")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = slider_walk(args.updates, seed=args.seed)
+    print(f"{args.updates} slider steps, per update:")
+    print(f"{'upload':>8} {'words':>8} {'writes':>8} {'us':>8}")
+    for name, (words, transactions, seconds) in benchmark(settings, FIRDesigner(), args.merge_gap).items():
+        print(f"{name:>8} {words:8.1f} {transactions:8.1f} {seconds * 1e6:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Graphic EQ tap design for audio_fir.sv.
+
+A graphic EQ setting is one gain in dB per band (CENTER_FREQS). The design
+is scipy.signal.firwin2's frequency sampling: the band gains are linearly
+interpolated over a uniform grid from DC to Nyquist, delayed by half the
+filter, inverse FFT'd and Hamming windowed. Every one of those steps is linear
+in the band gains, so FIRDesigner folds them into a single (bands, taps)
+matrix once and a design is
+
+    taps = 10 ** (gains_db / 20) @ basis
+
+which is what makes design_batch() cheap for thousands of presets at once.
+An even number of taps (64, audio_fir's NUM_COEFFS) is a type II linear-phase
+filter whose gain at Nyquist is always zero, so the top band rolls off above
+16 kHz instead of being held flat there.
+
+Taps are quantized to Q1.15 (COEFF_WIDTH = 16 signed bits, 1.0 = 2^15) with
+rounding and saturation; audio_fir adds no scaling, so its output is the
+input times 2^15 and the gain has to be taken out after it. Single designs
+are cached in an LRU keyed on the gains rounded to `resolution` dB, so
+dragging a slider back to a previous setting is a dictionary lookup.
+
+    designer = FIRDesigner()
+    q15 = designer.design_q15(PRESETS["warm"])          # int64, one per tap
+    words = designer.float_to_q1_15(designer.design_graphic_eq([0] * 10))  # MMIO words
+    sweep = designer.design_batch(np.random.uniform(-12, 12, (10_000, 10)))
+
+    python fir_taps.py --preset bright --mem bright.mem
+    python fir_taps.py 6 4 2 0 -3 -3 0 2 4 6
+"""
+
+import argparse
+from functools import lru_cache
+
+import numpy as np
+
+NUM_TAPS = 64
+COEFF_WIDTH = 16
+SAMPLE_RATE = 48000
+# Standard graphic EQ center frequencies
+CENTER_FREQS = (31, 63, 125, 250, 500, 1000, 2000, 4000, 8000, 16000)
+BAND_LABELS = ("31Hz", "63Hz", "125Hz", "250Hz", "500Hz", "1kHz", "2kHz", "4kHz", "8kHz", "16kHz")
+PRESETS = {
+    "flat": [0] * 10,
+    "v_shape": [6, 4, 2, 0, -3, -3, 0, 2, 4, 6],
+    "bright": [0, 0, 0, 0, 2, 4, 6, 6, 6, 6],
+    "warm": [3, 2, 1, 0, 0, -2, -4, -6, -6, -6],
+    "telephone": [-12, -12, -6, 0, 3, 3, 0, -6, -12, -12],
+}
+
+
+def to_fixed(taps, width=COEFF_WIDTH):
+    """Round float taps to signed Q1.(width-1) integers, saturating at [-1, 1)"""
+    scale = 1 << (width - 1)
+    return np.clip(np.round(np.asarray(taps, dtype=np.float64) * scale), -scale, scale - 1).astype(np.int64)
+
+
+def to_words(fixed, width=COEFF_WIDTH):
+    """Signed taps as the unsigned two's complement words the MMIO registers take"""
+    return np.asarray(fixed, dtype=np.int64) & ((1 << width) - 1)
+
+
+def design_basis(num_taps=NUM_TAPS, sample_rate=SAMPLE_RATE, center_freqs=CENTER_FREQS):
+    """(bands, num_taps) matrix taking linear band gains to windowed taps (firwin2 with a Hamming window)"""
+    nyquist = sample_rate / 2
+    bands = len(center_freqs)
+    nfreqs = 1 + 2 ** int(np.ceil(np.log2(num_taps)))
+    grid = np.linspace(0.0, 1.0, nfreqs)
+    # DC takes the first band's gain; Nyquist the last one's, or zero for a type II filter
+    points = np.concatenate(([0.0], np.asarray(center_freqs) / nyquist, [1.0]))
+    edges = np.zeros((bands, bands + 2))
+    edges[np.arange(bands), np.arange(bands) + 1] = 1.0
+    edges[0, 0] = 1.0
+    if num_taps % 2:
+        edges[-1, -1] = 1.0
+    response = np.stack([np.interp(grid, points, row) for row in edges])
+    shift = np.exp(-(num_taps - 1) / 2.0 * 1j * np.pi * grid)
+    impulse = np.fft.irfft(response * shift, axis=-1)[:, :num_taps]
+    return impulse * np.hamming(num_taps)
+
+
+class FIRDesigner:
+    """Graphic EQ designer for one filter length and sample rate.
+
+    Drop-in for the notebook's FIRDesigner: design_graphic_eq,
+    get_frequency_response and float_to_q1_15 keep their signatures.
+    normalize="peak" scales every design down so its response never goes
+    above 0 dB, which keeps boosted presets from saturating in Q1.15.
+    """
+
+    def __init__(self, num_taps=NUM_TAPS, sample_rate=SAMPLE_RATE, center_freqs=CENTER_FREQS,
+                 coeff_width=COEFF_WIDTH, resolution=0.1, cache_size=1024, normalize=None):
+        if normalize not in (None, "peak"):
+            raise ValueError(f"normalize must be None or 'peak', got {normalize!r}")
+        self.num_taps = num_taps
+        self.sample_rate = sample_rate
+        self.nyquist = sample_rate / 2
+        self.center_freqs = list(center_freqs)
+        self.coeff_width = coeff_width
+        self.resolution = resolution
+        self.normalize = normalize
+        self.basis = design_basis(num_taps, sample_rate, center_freqs)
+        self.current_taps = None
+        self._cached = lru_cache(maxsize=cache_size)(self._design_key)
+
+    def _key(self, gains_db):
+        gains_db = np.asarray(gains_db, dtype=np.float64)
+        if gains_db.shape != (len(self.center_freqs),):
+            raise ValueError(f"expected {len(self.center_freqs)} band gains, got shape {gains_db.shape}")
+        return tuple(np.round(gains_db / self.resolution).astype(np.int64).tolist())
+
+    def _design_key(self, key):
+        taps = self.design_batch(np.array(key) * self.resolution, quantize=False)
+        fixed = to_fixed(taps, self.coeff_width)
+        taps.flags.writeable = fixed.flags.writeable = False
+        return taps, fixed
+
+    def design_batch(self, gains_db, quantize=True):
+        """Taps for any number of settings at once: gains_db (..., bands) -> (..., num_taps)"""
+        gains_db = np.asarray(gains_db, dtype=np.float64)
+        taps = (10.0 ** (gains_db / 20.0)) @ self.basis
+        if self.normalize == "peak":
+            peak = np.abs(np.fft.rfft(taps, n=4096, axis=-1)).max(axis=-1, keepdims=True)
+            taps = taps / np.maximum(peak, 1.0)
+        return to_fixed(taps, self.coeff_width) if quantize else taps
+
+    def design_graphic_eq(self, gains_db):
+        """Float taps for one setting of the band gains in dB (cached)"""
+        self.current_taps = self._cached(self._key(gains_db))[0]
+        return self.current_taps
+
+    def design_q15(self, gains_db):
+        """Q1.15 taps for one setting as signed int64 (cached), ready for audio_fir's coeffs"""
+        taps, fixed = self._cached(self._key(gains_db))
+        self.current_taps = taps
+        return fixed
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def cache_clear(self):
+        self._cached.cache_clear()
+
+    def get_frequency_response(self, taps=None, worN=2048):
+        """(frequencies in Hz, magnitude in dB, phase in degrees) of taps, batched over leading axes"""
+        if taps is None:
+            taps = self.current_taps
+        if taps is None:
+            return None, None, None
+        # Same grid as scipy.signal.freqz(taps, worN=worN): worN points from DC up to (not including) Nyquist
+        h = np.fft.rfft(np.asarray(taps, dtype=np.float64), n=2 * worN, axis=-1)[..., :worN]
+        freqs = np.arange(worN) * self.nyquist / worN
+        magnitude_db = 20 * np.log10(np.abs(h) + 1e-10)  # Avoid log(0)
+        return freqs, magnitude_db, np.angle(h, deg=True)
+
+    def float_to_q1_15(self, taps):
+        """Convert float taps to the 16-bit unsigned words the MMIO registers take"""
+        return to_words(to_fixed(taps, self.coeff_width), self.coeff_width).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("gains", nargs="*", type=float, help="gain of each band in dB, lowest band first")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="use a named preset instead of gains")
+    parser.add_argument("--taps", type=int, default=NUM_TAPS, help="filter length")
+    parser.add_argument("--rate", type=float, default=SAMPLE_RATE, help="sample rate in Hz")
+    parser.add_argument("--peak", action="store_true", help="scale the design so it never boosts above 0 dB")
+    parser.add_argument("--mem", default=None, help="write the taps as $readmemh hex to this file")
+    args = parser.parse_args()
+
+    if args.preset and args.gains:
+        parser.error("give either gains or --preset")
+    gains = PRESETS[args.preset] if args.preset else (args.gains or PRESETS["flat"])
+    designer = FIRDesigner(args.taps, args.rate, normalize="peak" if args.peak else None)
+    fixed = designer.design_q15(gains)
+    words = to_words(fixed)
+    if args.mem:
+        header = f"// audio_fir taps: {args.taps} x Q1.15, gains {list(gains)} dB at {args.rate:g} Hz"
+        with open(args.mem, "w") as f:
+            f.write("\n".join([header] + [f"{w:04x}" for w in words.tolist()]) + "\n")
+    else:
+        for i, (c, w) in enumerate(zip(fixed.tolist(), words.tolist())):
+            print(f"coeffs[{i}] = {'-' if c < 0 else ''}16'sd{abs(c)};  // 0x{w:04x}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,7 @@
-WIDTH = 800
-BINS = 512
+"""Print the log_x_map lut. lutgen writes it into x_mapping.sv; see python -m lutgen."""
 
-lut = []
-for x in range(WIDTH):
-    val = int((2 ** (9 * x / 799)) - 1)
-    val = min(511, max(0, val))
-    lut.append(val)
+from lutgen import TABLES
+from lutgen.core import render_sv
 
-print("logic [8:0] lut [0:799] = '{")
-for i in range(0, WIDTH, 8):
-    row = lut[i:i+8]
-    line = ", ".join(f"9'd{v:3d}" for v in row)
-    comma = "," if i + 8 < WIDTH else ""
-    print(f"    {line}{comma}")
-print("};")
\ No newline at end of file
+table = next(t for t in TABLES if t.name == "x_map")
+print("\n".join(render_sv(table, table.values(), "")))
@@ -0,0 +1,37 @@
+"""Generate the HDL lookup tables from their formulas.
+
+Each table in tables.TABLES is a formula plus its width and depth. lutgen
+evaluates it with NumPy and writes
+
+    sources/hdl/generated/<name>.mem     hex words for $readmemh
+    the marked region in its .sv file    the same values as SystemVerilog
+
+note_freqs in synth.sv is built in the tuning stored in tuning.json (12-TET
+at A4 = 440 Hz and 48 kHz when there is none); sim/calc_phase_incr.py
+--apply changes it.
+
+Every generated file records a hash of the table's spec and formula source,
+so a table is only regenerated when that hash changes. The sim runners call
+ensure_tables() before every build; to regenerate by hand:
+
+    python -m lutgen            # from sources/scripts: update stale tables
+    python -m lutgen --check    # list stale tables, exit 1 if any
+    python -m lutgen --force    # rewrite every table
+"""
+
+from .core import MEM_DIR, Table, generate, stale, write
+from .tables import TABLES
+
+_ensured = False
+
+
+def ensure_tables():
+    """Regenerate stale tables, once per process"""
+    global _ensured
+    if _ensured:
+        return []
+    changed = generate(TABLES)
+    _ensured = True
+    for name in changed:
+        print(f"INFO: lutgen regenerated {name}")
+    return changed
@@ -0,0 +1,27 @@
+import argparse
+import sys
+
+from . import TABLES, __doc__, generate
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="lutgen", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="tables to generate (default: all)")
+    parser.add_argument("--check", action="store_true", help="only report stale tables")
+    parser.add_argument("--force", action="store_true", help="regenerate even when up to date")
+    args = parser.parse_args()
+    unknown = set(args.names) - {t.name for t in TABLES}
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+    tables = [t for t in TABLES if not args.names or t.name in args.names]
+    changed = generate(tables, force=args.force, check=args.check)
+    for name in changed:
+        print(f"{name}: {'stale' if args.check else 'regenerated'}")
+    if not changed:
+        print("All tables up to date")
+    sys.exit(bool(args.check and changed))
+
+
+if __name__ == "__main__":
+    main()
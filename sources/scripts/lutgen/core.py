@@ -0,0 +1,162 @@
+"""Table specs, rendering and the content-hash cache."""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+
+HDL_DIR = Path(__file__).resolve().parents[2] / "hdl"
+MEM_DIR = HDL_DIR / "generated"
+# Bump when the rendering below changes so every table is regenerated once
+VERSION = 1
+
+_BEGIN = re.compile(r"^([ \t]*)// lutgen:begin (\w+)(?: (\w+))?.*$", re.M)
+
+
+class Table:
+    """One lookup table: formula(index) evaluated over range(depth), width bits per entry.
+
+    target is the .sv file holding the table between a pair of markers
+
+        // lutgen:begin <name>
+        // lutgen:end <name>
+
+    and style picks what goes between them:
+
+        "init"    <decl> = '{ v0, v1, ... };   (decl is the full declaration)
+        "initial" array[i] = v;                (inside an existing initial block)
+        "assign"  assign array[i] = v;
+
+    params are passed to formula as keywords. depends lists the modules the
+    formula calls into, so edits there change the hash too.
+    """
+
+    def __init__(self, name, width, depth, formula, target=None, style="init", array=None,
+                 decl=None, signed=False, per_line=8, pad=False, comment=None, params=None, depends=()):
+        self.name = name
+        self.width = width
+        self.depth = depth
+        self.formula = formula
+        self.target = Path(target) if target else None
+        self.style = style
+        self.array = array
+        self.decl = decl
+        self.signed = signed
+        self.per_line = per_line
+        self.pad = pad
+        self.comment = comment
+        self.params = dict(params or {})
+        self.depends = list(depends)
+
+    def key(self):
+        """Content hash of everything the table is generated from"""
+        spec = {k: v for k, v in vars(self).items() if k not in ("formula", "target", "depends")}
+        spec["target"] = self.target.name if self.target else None
+        spec["formula"] = inspect.getsource(self.formula)
+        if self.depends:
+            spec["depends"] = [inspect.getsource(module) for module in self.depends]
+        spec["version"] = VERSION
+        return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def values(self):
+        """The table as int64, checked against width"""
+        values = np.asarray(self.formula(np.arange(self.depth), **self.params), dtype=np.int64)
+        if values.shape != (self.depth,):
+            raise ValueError(f"{self.name}: formula returned shape {values.shape}, expected ({self.depth},)")
+        low, high = (-(1 << (self.width - 1)), (1 << (self.width - 1)) - 1) if self.signed else (0, (1 << self.width) - 1)
+        bad = np.flatnonzero((values < low) | (values > high))
+        if len(bad):
+            raise ValueError(f"{self.name}[{bad[0]}] = {values[bad[0]]} does not fit {self.width} bits")
+        return values
+
+
+def literal(table, value, pad=0):
+    sign = "-" if value < 0 else ""
+    return f"{sign}{table.width}'{'s' if table.signed else ''}d{abs(int(value)):{pad}d}"
+
+
+def render_sv(table, values, indent):
+    """Lines that go between the markers"""
+    pad = len(str(int(np.abs(values).max()))) if table.pad else 0
+    items = [literal(table, v, pad) for v in values]
+    if table.style == "init":
+        rows = [", ".join(items[i:i + table.per_line]) for i in range(0, len(items), table.per_line)]
+        return ([f"{indent}{table.decl} = '{{"]
+                + [f"{indent}    {row}," for row in rows[:-1]] + [f"{indent}    {rows[-1]}", f"{indent}}};"])
+    if table.style == "initial":
+        cells = [f"{table.array}[{i}] = {item};" for i, item in enumerate(items)]
+        return [indent + " ".join(cells[i:i + table.per_line]) for i in range(0, len(cells), table.per_line)]
+    if table.style == "assign":
+        return [f"{indent}assign {table.array}[{i}] = {item};" for i, item in enumerate(items)]
+    raise ValueError(f"{table.name}: unknown style {table.style!r}")
+
+
+def render_mem(table, values, key):
+    """$readmemh file: one hex word per line (two's complement for signed tables)"""
+    digits = (table.width + 3) // 4
+    words = values & ((1 << table.width) - 1)
+    header = f"// {table.name}: {table.depth} x {table.width}-bit{' signed' if table.signed else ''}, lutgen {key}"
+    return "\n".join([header] + [f"{int(w):0{digits}x}" for w in words]) + "\n"
+
+
+def _write(path, text, newline="\n"):
+    # Write through a temporary file so a parallel run never reads half a table
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, newline=newline)
+    os.replace(tmp, path)
+
+
+def _region(text, name):
+    """(start, end, indent, key) of the marked region in text, end pointing past the end marker"""
+    for match in _BEGIN.finditer(text):
+        if match.group(2) == name:
+            end = re.compile(rf"^[ \t]*// lutgen:end {name}\b.*$", re.M).search(text, match.end())
+            if end is None:
+                raise ValueError(f"lutgen:begin {name} has no matching lutgen:end")
+            return match.start(), end.end(), match.group(1), match.group(3)
+    return None
+
+
+def stale(table):
+    """Whether the table's files no longer match its spec (without evaluating the formula)"""
+    key = table.key()
+    mem = MEM_DIR / f"{table.name}.mem"
+    if not mem.is_file() or key not in mem.read_text().split("\n", 1)[0]:
+        return True
+    if table.target is not None:
+        region = _region(table.target.read_text(), table.name)
+        if region is None:
+            raise ValueError(f"{table.target} has no lutgen:begin {table.name} marker")
+        return region[3] != key
+    return False
+
+
+def write(table):
+    """Regenerate the table's .mem file and its region in the target .sv"""
+    key = table.key()
+    values = table.values()
+    MEM_DIR.mkdir(parents=True, exist_ok=True)
+    _write(MEM_DIR / f"{table.name}.mem", render_mem(table, values, key))
+    if table.target is None:
+        return
+    raw = table.target.read_bytes().decode()
+    newline = "\r\n" if "\r\n" in raw else "\n"
+    text = raw.replace("\r\n", "\n")
+    start, end, indent, _ = _region(text, table.name)
+    note = f" ({table.comment})" if table.comment else ""
+    lines = ([f"{indent}// lutgen:begin {table.name} {key} -- generated by sources/scripts/lutgen{note}, do not edit"]
+             + render_sv(table, values, indent) + [f"{indent}// lutgen:end {table.name}"])
+    _write(table.target, text[:start] + "\n".join(lines) + text[end:], newline)
+
+
+def generate(tables, force=False, check=False):
+    """Bring every table up to date, returning the names regenerated (or, with check, the stale ones)"""
+    changed = [t for t in tables if force or stale(t)]
+    if not check:
+        for table in changed:
+            write(table)
+    return [t.name for t in changed]
@@ -0,0 +1,57 @@
+"""The tables lutgen keeps in sync with the HDL."""
+
+import numpy as np
+
+import fir_taps
+
+from . import tuning
+from .core import HDL_DIR, Table
+
+# oscillator.sv's phase accumulator, and so the width of every note_freqs entry
+NOTE_BITS = 32
+
+
+def x_map(x, width=800, bins=512):
+    """Screen column -> FFT bin on a log axis: 2^(9x/799) - 1, clamped to the bins"""
+    return np.clip((2.0 ** (np.log2(bins) * x / (width - 1)) - 1).astype(np.int64), 0, bins - 1)
+
+
+def sine_quarter(i, depth=256, amplitude=2**31 - 1):
+    """First quarter of a sine: round(sin(i * pi / (2 * depth)) * amplitude)"""
+    return np.round(np.sin(i * np.pi / (2 * depth)) * amplitude).astype(np.int64)
+
+
+def note_phase_incr(note, sample_rate=48_000, bits=32, a4=440.0, detune_cents=0.0, edo=12, scale=None):
+    """DDS phase increment per MIDI note: round(f * 2^bits / sample_rate) in the given tuning"""
+    return tuning.phase_incr(tuning.note_freqs(note, a4, detune_cents, edo, scale), sample_rate, bits)
+
+
+def eq_taps(i, preset="flat"):
+    """audio_fir's coeffs for a graphic EQ preset: FIRDesigner's Q1.15 taps"""
+    return fir_taps.FIRDesigner(num_taps=len(i)).design_q15(fir_taps.PRESETS[preset])[i]
+
+
+def describe(t):
+    """One-line summary of a tuning for the generated-table comment"""
+    scale = f"{len(t['scale']) - 1}-note scale" if t["scale"] else f"{t['edo']}-EDO"
+    detune = f", {t['detune_cents']:+g} cents" if t["detune_cents"] else ""
+    return f"SAMPLE_RATE {t['sample_rate']:g} Hz, A4 = {t['a4']:g} Hz, {scale}{detune}"
+
+
+def note_table(t):
+    """note_freqs in synth.sv for a tuning dict (see tuning.load_tuning)"""
+    return Table("note_phase_incr", NOTE_BITS, tuning.NOTES, note_phase_incr, target=HDL_DIR / "synth.sv",
+                 style="assign", array="note_freqs", comment=describe(t),
+                 params={**t, "bits": NOTE_BITS}, depends=[tuning])
+
+
+TABLES = [
+    Table("x_map", 9, 800, x_map, target=HDL_DIR / "x_mapping.sv",
+          decl="logic [8:0] lut [0:799]", pad=True),
+    Table("sine_quarter", 32, 256, sine_quarter, target=HDL_DIR / "sine.sv",
+          style="initial", array="sine_rom", signed=True, per_line=4),
+    note_table(tuning.load_tuning()),
+    # audio_fir takes its taps on a port, so only the .mem is generated (the power-on EQ setting)
+    Table("fir_taps", fir_taps.COEFF_WIDTH, fir_taps.NUM_TAPS, eq_taps, signed=True,
+          params={"preset": "flat"}, depends=[fir_taps]),
+]
@@ -0,0 +1,125 @@
+"""Vectorized DDS tuning: note frequencies, phase increments and their error.
+
+Every function broadcasts, so one call covers all 128 notes over several
+sample rates and accumulator widths, e.g.
+
+    report(sample_rate=[[44_100], [48_000]], bits=[[[24]], [[32]]])
+
+gives arrays shaped (bits, rates, notes). Tunings are a reference pitch
+(a4, on ref_note), a global detune in cents and a scale: edo equal steps per
+octave, or an explicit list of cents per degree (a microtonal scale, which
+may also come from a Scala .scl file through read_scl).
+
+The synth's octave voice plays PHASE_INCR << 1 in the same accumulator
+width (synth.sv, octave_on), so octave=1 reports that voice, including the
+wrap when the doubled increment no longer fits.
+"""
+
+import json
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 48_000
+BITS = 32
+A4 = 440.0
+A4_NOTE = 69
+NOTES = 128
+# The tuning lutgen builds note_freqs in synth.sv from; calc_phase_incr.py --apply rewrites it
+TUNING_FILE = Path(__file__).resolve().parent / "tuning.json"
+DEFAULT_TUNING = {"sample_rate": SAMPLE_RATE, "a4": A4, "detune_cents": 0.0, "edo": 12, "scale": None}
+
+
+def scale_cents(edo=12, scale=None):
+    """(cents of each degree from the tonic, period in cents); scale is cents per degree, tonic first"""
+    if scale is None:
+        return np.arange(edo) * 1200.0 / edo, 1200.0
+    scale = np.asarray(scale, dtype=np.float64)
+    if scale[0] != 0:
+        scale = np.concatenate(([0.0], scale))
+    # A Scala-style scale ends on its period (usually the 2/1 octave)
+    return scale[:-1], scale[-1]
+
+
+def read_scl(path):
+    """Cents list from a Scala .scl file (tonic 0 included, period last)"""
+    lines = [line.strip() for line in Path(path).read_text().splitlines() if not line.strip().startswith("!")]
+    count = int(lines[1].split()[0])
+    cents = [0.0]
+    for entry in lines[2:2 + count]:
+        value = entry.split()[0]
+        cents.append(float(value) if "." in value else 1200 * np.log2(float(Fraction(value))))
+    return cents
+
+
+def note_freqs(notes=None, a4=A4, detune_cents=0.0, edo=12, scale=None, ref_note=A4_NOTE):
+    """Frequency in Hz of each MIDI note; ref_note sits at a4 (before detune)"""
+    notes = np.arange(NOTES) if notes is None else np.asarray(notes)
+    degrees, period = scale_cents(edo, scale)
+    octave, degree = np.divmod(notes - ref_note, len(degrees))
+    cents = octave * period + degrees[degree] + detune_cents
+    return np.asarray(a4, dtype=np.float64) * 2.0 ** (cents / 1200.0)
+
+
+def phase_incr(freq, sample_rate=SAMPLE_RATE, bits=BITS):
+    """round(freq * 2^bits / sample_rate) as int64"""
+    bits = np.asarray(bits)
+    if np.any(bits > 52):
+        raise ValueError("accumulators wider than 52 bits do not round exactly in float64")
+    return np.round(np.asarray(freq) * np.exp2(bits) / np.asarray(sample_rate)).astype(np.int64)
+
+
+def octave_shift(incr, bits=BITS, octave=1):
+    """Increment after << octave in a bits-wide register (the synth's octave voice)"""
+    return (np.asarray(incr, dtype=np.int64) << octave) & ((np.int64(1) << np.asarray(bits, dtype=np.int64)) - 1)
+
+
+def played_freq(incr, sample_rate=SAMPLE_RATE, bits=BITS):
+    """Frequency the accumulator actually produces for an increment"""
+    return np.asarray(incr) * np.asarray(sample_rate, dtype=np.float64) / np.exp2(bits)
+
+
+def report(notes=None, sample_rate=SAMPLE_RATE, bits=BITS, octave=0, **tuning):
+    """Increments and their error for every note, broadcast over sample_rate and bits.
+
+    Returns a dict of arrays: freq (target Hz), incr, played (Hz), error_hz,
+    error_cents, aliased (target above Nyquist) and wrapped (the octave shift
+    overflowed the register).
+    """
+    base = note_freqs(notes, **tuning)
+    incr = np.broadcast_to(phase_incr(base, sample_rate, bits), np.broadcast_shapes(
+        base.shape, np.shape(sample_rate), np.shape(bits)))
+    target = base * 2.0**octave
+    shifted = octave_shift(incr, bits, octave) if octave else incr
+    played = played_freq(shifted, sample_rate, bits)
+    with np.errstate(divide="ignore"):
+        error_cents = 1200 * np.log2(played / target)
+    result = {
+        "freq": target,
+        "incr": shifted,
+        "played": played,
+        "error_hz": played - target,
+        "error_cents": error_cents,
+        "aliased": target > np.asarray(sample_rate) / 2,
+        "wrapped": (incr << octave) != shifted,
+    }
+    return {k: np.broadcast_to(v, incr.shape) for k, v in result.items()}
+
+
+def worst_case(result):
+    """Largest |error_cents| per note over every other axis, and where it happens (flat index)"""
+    cents = np.abs(result["error_cents"]).reshape(-1, result["error_cents"].shape[-1])
+    return cents.max(axis=0), cents.argmax(axis=0)
+
+
+def load_tuning(path=TUNING_FILE):
+    """The tuning note_freqs is generated from"""
+    tuning = dict(DEFAULT_TUNING)
+    if Path(path).is_file():
+        tuning.update(json.loads(Path(path).read_text()))
+    return tuning
+
+
+def save_tuning(tuning, path=TUNING_FILE):
+    Path(path).write_text(json.dumps({**DEFAULT_TUNING, **tuning}, indent=2) + "\n")
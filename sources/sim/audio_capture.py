@@ -0,0 +1,189 @@
+"""Capture DUT audio at the sample rate and stream it to a WAV file.
+
+AudioCapture records one sample per data_valid strobe (or one every
+`decimation` clocks for outputs without a valid), so a 100 MHz simulation
+stores 48 kHz audio instead of a value per clock. Samples go into a
+preallocated int32 array, or a memory-mapped .npy file for long runs, and
+are appended to a WAV file a chunk at a time while the simulation runs.
+
+    capture = AudioCapture(dut.clk, [dut.voice_1_out, dut.voice_2_out], valid=dut.data_valid,
+                           wav="render.wav", max_samples=48000)
+    capture.start()
+    ...
+    capture.stop()              # flushes and closes the WAV
+    samples = capture.samples   # (count, channels) int32
+
+    python audio_capture.py a.wav b.wav     # compare two renders sample by sample
+"""
+
+import argparse
+import sys
+import wave
+from pathlib import Path
+
+import cocotb
+import numpy as np
+from cocotb.triggers import ClockCycles, ReadOnly, RisingEdge
+
+SAMPLE_RATE = 48_000
+CLK_FREQ = 100_000_000
+# sample_clk's divider: one data_valid every CLK_FREQ // SAMPLE_RATE clocks
+DECIMATION = CLK_FREQ // SAMPLE_RATE
+
+
+class WavWriter:
+    """Incremental PCM WAV writer taking int32 blocks of shape (samples, channels)"""
+
+    def __init__(self, path, channels=1, sample_rate=SAMPLE_RATE, bits=32):
+        self.bits = bits
+        self.file = wave.open(str(path), "wb")
+        self.file.setnchannels(channels)
+        self.file.setsampwidth(bits // 8)
+        self.file.setframerate(sample_rate)
+
+    def write(self, block):
+        # Keep the top bits of each 32-bit sample
+        block = np.asarray(block, dtype=np.int32) >> (32 - self.bits)
+        if self.bits == 24:
+            raw = block.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        else:
+            raw = block.astype(f"<i{self.bits // 8}").tobytes()
+        self.file.writeframes(raw)
+
+    def close(self):
+        self.file.close()
+
+
+def read_wav(path):
+    """(samples, channels) int32 array and sample rate of a PCM WAV, scaled back to 32 bits"""
+    with wave.open(str(path), "rb") as f:
+        width = f.getsampwidth()
+        channels = f.getnchannels()
+        raw = np.frombuffer(f.readframes(f.getnframes()), dtype=np.uint8)
+        rate = f.getframerate()
+    if width == 3:
+        raw = np.concatenate((np.zeros((len(raw) // 3, 1), np.uint8), raw.reshape(-1, 3)), axis=1).ravel()
+        width = 4
+    samples = raw.view(f"<i{width}").astype(np.int32) << (32 - 8 * width) if width < 4 else raw.view("<i4")
+    return samples.reshape(-1, channels), rate
+
+
+def compare(a, b):
+    """Sample-by-sample difference of two captures (arrays or WAV paths)"""
+    a = read_wav(a)[0] if isinstance(a, (str, Path)) else np.asarray(a)
+    b = read_wav(b)[0] if isinstance(b, (str, Path)) else np.asarray(b)
+    length = min(len(a), len(b))
+    diff = np.abs(a[:length].astype(np.int64) - b[:length].astype(np.int64))
+    mismatch = np.flatnonzero(diff.reshape(length, -1).any(axis=1))
+    return {
+        "lengths": (len(a), len(b)),
+        "first_mismatch": int(mismatch[0]) if len(mismatch) else None,
+        "mismatches": int(len(mismatch)),
+        "max_abs_diff": int(diff.max()) if diff.size else 0,
+    }
+
+
+class AudioCapture:
+    """Records data (one handle or a list, one per channel) on every valid strobe.
+
+    max_samples preallocates the int32 store and stops the capture when it is
+    full; with memmap the store is a .npy file on disk instead. Without
+    max_samples nothing is kept in memory beyond the current WAV chunk.
+    """
+
+    def __init__(self, clk, data, valid=None, decimation=DECIMATION, max_samples=None,
+                 wav=None, memmap=None, sample_rate=SAMPLE_RATE, wav_bits=32, chunk=4096):
+        self.clk = clk
+        self.data = list(data) if isinstance(data, (list, tuple)) else [data]
+        self.valid = valid
+        self.decimation = decimation
+        self.max_samples = max_samples
+        self.count = 0
+        channels = len(self.data)
+        if memmap is not None:
+            if max_samples is None:
+                raise ValueError("memmap needs max_samples")
+            self.store = np.lib.format.open_memmap(memmap, mode="w+", dtype=np.int32,
+                                                   shape=(max_samples, channels))
+        elif max_samples is not None:
+            self.store = np.empty((max_samples, channels), dtype=np.int32)
+        else:
+            self.store = None
+        self.writer = WavWriter(wav, channels, sample_rate, wav_bits) if wav else None
+        self._chunk = np.empty((chunk, channels), dtype=np.int32)
+        self._chunk_fill = 0
+        self._task = None
+
+    @property
+    def samples(self):
+        """The samples captured so far, (count, channels) int32 (needs max_samples)"""
+        if self.store is None:
+            raise ValueError("Nothing is stored without max_samples; read the WAV instead")
+        return self.store[:self.count]
+
+    def _record(self):
+        row = self._chunk[self._chunk_fill]
+        for i, handle in enumerate(self.data):
+            row[i] = handle.value.signed_integer
+        if self.store is not None:
+            self.store[self.count] = row
+        self.count += 1
+        self._chunk_fill += 1
+        if self._chunk_fill == len(self._chunk):
+            self._flush()
+
+    def _flush(self):
+        if self.writer is not None and self._chunk_fill:
+            self.writer.write(self._chunk[:self._chunk_fill])
+        self._chunk_fill = 0
+
+    async def run(self, count=None):
+        """Capture count samples (or until max_samples / stop()), sampling in ReadOnly"""
+        target = None if count is None else self.count + count
+        if self.max_samples is not None:
+            target = self.max_samples if target is None else min(target, self.max_samples)
+        await ReadOnly()
+        while target is None or self.count < target:
+            if self.valid is None:
+                await ClockCycles(self.clk, self.decimation)
+                await ReadOnly()
+                self._record()
+            elif self.valid.value == 1:
+                self._record()
+                await RisingEdge(self.clk)
+                await ReadOnly()
+            else:
+                await RisingEdge(self.valid)
+                await ReadOnly()
+        self._flush()
+
+    def start(self, count=None):
+        """Capture in the background"""
+        self._task = cocotb.start_soon(self.run(count))
+        return self._task
+
+    def stop(self):
+        """End a background capture, write out what is left and close the WAV"""
+        if self._task is not None and not self._task.done():
+            self._task.kill()
+        self._task = None
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if isinstance(self.store, np.memmap):
+            self.store.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two WAV renders sample by sample")
+    parser.add_argument("a")
+    parser.add_argument("b")
+    args = parser.parse_args()
+    result = compare(args.a, args.b)
+    print(result)
+    sys.exit(result["first_mismatch"] is not None or result["lengths"][0] != result["lengths"][1])
+
+
+if __name__ == "__main__":
+    main()
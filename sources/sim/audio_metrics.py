@@ -0,0 +1,120 @@
+"""Audio quality metrics for captured DUT output.
+
+analyze() takes one signal or a batch of them (shape (..., N), e.g. one row
+per MIDI note) and measures each with a Blackman-Harris windowed FFT:
+
+    dc_offset     mean value as a fraction of full scale
+    signal_dbfs   fundamental level relative to a full-scale sine
+    thd_db        harmonics 2..H relative to the fundamental
+    thdn_db       everything except the fundamental and DC, relative to it
+    snr_db        fundamental over everything except DC and the harmonics
+    sfdr_db       fundamental peak over the largest other spectral peak
+    spur_hz       frequency of that largest spur
+    alias_db      largest harmonic that folded back from above Nyquist
+
+Tones are measured as the power within MAIN_LOBE bins of their centre, so
+the fundamental does not need to sit on a bin, but it does need to be clear
+of the DC lobe (a few dozen periods in the capture is plenty). Results are
+dicts of NumPy arrays with the batch shape, so floors can be asserted for
+every row at once.
+"""
+
+import numpy as np
+
+SAMPLE_RATE = 48_000
+FULL_SCALE = 2**31
+# Half-width of the Blackman-Harris main lobe in bins
+MAIN_LOBE = 4
+
+
+def blackman_harris(n):
+    """4-term Blackman-Harris window (-92 dB sidelobes)"""
+    k = 2 * np.pi * np.arange(n) / n
+    return 0.35875 - 0.48829 * np.cos(k) + 0.14128 * np.cos(2 * k) - 0.01168 * np.cos(3 * k)
+
+
+def power_spectrum(x, full_scale=FULL_SCALE):
+    """One-sided windowed power spectrum per bin, scaled so a full-scale sine sums to 1.0 over its lobe"""
+    x = np.asarray(x, dtype=np.float64) / full_scale
+    n = x.shape[-1]
+    win = blackman_harris(n)
+    # Equivalent noise bandwidth in bins: a tone spreads its power over this many bins
+    enbw = n * np.sum(win ** 2) / win.sum() ** 2
+    spectrum = np.fft.rfft((x - x.mean(axis=-1, keepdims=True)) * win, axis=-1)
+    return (2 * np.abs(spectrum) / win.sum()) ** 2 / enbw
+
+
+def _lobe(bins, centre, lobe=MAIN_LOBE):
+    """Mask over bins within lobe of centre (centre broadcasts over the batch)"""
+    return np.abs(bins - centre[..., None]) <= lobe
+
+
+def fold(freq, sample_rate=SAMPLE_RATE):
+    """Where a frequency lands after sampling: folded into 0..sample_rate/2"""
+    freq = np.mod(freq, sample_rate)
+    return np.where(freq > sample_rate / 2, sample_rate - freq, freq)
+
+
+def _db(ratio):
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(ratio)
+
+
+def analyze(x, sample_rate=SAMPLE_RATE, fundamental=None, harmonics=10, full_scale=FULL_SCALE):
+    """Metrics for each signal in x (..., N); fundamental in Hz per signal, or the strongest tone"""
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[-1]
+    power = power_spectrum(x, full_scale)
+    bins = np.arange(power.shape[-1])
+    bin_hz = sample_rate / n
+
+    dc = _lobe(bins, np.zeros(power.shape[:-1]))
+    if fundamental is None:
+        f0_bin = np.argmax(np.where(dc, 0, power), axis=-1).astype(np.float64)
+    else:
+        f0_bin = np.broadcast_to(np.asarray(fundamental, dtype=np.float64), power.shape[:-1]) / bin_hz
+    main = _lobe(bins, f0_bin)
+    signal = np.sum(power * main, axis=-1)
+    rest = ~(main | dc)
+
+    harmonic_power = np.zeros(power.shape[:-1])
+    alias_power = np.zeros(power.shape[:-1])
+    harmonic_mask = np.zeros(power.shape, dtype=bool)
+    for k in range(2, harmonics + 1):
+        freq = k * f0_bin * bin_hz
+        mask = _lobe(bins, fold(freq, sample_rate) / bin_hz) & rest & ~harmonic_mask
+        level = np.sum(power * mask, axis=-1)
+        harmonic_power += level
+        alias_power = np.maximum(alias_power, np.where(freq > sample_rate / 2, level, 0))
+        harmonic_mask |= mask
+
+    noise_and_distortion = np.sum(power * rest, axis=-1)
+    noise = np.maximum(noise_and_distortion - harmonic_power, np.finfo(float).tiny)
+    spur_bin = np.argmax(np.where(rest, power, 0), axis=-1)
+    spur = np.take_along_axis(power, spur_bin[..., None], axis=-1)[..., 0]
+    peak = np.max(np.where(main, power, 0), axis=-1)
+
+    return {
+        "fundamental_hz": f0_bin * bin_hz,
+        "dc_offset": x.mean(axis=-1) / full_scale,
+        "signal_dbfs": _db(signal),
+        "thd_db": _db(harmonic_power / signal),
+        "thdn_db": _db(noise_and_distortion / signal),
+        "snr_db": _db(signal / noise),
+        "sfdr_db": _db(peak / np.maximum(spur, np.finfo(float).tiny)),
+        "spur_hz": spur_bin * bin_hz,
+        "alias_db": _db(alias_power / signal),
+    }
+
+
+def summary(metrics, index=None):
+    """One line per signal for logs, e.g. summary(analyze(x))"""
+    rows = range(np.size(metrics["sfdr_db"])) if index is None else np.atleast_1d(index)
+    lines = []
+    for i in rows:
+        m = {k: np.ravel(v)[i] for k, v in metrics.items()}
+        lines.append(f"{m['fundamental_hz']:9.1f} Hz: {m['signal_dbfs']:6.1f} dBFS, "
+                     f"THD {m['thd_db']:6.1f} dB, THD+N {m['thdn_db']:6.1f} dB, SNR {m['snr_db']:5.1f} dB, "
+                     f"SFDR {m['sfdr_db']:5.1f} dB (spur at {m['spur_hz']:.0f} Hz), "
+                     f"aliases {m['alias_db']:6.1f} dB, DC {m['dc_offset']:+.2e}")
+    return "\n".join(lines)
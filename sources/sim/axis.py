@@ -0,0 +1,136 @@
+"""Cycle-level AXI-Stream source and sink for the cocotb testbenches.
+
+Both sides drive their outputs on the falling edge and look at the handshake
+in the ReadOnly phase right after, so what they see is what the DUT samples
+on the next rising edge. With the default patterns a source sends one beat
+per clock and a sink accepts one beat per clock.
+
+Throttling is a generator of 0/1 per clock: valid_pattern inserts idle
+cycles on a source, ready_pattern drops tready on a sink. Signals are passed
+in directly, so the same classes work for the plain valid/last ports
+(audio_valid, fft_valid, mag_valid) that have no tready.
+
+    source = AxisSource(dut.clk, dut.s_axis_tdata, dut.s_axis_tvalid, dut.s_axis_tlast)
+    sink = AxisSink(dut.clk, dut.mag_squared, dut.mag_valid, dut.mag_last)
+    cocotb.start_soon(source.send(data, last=1024))
+    out, last = await sink.collect(len(data))
+"""
+
+import itertools
+import random
+
+import numpy as np
+from cocotb.triggers import FallingEdge, ReadOnly
+
+
+def always():
+    """Full rate: 1 on every clock"""
+    return itertools.repeat(1)
+
+
+def random_pattern(probability=0.5, seed=None):
+    """1 with the given probability on each clock, reproducible with a seed"""
+    rng = random.Random(seed)
+    while True:
+        yield int(rng.random() < probability)
+
+
+def cycle_pattern(pattern):
+    """Repeat a fixed sequence, e.g. cycle_pattern([1, 1, 0]) for two beats out of three"""
+    return itertools.cycle([int(bool(p)) for p in pattern])
+
+
+def frame_last(count, frame_size):
+    """tlast flags for count beats split into frames of frame_size"""
+    return (np.arange(count) % frame_size) == frame_size - 1
+
+
+class AxisSource:
+    """Drives data/valid/last beats into a DUT, waiting on ready when there is one"""
+
+    def __init__(self, clk, data, valid, last=None, ready=None, valid_pattern=None):
+        self.clk = clk
+        self.data = data
+        self.valid = valid
+        self.last = last
+        self.ready = ready
+        self.valid_pattern = valid_pattern or always()
+        self.cycles = 0
+        self.valid.value = 0
+        if self.last is not None:
+            self.last.value = 0
+
+    async def send(self, data, last=None):
+        """Send every value of data; last is a frame size, a flag per beat or None.
+
+        Returns once the final beat has been accepted, with valid deasserted.
+        """
+        data = np.asarray(data).tolist()
+        if last is None:
+            flags = [0] * len(data)
+        elif np.ndim(last) == 0:
+            flags = frame_last(len(data), int(last)).astype(int).tolist()
+        else:
+            flags = np.asarray(last, dtype=bool).astype(int).tolist()
+
+        index = 0
+        await FallingEdge(self.clk)
+        while index < len(data):
+            offer = next(self.valid_pattern)
+            if offer:
+                self.data.value = data[index]
+                if self.last is not None:
+                    self.last.value = flags[index]
+            self.valid.value = offer
+            await ReadOnly()
+            if offer and (self.ready is None or self.ready.value == 1):
+                index += 1
+            self.cycles += 1
+            await FallingEdge(self.clk)
+        self.valid.value = 0
+        if self.last is not None:
+            self.last.value = 0
+
+
+class AxisSink:
+    """Collects beats from a DUT into preallocated arrays, throttling ready when there is one"""
+
+    def __init__(self, clk, data, valid, last=None, ready=None, ready_pattern=None, signed=False):
+        self.clk = clk
+        self.data = data
+        self.valid = valid
+        self.last = last
+        self.ready = ready
+        self.ready_pattern = ready_pattern or always()
+        self.signed = signed
+        self.cycles = 0
+        if self.ready is not None:
+            self.ready.value = 1
+
+    async def collect(self, count, timeout_cycles=None):
+        """Accept count beats and return (data, last) as int64 and bool arrays.
+
+        timeout_cycles bounds the wait (default: 100 clocks per beat, at least 1000).
+        """
+        data = np.empty(count, dtype=np.int64)
+        last = np.zeros(count, dtype=bool)
+        timeout_cycles = timeout_cycles or max(100 * count, 1000)
+        index = 0
+        start = self.cycles
+        while index < count:
+            await FallingEdge(self.clk)
+            accept = 1
+            if self.ready is not None:
+                accept = next(self.ready_pattern)
+                self.ready.value = accept
+            await ReadOnly()
+            if accept and self.valid.value == 1:
+                value = self.data.value
+                data[index] = value.signed_integer if self.signed else value.integer
+                if self.last is not None:
+                    last[index] = self.last.value == 1
+                index += 1
+            self.cycles += 1
+            if self.cycles - start > timeout_cycles:
+                raise TimeoutError(f"Only {index} of {count} beats after {timeout_cycles} clocks")
+        return data, last
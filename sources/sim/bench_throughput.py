@@ -0,0 +1,330 @@
+"""Simulation throughput benchmarks with a JSON history.
+
+Each workload drives one toplevel with a fixed amount of traffic:
+
+    voice_mixer        BENCH_N clocks of random voices, valid every cycle
+    delay_effect       BENCH_N samples streamed through the feedback delay
+    fft_input_handler  one 1024-sample frame in, 1024 AXI-Stream beats out
+    fft_mag            one 1024-bin FFT frame through the magnitude stage
+    log_scale          one 512-bin magnitude frame through the log stage
+    waterfall_row      one 512-bin row written and read back
+
+and records simulated cycles per wall-clock second, the number of triggers
+the testbench awaited and the simulator's peak RSS. Sources and parameters
+come from each toplevel's own testbench runner. Every run is appended to
+bench_history.json together with the git revision, and compared against the
+previous run on the same simulator.
+
+    python bench_throughput.py                     # all workloads
+    python bench_throughput.py voice_mixer -n 50000
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, FallingEdge, ClockCycles
+from cocotb.utils import get_sim_time
+
+from sim_runner import SIM_BUILD_DIR, SIM_DIR, collect_testbenches, run_testbench
+
+test_file = os.path.basename(__file__).replace(".py", "")
+
+HISTORY_FILE = SIM_DIR / "bench_history.json"
+DEFAULT_N = 20_000
+CLK_PERIOD_NS = 10
+
+# workload: (testbench module providing sources/parameters, cocotb test)
+WORKLOADS = {
+    "voice_mixer": ("test_voice_mixer", "bench_voice_mixer"),
+    "delay_effect": ("test_delay_effect", "bench_delay_effect"),
+    "fft_input_handler": ("test_fft_input_handler", "bench_fft_input_handler"),
+    "fft_mag": ("test_fft_mag", "bench_fft_mag"),
+    "log_scale": ("test_log_scale", "bench_log_scale"),
+    "waterfall_row": ("test_waterfall_buffer", "bench_waterfall_row"),
+}
+
+
+class Bench:
+    """Times a workload and counts the triggers it awaits"""
+
+    def __init__(self, dut, clk, period_ns=CLK_PERIOD_NS):
+        self.dut = dut
+        self.clk = clk
+        self.period_ns = period_ns
+        self.awaits = 0
+        cocotb.start_soon(Clock(clk, period_ns, units="ns").start(start_high=False))
+
+    async def wait(self, trigger):
+        self.awaits += 1
+        return await trigger
+
+    async def reset(self, *resets):
+        for rst in resets:
+            rst.value = 1
+        await self.wait(ClockCycles(self.clk, 2))
+        await self.wait(FallingEdge(self.clk))
+        for rst in resets:
+            rst.value = 0
+        self.awaits = 0
+        self.start_ns = get_sim_time("ns")
+        self.start_s = time.perf_counter()
+
+    def finish(self, **extra):
+        wall_s = time.perf_counter() - self.start_s
+        cycles = (get_sim_time("ns") - self.start_ns) / self.period_ns
+        result = {
+            "cycles": int(cycles),
+            "wall_s": round(wall_s, 4),
+            "cycles_per_s": round(cycles / wall_s, 1),
+            "awaits": self.awaits,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            **extra,
+        }
+        path = os.getenv("BENCH_RESULT")
+        if path:
+            Path(path).write_text(json.dumps(result))
+        self.dut._log.info(f"{result}")
+        return result
+
+
+def bench_n():
+    return int(os.getenv("BENCH_N", DEFAULT_N))
+
+
+def test_frame(num_samples=1024, seed=1):
+    """A deterministic full-scale frame: two tones plus a little noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(num_samples)
+    x = 0.4 * np.sin(2 * np.pi * 37 * t / num_samples) + 0.3 * np.sin(2 * np.pi * 211 * t / num_samples)
+    x += 0.05 * rng.standard_normal(num_samples)
+    return np.clip(x, -1, 1)
+
+
+@cocotb.test()
+async def bench_voice_mixer(dut):
+    num_voices = len(dut.voice_in_flat) // len(dut.mixed_out)
+    width = len(dut.mixed_out)
+    bench = Bench(dut, dut.clk)
+    dut.data_in_valid.value = 0
+    dut.voice_in_flat.value = 0
+    await bench.reset(dut.rst)
+
+    n = bench_n()
+    rng = np.random.default_rng(0)
+    voices = rng.integers(-(1 << (width - 4)), 1 << (width - 4), size=(n, num_voices), dtype=np.int64)
+    mask = (1 << width) - 1
+    # Pack each cycle's voices into the flat port value up front
+    flat = [sum((int(v) & mask) << (width * i) for i, v in enumerate(row)) for row in voices]
+    dut.data_in_valid.value = 1
+    for value in flat:
+        dut.voice_in_flat.value = value
+        await bench.wait(RisingEdge(dut.clk))
+    dut.data_in_valid.value = 0
+    bench.finish(samples=n)
+
+
+@cocotb.test()
+async def bench_delay_effect(dut):
+    bench = Bench(dut, dut.clk)
+    dut.sample_valid.value = 0
+    dut.audio_in.value = 0
+    dut.delay_samples.value = 1000
+    dut.feedback_amount.value = 128
+    dut.effect_amount.value = 128
+    dut.mode.value = 1
+    await bench.reset(dut.rst)
+
+    n = bench_n()
+    samples = (test_frame(n) * (1 << 28)).astype(np.int64).tolist()
+    dut.sample_valid.value = 1
+    for sample in samples:
+        dut.audio_in.value = sample
+        await bench.wait(RisingEdge(dut.clk))
+    dut.sample_valid.value = 0
+    bench.finish(samples=n)
+
+
+@cocotb.test()
+async def bench_fft_input_handler(dut):
+    bench = Bench(dut, dut.clk)
+    dut.audio_valid.value = 0
+    dut.audio_in.value = 0
+    dut.m_axis_tready.value = 1
+    await bench.reset(dut.rst)
+
+    samples = (test_frame() * (1 << 30)).astype(np.int64).tolist()
+    beats = 0
+    dut.audio_valid.value = 1
+    for sample in samples:
+        dut.audio_in.value = sample
+        await bench.wait(RisingEdge(dut.clk))
+        beats += dut.m_axis_tvalid.value == 1
+    dut.audio_valid.value = 0
+    while True:
+        await bench.wait(RisingEdge(dut.clk))
+        if dut.m_axis_tvalid.value == 1:
+            beats += 1
+            if dut.m_axis_tlast.value == 1:
+                break
+    bench.finish(beats=beats)
+
+
+@cocotb.test()
+async def bench_fft_mag(dut):
+    bench = Bench(dut, dut.clk)
+    dut.s_axis_tvalid.value = 0
+    dut.s_axis_tlast.value = 0
+    dut.s_axis_tdata.value = 0
+    await bench.reset(dut.rst)
+
+    spectrum = np.fft.fft(test_frame()) / 32
+    re = np.round(spectrum.real).astype(np.int64) & 0xFFFF
+    im = np.round(spectrum.imag).astype(np.int64) & 0xFFFF
+    beats = ((im << 16) | re).tolist()
+    outputs = 0
+    for i, beat in enumerate(beats):
+        dut.s_axis_tdata.value = beat
+        dut.s_axis_tvalid.value = 1
+        dut.s_axis_tlast.value = i == len(beats) - 1
+        while True:
+            await bench.wait(RisingEdge(dut.clk))
+            outputs += dut.mag_valid.value == 1
+            if dut.s_axis_tready.value == 1:
+                break
+    dut.s_axis_tvalid.value = 0
+    dut.s_axis_tlast.value = 0
+    while outputs < len(beats):
+        await bench.wait(RisingEdge(dut.clk))
+        outputs += dut.mag_valid.value == 1
+    bench.finish(beats=len(beats))
+
+
+@cocotb.test()
+async def bench_log_scale(dut):
+    bench = Bench(dut, dut.clk)
+    dut.mag_valid.value = 0
+    dut.mag_last.value = 0
+    dut.mag_squared.value = 0
+    await bench.reset(dut.rst)
+
+    spectrum = np.fft.fft(test_frame())[:512] / 32
+    mags = np.minimum(np.abs(spectrum) ** 2, 0xFFFFFFFF).astype(np.uint64).tolist()
+    outputs = 0
+    dut.mag_valid.value = 1
+    for i, mag in enumerate(mags):
+        dut.mag_squared.value = mag
+        dut.mag_last.value = i == len(mags) - 1
+        await bench.wait(RisingEdge(dut.clk))
+        outputs += dut.log_valid.value == 1
+    dut.mag_valid.value = 0
+    dut.mag_last.value = 0
+    while outputs < len(mags):
+        await bench.wait(RisingEdge(dut.clk))
+        outputs += dut.log_valid.value == 1
+    bench.finish(beats=len(mags))
+
+
+@cocotb.test()
+async def bench_waterfall_row(dut):
+    bench = Bench(dut, dut.wr_clk)
+    cocotb.start_soon(Clock(dut.rd_clk, 4 * CLK_PERIOD_NS, units="ns").start(start_high=False))
+    dut.log_in.value = 0
+    dut.log_valid.value = 0
+    dut.log_last.value = 0
+    dut.rd_bin.value = 0
+    dut.rd_row.value = 0
+    await bench.reset(dut.wr_rst, dut.rd_rst)
+
+    dut.log_valid.value = 1
+    for bin_num in range(512):
+        dut.log_in.value = bin_num & 0xFF
+        dut.log_last.value = bin_num == 511
+        await bench.wait(RisingEdge(dut.wr_clk))
+    dut.log_valid.value = 0
+    dut.log_last.value = 0
+    await bench.wait(ClockCycles(dut.wr_clk, 20))  # gray-code pointer crossing
+    for bin_num in range(512):
+        dut.rd_bin.value = bin_num
+        await bench.wait(RisingEdge(dut.rd_clk))
+    bench.finish(bins=512)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SIM_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_workload(name, n=DEFAULT_N, sim=None):
+    """Run one workload and return its result dict (None if it did not finish)"""
+    module, testcase = WORKLOADS[name]
+    config = collect_testbenches(importlib.import_module(module).test_runner)[0]
+    test_dir = SIM_BUILD_DIR / "bench" / name
+    test_dir.mkdir(parents=True, exist_ok=True)
+    result = test_dir / "bench.json"
+    result.unlink(missing_ok=True)
+    config.update(test_file=test_file, waves=False, sim=sim or config["sim"],
+                  extra_env={**config["extra_env"], "BENCH_N": str(n), "BENCH_RESULT": str(result)})
+    try:
+        run_testbench(**config, testcase=testcase, test_dir=test_dir, log_file=test_dir / "sim.log")
+    except (Exception, SystemExit) as e:
+        print(f"{name} failed: {e}")
+    return json.loads(result.read_text()) if result.is_file() else None
+
+
+def run_benchmarks(names=None, n=DEFAULT_N, sim=None, history_file=HISTORY_FILE):
+    """Run workloads, append them to the history file and print the change since the last run"""
+    sim = sim or os.getenv("SIM", "icarus")
+    results = {name: run_workload(name, n, sim) for name in names or WORKLOADS}
+    history = json.loads(Path(history_file).read_text()) if Path(history_file).is_file() else []
+    previous = next((run for run in reversed(history) if run["sim"] == sim), None)
+
+    print(f"{'workload':20s} {'cycles/s':>12s} {'change':>8s} {'awaits':>9s} {'peak RSS MB':>12s}")
+    for name, result in results.items():
+        if result is None:
+            print(f"{name:20s} {'failed':>12s}")
+            continue
+        change = ""
+        before = previous and previous["results"].get(name)
+        if before:
+            change = f"{100 * (result['cycles_per_s'] / before['cycles_per_s'] - 1):+.1f}%"
+        print(f"{name:20s} {result['cycles_per_s']:12,.0f} {change:>8s} {result['awaits']:9d} "
+              f"{result['peak_rss_kb'] / 1024:12.1f}")
+
+    history.append({
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "sim": sim,
+        "n": n,
+        "results": {name: result for name, result in results.items() if result is not None},
+    })
+    Path(history_file).write_text(json.dumps(history, indent=2) + "\n")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("workloads", nargs="*", help=f"any of {', '.join(WORKLOADS)} (default: all)")
+    parser.add_argument("-n", type=int, default=DEFAULT_N, help="clocks/samples for the streaming workloads")
+    parser.add_argument("--sim", default=None, help="simulator (default: SIM or icarus)")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON history file")
+    args = parser.parse_args()
+    unknown = set(args.workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+    run_benchmarks(args.workloads or None, args.n, args.sim, args.history)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,32 @@
 #!/usr/bin/env python3
-"""Calculate phase increment values for 48kHz sample rate"""
+"""Calculate DDS phase increment tables and their tuning error.
 
-import math
+With no arguments this prints note_freqs for 48 kHz, 32-bit accumulators and
+12-TET at A4 = 440 Hz, as before. Everything is vectorized over the 128 notes
+(see sources/scripts/lutgen/tuning.py), and comma-separated --rates and
+--bits report every combination at once:
+
+    python calc_phase_incr.py --a4 432 --detune -5          # print the table
+    python calc_phase_incr.py --rates 44100,48000 --bits 24,32 --octave --report
+    python calc_phase_incr.py --edo 19 --sv note_freqs.svh --mem note_freqs.mem
+    python calc_phase_incr.py --scale just.scl --apply      # retune synth.sv
+
+--report prints the worst-case frequency error of each note over all rates
+and widths (and of the octave voice, PHASE_INCR << 1, with --octave).
+--apply stores the tuning in lutgen/tuning.json and regenerates note_freqs
+in synth.sv through lutgen, so retuning needs no hand edits.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "scripts"))
+from lutgen import generate, tuning
+from lutgen.core import Table, render_mem, render_sv
+from lutgen.tables import note_table
 
 SAMPLE_RATE = 48000
 PHASE_ACCUMULATOR_BITS = 32
@@ -10,25 +35,100 @@ PHASE_ACCUMULATOR_BITS = 32
 # MIDI note 60 is middle C (C4) at 261.63 Hz
 # Formula: freq = 440 * 2^((note - 69) / 12)
 
-def midi_note_to_freq(note):
-    """Convert MIDI note number to frequency in Hz"""
-    return 440.0 * (2.0 ** ((note - 69) / 12.0))
+
+def midi_note_to_freq(note, **tuning_args):
+    """Convert MIDI note number(s) to frequency in Hz (12-TET at A4 = 440 Hz unless told otherwise)"""
+    return tuning.note_freqs(note, **tuning_args)
+
 
 def calc_phase_incr(freq, sample_rate, bits=32):
-    """Calculate phase increment for DDS at given sample rate"""
-    phase_incr = (freq * (2 ** bits)) / sample_rate
-    return int(round(phase_incr))
-
-print("// Phase increment values for 48kHz sample rate")
-print("// Formula: PHASE_INCR = (frequency * 2^32) / 48000")
-print()
-
-for note in range(128):
-    freq = midi_note_to_freq(note)
-    phase_incr = calc_phase_incr(freq, SAMPLE_RATE, PHASE_ACCUMULATOR_BITS)
-    print(f"assign note_freqs[{note}] = 32'd{phase_incr};  // Note {note}: {freq:.2f} Hz")
-
-# Verify a few key notes
-print("\n// Verification:")
-print(f"// Note 60 (middle C): {midi_note_to_freq(60):.2f} Hz -> PHASE_INCR = {calc_phase_incr(midi_note_to_freq(60), SAMPLE_RATE)}")
-print(f"// Note 69 (A4 440Hz): {midi_note_to_freq(69):.2f} Hz -> PHASE_INCR = {calc_phase_incr(midi_note_to_freq(69), SAMPLE_RATE)}")
+    """Calculate phase increment(s) for DDS at given sample rate"""
+    return tuning.phase_incr(freq, sample_rate, bits)
+
+
+def _csv(text, kind=int):
+    values = [kind(v) for v in text.split(",")]
+    return [int(v) if float(v).is_integer() else v for v in values]
+
+
+def print_table(tuning_args, sample_rate, bits):
+    freqs = midi_note_to_freq(np.arange(tuning.NOTES), **tuning_args)
+    incrs = calc_phase_incr(freqs, sample_rate, bits)
+    print(f"// Phase increment values for {sample_rate / 1000:g}kHz sample rate")
+    print(f"// Formula: PHASE_INCR = (frequency * 2^{bits}) / {sample_rate}")
+    print()
+    for note, (freq, incr) in enumerate(zip(freqs, incrs)):
+        print(f"assign note_freqs[{note}] = {bits}'d{incr};  // Note {note}: {freq:.2f} Hz")
+
+    # Verify a few key notes
+    print("\n// Verification:")
+    for note, name in ((60, "middle C"), (69, "A4")):
+        print(f"// Note {note} ({name}): {freqs[note]:.2f} Hz -> PHASE_INCR = {incrs[note]}")
+
+
+def print_report(tuning_args, rates, widths, octave):
+    # Axes: (octave voice, bits, rate, note)
+    voices = [0, 1] if octave else [0]
+    results = [tuning.report(sample_rate=np.array(rates)[:, None], bits=np.array(widths)[:, None, None],
+                             octave=o, **tuning_args) for o in voices]
+    stacked = {k: np.stack([r[k] for r in results]) for k in results[0]}
+    worst, where = tuning.worst_case(stacked)
+    voice, width, rate = np.unravel_index(where, stacked["error_cents"].shape[:-1])
+    print(f"{'note':>4} {'target Hz':>11} {'worst cents':>11} {'error Hz':>10}  at")
+    for note in range(tuning.NOTES):
+        index = (voice[note], width[note], rate[note], note)
+        flags = [name for name in ("aliased", "wrapped") if stacked[name][index]]
+        print(f"{note:4d} {stacked['freq'][index]:11.3f} {worst[note]:11.4f} {stacked['error_hz'][index]:10.4f}  "
+              f"{rates[rate[note]]} Hz, {widths[width[note]]}-bit{', octave voice' if voice[note] else ''}"
+              f"{' (' + ', '.join(flags) + ')' if flags else ''}")
+    audible = ~stacked["aliased"] & ~stacked["wrapped"]
+    print(f"// Worst over notes below Nyquist: {np.abs(np.where(audible, stacked['error_cents'], 0)).max():.4f} cents")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", default=str(SAMPLE_RATE), help="sample rates in Hz, comma separated")
+    parser.add_argument("--bits", default=str(PHASE_ACCUMULATOR_BITS), help="accumulator widths, comma separated")
+    parser.add_argument("--a4", type=float, default=tuning.A4, help="reference pitch of MIDI note 69 in Hz")
+    parser.add_argument("--detune", type=float, default=0.0, help="global detune in cents")
+    parser.add_argument("--edo", type=int, default=12, help="equal divisions of the octave")
+    parser.add_argument("--scale", default=None, help="Scala .scl file or cents list (0,...,period)")
+    parser.add_argument("--octave", action="store_true", help="also report the octave voice (PHASE_INCR << 1)")
+    parser.add_argument("--report", action="store_true", help="print the worst-case error per note")
+    parser.add_argument("--sv", default=None, help="write note_freqs assigns to this include file")
+    parser.add_argument("--mem", default=None, help="write the table as $readmemh hex to this file")
+    parser.add_argument("--apply", action="store_true", help="make this the tuning of note_freqs in synth.sv")
+    args = parser.parse_args()
+
+    rates, widths = _csv(args.rates, float), _csv(args.bits)
+    scale = None
+    if args.scale:
+        scale = tuning.read_scl(args.scale) if Path(args.scale).is_file() else _csv(args.scale, float)
+    tuning_args = {"a4": args.a4, "detune_cents": args.detune, "edo": args.edo, "scale": scale}
+
+    if args.report:
+        print_report(tuning_args, rates, widths, args.octave)
+    single = len(rates) == 1 and len(widths) == 1
+    if (args.sv or args.mem or args.apply or not args.report) and not single:
+        parser.error("tables need a single --rates and --bits value")
+    rate, bits = rates[0], widths[0]
+    if not args.report and not (args.sv or args.mem or args.apply):
+        print_table(tuning_args, rate, bits)
+    if args.sv or args.mem:
+        table = Table("note_freqs", bits, tuning.NOTES, lambda note: calc_phase_incr(
+            midi_note_to_freq(note, **tuning_args), rate, bits), style="assign", array="note_freqs")
+        values = table.values()
+        if args.sv:
+            Path(args.sv).write_text("\n".join(render_sv(table, values, "")) + "\n")
+        if args.mem:
+            Path(args.mem).write_text(render_mem(table, values, "calc_phase_incr"))
+    if args.apply:
+        if bits != PHASE_ACCUMULATOR_BITS:
+            parser.error(f"synth.sv's oscillators have {PHASE_ACCUMULATOR_BITS}-bit accumulators")
+        tuning.save_tuning({"sample_rate": rate, **tuning_args})
+        changed = generate([note_table(tuning.load_tuning())])
+        print("note_freqs regenerated in synth.sv" if changed else "note_freqs already in this tuning")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,8 @@ from cocotb.clock import Clock
 from cocotb.triggers import Timer, ClockCycles, RisingEdge, FallingEdge
 from cocotb.triggers import ReadOnly,with_timeout, Edge, ReadWrite, NextTimeStep, First
 from cocotb.utils import get_sim_time as gst
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 test_file = os.path.basename(__file__).replace(".py","")
 
 def generate_signed_8bit_sine_waves(sample_rate, duration,frequencies, amplitudes):
@@ -49,6 +50,11 @@ for i in range(100):
     else:
         plays.append(0)            
 
+@deferred_plot("delay_test_a.png")
+def plot_output(output):
+    plt.figure()
+    plt.plot(output)
+
 @cocotb.test()
 async def test_a(dut):
     my_output = np.zeros(100)
@@ -66,9 +72,7 @@ async def test_a(dut):
             my_output[i-1] += dut.data_out.value.signed_integer
         await Timer(10,'ns')
     my_output[99] += dut.data_out.value.signed_integer
-    plt.figure()
-    plt.plot(my_output)
-    plt.show()
+    plot_output(output=my_output)
 
 def test_runner():
     """Simulate the counter using the Python runner."""
@@ -80,22 +84,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "delay"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
  
 if __name__ == "__main__":
@@ -5,31 +5,37 @@ from pathlib import Path
 import numpy as np
 import matplotlib.pyplot as plt
 from cocotb.clock import Clock
-from cocotb.triggers import Timer, RisingEdge
-from cocotb.runner import get_runner
+from cocotb.triggers import Timer, RisingEdge, FallingEdge, ClockCycles
+from sim_runner import run_testbench
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import oscillator_model
 
 @cocotb.test()
 async def test_sine_direct(dut):
-    """Direct test of sine generator"""
+    """Direct test of sine generator against the oscillator model"""
     cocotb.start_soon(Clock(dut.clk_in, 10, units="ns").start())
 
+    phase_incr = 23409859  # Middle C
     dut.rst_in.value = 1
-    dut.step_in.value = 0
-    dut.PHASE_INCR.value = 23409859  # Middle C
-    await RisingEdge(dut.clk_in)
-    dut.rst_in.value = 0
     dut.step_in.value = 1
-    await RisingEdge(dut.clk_in)
+    dut.PHASE_INCR.value = phase_incr
+    await ClockCycles(dut.clk_in, 2)  # sine_lut's ROM register has no reset
+    await FallingEdge(dut.clk_in)
+    dut.rst_in.value = 0
 
     # Collect 200 samples
     samples = []
     for _ in range(200):
-        await RisingEdge(dut.clk_in)
+        await FallingEdge(dut.clk_in)
         val = dut.amp_out.value.signed_integer
         samples.append(val)
 
     data = np.array(samples, dtype=np.int64)
     dut._log.info(f"Sine: min={np.min(data):e}, max={np.max(data):e}, mean={np.mean(data):.2e}")
+    expected = oscillator_model.generator_out(oscillator_model.SINE, phase_incr, len(data))
+    mismatches = np.flatnonzero(data != expected)
+    assert len(mismatches) == 0, f"{len(mismatches)} mismatches, first at sample {mismatches[0]}"
 
     # Plot
     plt.figure(figsize=(12, 6))
@@ -49,19 +55,13 @@ def test_runner():
     sources = [proj_path / "hdl" / "sine.sv"]
 
     hdl_toplevel = "sine_generator"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_testbench(
+        test_file=os.path.basename(__file__).replace(".py",""),
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=["-Wall"],
-        timescale=('1ns','1ps'),
-        waves=True
-    )
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=os.path.basename(__file__).replace(".py",""),
-        waves=True
+        parameters={},
+        sim=sim
     )
 
 if __name__ == "__main__":
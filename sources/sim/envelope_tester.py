@@ -12,7 +12,8 @@ from cocotb.clock import Clock
 from cocotb.triggers import Timer, ClockCycles, RisingEdge, FallingEdge
 from cocotb.triggers import ReadOnly,with_timeout, Edge, ReadWrite, NextTimeStep, First
 from cocotb.utils import get_sim_time as gst
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 test_file = os.path.basename(__file__).replace(".py","")
 
 def generate_signed_8bit_sine_waves(sample_rate, duration,frequencies, amplitudes):
@@ -57,6 +58,12 @@ for i in range(1000):
 # model_output = lfilter(coeffs, [1.0], si)
 # #my_output = np.zeros(1000)
 
+@deferred_plot("envelope_tester_a.png")
+def plot_output(t, si, output):
+    plt.figure()
+    plt.plot(t,[int(i) for i in si])
+    plt.plot(t,output)
+
 @cocotb.test()
 async def test_a(dut):
     my_output = np.zeros(1000)
@@ -78,10 +85,7 @@ async def test_a(dut):
             my_output[i-1] += dut.data_out.value.signed_integer
         await Timer(10,'ns')
     my_output[999] += dut.data_out.value.signed_integer
-    plt.figure()
-    plt.plot(t,[int(i) for i in si])
-    plt.plot(t,my_output)
-    plt.show()
+    plot_output(t=t, si=si, output=my_output)
 
 
 def test_runner():
@@ -94,22 +98,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "envelope"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
  
 if __name__ == "__main__":
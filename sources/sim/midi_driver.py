@@ -0,0 +1,147 @@
+"""Shared MIDI UART driver for the synth and midi_rx testbenches.
+
+Messages are (time_ns, data) pairs, where data is the message bytes and
+time_ns is the earliest start time relative to the call to send (None sends
+right after the previous byte). The 31.25 kbaud waveform is worked out ahead
+of time as a list of level transitions (a message at a time, so lazy streams
+such as a MIDI file work too), and the driver only wakes up on those
+transitions: a run of equal bits costs one await instead of one per bit slot.
+
+Bytes are framed like a standard UART: start bit (0), eight data bits LSB
+first, stop bit (1), idle high.
+"""
+
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_time
+
+MIDI_BAUD = 31_250
+BIT_PERIOD_NS = 1_000_000_000 // MIDI_BAUD  # 32000 ns
+
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+PROGRAM_CHANGE = 0xC0
+
+
+def note_on(note, velocity, channel=0):
+    return [NOTE_ON | (channel & 0x0F), note & 0x7F, velocity & 0x7F]
+
+
+def note_off(note, velocity=0, channel=0):
+    return [NOTE_OFF | (channel & 0x0F), note & 0x7F, velocity & 0x7F]
+
+
+def program_change(program, channel=0):
+    return [PROGRAM_CHANGE | (channel & 0x0F), program & 0x7F]
+
+
+def frame_bits(byte):
+    """Line levels for one UART frame: start bit, LSB-first data, stop bit"""
+    return [0] + [(byte >> i) & 1 for i in range(8)] + [1]
+
+
+class UartFramer:
+    """Turns messages into line transitions one message at a time.
+
+    Keeps the line level, the time the line becomes free and the running
+    status between messages, so an endless message stream can be framed
+    without ever holding more than one message worth of edges.
+    """
+
+    def __init__(self, bit_period_ns=BIT_PERIOD_NS, running_status=False):
+        self.bit_period_ns = bit_period_ns
+        self.running_status = running_status
+        self.level = 1
+        self.line_free = 0
+        self.last_status = None
+
+    def message_bytes(self, data):
+        """Bytes actually sent for a message, with the status dropped under running status"""
+        data = [int(b) & 0xFF for b in data]
+        if data and data[0] & 0x80:
+            status = data[0]
+            if self.running_status and status == self.last_status and status < 0xF0:
+                data = data[1:]
+            # System real-time bytes do not affect running status, anything else does
+            if status < 0xF8:
+                self.last_status = status if status < 0xF0 else None
+        return data
+
+    def message_edges(self, time_ns, data):
+        """(edges, end_ns) for one message, edges being the (time_ns, level) line changes"""
+        start = self.line_free if time_ns is None else max(int(time_ns), self.line_free)
+        edges = []
+        for byte in self.message_bytes(data):
+            for i, bit in enumerate(frame_bits(byte)):
+                if bit != self.level:
+                    edges.append((start + i * self.bit_period_ns, bit))
+                    self.level = bit
+            start += 10 * self.bit_period_ns
+        self.line_free = start
+        return edges, start
+
+
+def byte_schedule(messages, bit_period_ns=BIT_PERIOD_NS, running_status=False):
+    """(start_ns, byte) for every byte on the wire.
+
+    With running_status, a channel message whose status byte matches the
+    previous one is sent without it, as a MIDI transmitter is allowed to.
+    """
+    framer = UartFramer(bit_period_ns, running_status)
+    frame_ns = 10 * bit_period_ns
+    schedule = []
+    for time_ns, data in messages:
+        start = framer.line_free if time_ns is None else max(int(time_ns), framer.line_free)
+        data = framer.message_bytes(data)
+        schedule.extend((start + i * frame_ns, byte) for i, byte in enumerate(data))
+        framer.line_free = start + len(data) * frame_ns
+    return schedule
+
+
+def edge_schedule(messages, bit_period_ns=BIT_PERIOD_NS, running_status=False):
+    """Line transitions for a list of messages, starting from idle high.
+
+    Returns (edges, end_ns): edges is a list of (time_ns, level) at which the
+    line actually changes, end_ns is the end of the last stop bit.
+    """
+    framer = UartFramer(bit_period_ns, running_status)
+    edges = []
+    for time_ns, data in messages:
+        message_edges, _ = framer.message_edges(time_ns, data)
+        edges.extend(message_edges)
+    return edges, framer.line_free
+
+
+class MidiDriver:
+    """Drives a serial MIDI input (midi_in / data_in) from a message list"""
+
+    def __init__(self, signal, bit_period_ns=BIT_PERIOD_NS):
+        self.signal = signal
+        self.bit_period_ns = bit_period_ns
+        self.signal.value = 1
+
+    async def send(self, messages, running_status=False, on_message=None):
+        """Send timestamped messages and return once the last stop bit is done.
+
+        messages may be any iterable, including a lazy generator; it is framed
+        one message at a time. on_message(time_ns, data) is called at the end
+        of each message's last stop bit.
+        """
+        framer = UartFramer(self.bit_period_ns, running_status)
+        # get_sim_time("ns") is a float, so delays are rounded back to whole ns
+        start = get_sim_time("ns")
+        for time_ns, data in messages:
+            edges, end_ns = framer.message_edges(time_ns, data)
+            for edge_ns, level in edges:
+                delay = round(start + edge_ns - get_sim_time("ns"))
+                if delay > 0:
+                    await Timer(delay, "ns")
+                self.signal.value = level
+            delay = round(start + end_ns - get_sim_time("ns"))
+            if delay > 0:
+                await Timer(delay, "ns")
+            if on_message is not None:
+                on_message(time_ns, data)
+
+    async def send_bytes(self, data):
+        """Send raw bytes back to back"""
+        await self.send([(None, data)])
@@ -0,0 +1,211 @@
+"""Streaming Standard MIDI File reader and synth playback helpers.
+
+Tracks are parsed lazily straight from the file in fixed-size chunks and
+merged by tick with heapq.merge, so a song is never held in memory: only one
+pending event per track exists at a time. midi_messages turns the merged
+stream into (time_ns, data) messages for midi_driver.MidiDriver.send, and
+VoiceMonitor watches a receiver's voice outputs while they play to count
+dropped and stolen notes. test_midi_rx plays a file (MIDI_FILE) into the UART
+midi_rx in sim/; the synth toplevels do not decode MIDI (hdl/synth.sv takes
+its notes from the buttons and hdl/midi_rx.sv plays a song from ROM).
+"""
+
+import heapq
+import struct
+
+from midi_driver import NOTE_OFF, NOTE_ON, PROGRAM_CHANGE
+
+DEFAULT_TEMPO_US = 500_000  # 120 bpm until the first tempo meta event
+READ_CHUNK = 64 * 1024
+
+# Data bytes following each channel message status (high nibble)
+_DATA_LENGTH = {0x80: 2, 0x90: 2, 0xA0: 2, 0xB0: 2, 0xC0: 1, 0xD0: 1, 0xE0: 2}
+
+
+class MidiFileError(Exception):
+    pass
+
+
+def _file_bytes(path, offset, length):
+    """Bytes of a file region, read READ_CHUNK at a time"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while length > 0:
+            chunk = f.read(min(READ_CHUNK, length))
+            if not chunk:
+                raise MidiFileError(f"{path}: track ends {length} bytes early")
+            length -= len(chunk)
+            yield from chunk
+
+
+def _read_vlq(data):
+    value = 0
+    for _ in range(4):
+        byte = next(data)
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value
+    raise MidiFileError("variable-length quantity longer than 4 bytes")
+
+
+def read_header(path):
+    """(format, division, track_regions) where track_regions is a list of (offset, length)"""
+    with open(path, "rb") as f:
+        chunk_id, length = struct.unpack(">4sI", f.read(8))
+        if chunk_id != b"MThd" or length < 6:
+            raise MidiFileError(f"{path}: not a Standard MIDI File")
+        fmt, num_tracks, division = struct.unpack(">HHH", f.read(6))
+        f.seek(length - 6, 1)
+        tracks = []
+        while len(tracks) < num_tracks:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, length = struct.unpack(">4sI", header)
+            if chunk_id == b"MTrk":
+                tracks.append((f.tell(), length))
+            f.seek(length, 1)  # skip the body (and any unknown chunk)
+    return fmt, division, tracks
+
+
+def track_events(path, offset, length):
+    """Lazily yield (tick, kind, data) for one track.
+
+    kind is "channel" (data = full message bytes with the status restored
+    under running status) or "tempo" (data = microseconds per quarter note).
+    Other meta events and sysex are skipped.
+    """
+    data = _file_bytes(path, offset, length)
+    tick = 0
+    status = None
+    while True:
+        try:
+            tick += _read_vlq(data)
+            byte = next(data)
+        except StopIteration:
+            return
+        try:
+            if byte == 0xFF:
+                meta_type = next(data)
+                meta = bytes([next(data) for _ in range(_read_vlq(data))])
+                if meta_type == 0x2F:
+                    return
+                if meta_type == 0x51 and len(meta) == 3:
+                    yield tick, "tempo", int.from_bytes(meta, "big")
+            elif byte in (0xF0, 0xF7):
+                status = None
+                for _ in range(_read_vlq(data)):
+                    next(data)
+            else:
+                if byte & 0x80:
+                    status = byte
+                    first = []
+                elif status is None:
+                    raise MidiFileError(f"{path}: data byte 0x{byte:02X} without running status")
+                else:
+                    first = [byte]
+                remaining = _DATA_LENGTH.get(status & 0xF0, 0) - len(first)
+                yield tick, "channel", [status] + first + [next(data) for _ in range(remaining)]
+        except StopIteration:
+            raise MidiFileError(f"{path}: track truncated in the middle of an event")
+
+
+def merged_events(path):
+    """All tracks merged into one tick-ordered stream (ties keep track order)"""
+    fmt, division, tracks = read_header(path)
+    streams = [track_events(path, offset, length) for offset, length in tracks]
+    return division, heapq.merge(*streams, key=lambda event: event[0])
+
+
+def midi_messages(path, time_scale=1.0, program_changes=False, max_messages=None):
+    """(time_ns, data) note messages from a MIDI file, ready for MidiDriver.send.
+
+    Times follow the file's tempo map; time_scale < 1 compresses the song so
+    long pieces fit in a simulation (the UART then queues dense passages, as a
+    real sender would). Note on with velocity 0 is sent as a note off, since
+    midi_rx.sv only frees a voice on 0x8n. Program changes are dropped unless
+    program_changes is set, because midi_rx maps them straight to wave_type.
+    """
+    division, events = merged_events(path)
+    if division & 0x8000:
+        # SMPTE: -frames per second in the high byte, ticks per frame in the low byte
+        fps = 256 - (division >> 8)
+        tick_ns = lambda tempo: 1e9 / (fps * (division & 0xFF))
+    else:
+        tick_ns = lambda tempo: tempo * 1000 / division
+    tempo = DEFAULT_TEMPO_US
+    last_tick = 0
+    time_ns = 0.0
+    count = 0
+    for tick, kind, data in events:
+        time_ns += (tick - last_tick) * tick_ns(tempo)
+        last_tick = tick
+        if kind == "tempo":
+            tempo = data
+            continue
+        status = data[0] & 0xF0
+        if status == NOTE_ON and data[2] == 0:
+            data = [NOTE_OFF | (data[0] & 0x0F), data[1], 0]
+        elif status not in (NOTE_ON, NOTE_OFF) and not (program_changes and status == PROGRAM_CHANGE):
+            continue
+        yield int(time_ns * time_scale), data
+        count += 1
+        if max_messages is not None and count >= max_messages:
+            return
+
+
+class VoiceMonitor:
+    """Counts voice allocation outcomes on a receiver's on_out while messages play.
+
+    Pass it as on_message to MidiDriver.send. After every note on it compares
+    on_out with its value after the previous message: no new voice means the
+    note was dropped, a voice turning off means one was stolen. If notes (the
+    packed per-voice note numbers, midi_rx's note_out) is given, a voice that
+    stays on but changes note also counts as a steal. The counts only mean
+    something if on_out is driven by the receiver the messages go into.
+    """
+
+    def __init__(self, ons_out, num_voices=8, notes=None):
+        self.ons_out = ons_out
+        self.notes = notes
+        self.num_voices = num_voices
+        self.note_ons = 0
+        self.note_offs = 0
+        self.dropped = 0
+        self.steals = 0
+        self.max_polyphony = 0
+        self._ons = 0
+        self._notes = 0
+
+    def _voice_notes(self, value):
+        return [(value >> (7 * i)) & 0x7F for i in range(self.num_voices)]
+
+    def __call__(self, time_ns, data):
+        ons = self.ons_out.value.integer & ((1 << self.num_voices) - 1)
+        notes = self.notes.value.integer if self.notes is not None else 0
+        status = data[0] & 0xF0
+        if status == NOTE_ON and data[2] != 0:
+            self.note_ons += 1
+            new_voices = ons & ~self._ons
+            stolen = bin(self._ons & ~ons).count("1")
+            if self.notes is not None:
+                before, after = self._voice_notes(self._notes), self._voice_notes(notes)
+                stolen += sum(1 for i in range(self.num_voices)
+                              if (self._ons & ons) >> i & 1 and before[i] != after[i])
+            self.steals += stolen
+            if not new_voices and not stolen:
+                self.dropped += 1
+        elif status in (NOTE_ON, NOTE_OFF):
+            self.note_offs += 1
+        self.max_polyphony = max(self.max_polyphony, bin(ons).count("1"))
+        self._ons = ons
+        self._notes = notes
+
+    def report(self):
+        return {
+            "note_ons": self.note_ons,
+            "note_offs": self.note_offs,
+            "dropped": self.dropped,
+            "steals": self.steals,
+            "max_polyphony": self.max_polyphony,
+        }
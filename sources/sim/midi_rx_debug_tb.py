@@ -4,34 +4,16 @@ import sys
 from pathlib import Path
 from cocotb.clock import Clock
 from cocotb.triggers import Timer, ClockCycles, RisingEdge
-from cocotb.runner import get_runner
+from sim_runner import run_testbench
 test_file = os.path.basename(__file__).replace(".py","")
 
-def bits_lsb_first(num):
-    """Convert byte to list of bits in LSB-first order (for UART transmission)"""
-    return [(num >> i) & 1 for i in range(8)]
+from midi_driver import MidiDriver, MIDI_BAUD, frame_bits
 
-async def send_uart_byte(dut, byte_val, bit_period_ns=32000):
+async def send_uart_byte(dut, byte_val):
     """Send a single byte via UART with detailed logging"""
     dut._log.info(f"Sending byte 0x{byte_val:02X} = 0b{byte_val:08b}")
-    bits = bits_lsb_first(byte_val)
-    dut._log.info(f"  LSB-first bits: {bits}")
-
-    # Start bit (low)
-    dut._log.info(f"  START bit (0)")
-    dut.data_in.value = 0
-    await Timer(bit_period_ns, 'ns')
-
-    # Data bits (LSB first)
-    for i, bit in enumerate(bits):
-        dut._log.info(f"  Data bit {i}: {bit}")
-        dut.data_in.value = bit
-        await Timer(bit_period_ns, 'ns')
-
-    # Stop bit (high)
-    dut._log.info(f"  STOP bit (1)")
-    dut.data_in.value = 1
-    await Timer(bit_period_ns, 'ns')
+    dut._log.info(f"  Frame (start, LSB-first data, stop): {frame_bits(byte_val)}")
+    await MidiDriver(dut.data_in).send_bytes([byte_val])
 
 @cocotb.test()
 async def test_single_byte(dut):
@@ -50,7 +32,7 @@ async def test_single_byte(dut):
     dut.rst.value = 0
     await ClockCycles(dut.clk, 5)
 
-    dut._log.info(f"BAUD_BIT_PERIOD = {100_000_000 // 31_250} cycles")
+    dut._log.info(f"BAUD_BIT_PERIOD = {100_000_000 // MIDI_BAUD} cycles")
     dut._log.info("Reset complete.\n")
 
     # Monitor state changes
@@ -133,22 +115,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "midi_rx"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""Bit-accurate NumPy model of adsr_envelope.sv.
+
+The envelope state machine only advances on ms_pulse, so the model works in
+pulses rather than clock cycles: index p of the result is envelope_out after
+the p-th ms_pulse following reset release (see pulse_cycle for the matching
+clock edge). Between note events every state is a fixed arithmetic step, so
+each segment is evaluated in closed form over a whole block of pulses at once
+instead of pulse by pulse.
+
+All arithmetic mirrors the RTL widths: envelope_out wraps at ENVELOPE_WIDTH
+bits, counter is RATE_WIDTH+1 bits, and comparisons against `x_time - 1` are
+done at 32 bits because the literal 1 is unsized (so a time of 0 never matches
+the counter).
+"""
+
+import numpy as np
+
+IDLE = 0
+ATTACK = 1
+DECAY = 2
+SUSTAIN = 3
+RELEASE = 4
+
+# localparam DIVIDER in adsr_envelope.sv (simulation value)
+DIVIDER = 1000
+
+
+def pulse_cycle(pulse, divider=DIVIDER):
+    """Rising edge (counted from 0 after reset release) on which ms_pulse number pulse is consumed"""
+    return (np.asarray(pulse) + 1) * divider
+
+
+def max_envelope(envelope_width=32):
+    return (1 << (envelope_width - 1)) - 1
+
+
+def sustain_level(sustain_percent, envelope_width=32):
+    """(MAX_ENVELOPE * percent) / 100 with the percent clamped to 100"""
+    percent = min(int(sustain_percent) & 0x7F, 100)
+    return (max_envelope(envelope_width) * percent) // 100
+
+
+def envelope_steps(attack_time, decay_time, sustain_percent, release_time, envelope_width=32):
+    """(attack_step, decay_step, release_step, sustain_level) as computed by the combinational block"""
+    top = max_envelope(envelope_width)
+    sustain = sustain_level(sustain_percent, envelope_width)
+    attack_step = top // attack_time if attack_time else top
+    decay_step = (top - sustain) // decay_time if decay_time else top
+    release_step = top // release_time if release_time else top
+    return attack_step, decay_step, release_step, sustain
+
+
+def adsr_envelope(attack_time, decay_time, sustain_percent, release_time, note_events, num_pulses,
+                  envelope_width=32, rate_width=16):
+    """envelope_out after each of num_pulses ms_pulses.
+
+    note_events is an iterable of (pulse, note_on) pairs: note_on is driven to
+    that level before pulse number `pulse` (at least one clock before the edge
+    that consumes it). Several events before the same pulse are applied in
+    order, so a short tap sets both the rising and falling edge latches just
+    like the RTL.
+    """
+    mask = (1 << envelope_width) - 1
+    time_mask = (1 << rate_width) - 1
+    attack_time &= time_mask
+    decay_time &= time_mask
+    release_time &= time_mask
+    top = max_envelope(envelope_width)
+    attack_step, decay_step, release_step, sustain = envelope_steps(
+        attack_time, decay_time, sustain_percent, release_time, envelope_width)
+    # `x_time - 1` compared at 32 bits: 0 becomes 0xFFFFFFFF, which the counter never reaches
+    attack_end = (attack_time - 1) & 0xFFFFFFFF
+    decay_end = (decay_time - 1) & 0xFFFFFFFF
+    release_end = (release_time - 1) & 0xFFFFFFFF
+    counter_mask = (1 << (rate_width + 1)) - 1
+
+    events = sorted(((int(p), i, int(bool(level))) for i, (p, level) in enumerate(note_events)))
+    out = np.zeros(num_pulses, dtype=np.uint64)
+
+    state, envelope, counter = IDLE, 0, 0
+    note_on, rising, falling = 0, False, False
+    event_index = 0
+    p = 0
+    while p < num_pulses:
+        while event_index < len(events) and events[event_index][0] <= p:
+            level = events[event_index][2]
+            rising |= level and not note_on
+            falling |= note_on and not level
+            note_on = level
+            event_index += 1
+        next_event = events[event_index][0] if event_index < len(events) else num_pulses
+        length = min(next_event, num_pulses) - p
+
+        # Pending edge that the current state acts on: evaluate a single pulse
+        if rising and state in (IDLE, RELEASE):
+            if state == IDLE:
+                envelope = 0
+            state, counter, rising = ATTACK, 0, False
+            out[p] = envelope
+            p += 1
+            continue
+        if falling and state in (ATTACK, DECAY, SUSTAIN):
+            if state == SUSTAIN:
+                envelope = sustain
+            state, counter, falling = RELEASE, 0, False
+            out[p] = envelope
+            p += 1
+            continue
+
+        # Otherwise the state is a fixed step until it ends or the next note event
+        j = np.arange(length, dtype=np.uint64)
+        if state == IDLE:
+            out[p:p + length] = 0
+            envelope = 0
+            p += length
+            continue
+        if state == SUSTAIN:
+            out[p:p + length] = sustain
+            envelope = sustain
+            p += length
+            continue
+
+        if state == ATTACK:
+            counters = (counter + j) & counter_mask
+            done = counters == attack_end
+            values = (envelope + (j + 1) * attack_step) & mask
+            end_value, next_state = top, DECAY
+        elif state == DECAY:
+            counters = (counter + j) & counter_mask
+            before = (envelope - j * decay_step) & mask
+            done = (counters == decay_end) | (((before - decay_step) & mask) <= sustain)
+            values = (before - decay_step) & mask
+            end_value, next_state = sustain, SUSTAIN
+        else:
+            counters = (counter + j) & counter_mask
+            before = (envelope - j * release_step) & mask
+            done = (counters >= release_end) | (before <= release_step)
+            values = (before - release_step) & mask
+            end_value, next_state = 0, IDLE
+
+        stop = int(np.argmax(done)) if done.any() else length
+        out[p:p + stop] = values[:stop]
+        if stop < length:
+            out[p + stop] = end_value
+            envelope, state, counter = end_value, next_state, 0
+            p += stop + 1
+        else:
+            envelope = int(values[-1])
+            counter = (counter + length) & counter_mask
+            p += length
+    return out
+
+
+def note_events_from_levels(levels):
+    """Convert a per-pulse note_on array into the (pulse, note_on) events adsr_envelope takes"""
+    levels = np.asarray(levels).astype(bool)
+    changes = np.flatnonzero(np.diff(levels.astype(np.int8), prepend=0))
+    return [(int(p), int(levels[p])) for p in changes]
@@ -0,0 +1,136 @@
+"""Bit-accurate streaming model of delay_effect.sv and variable_delay_buffer.sv.
+
+The model works in samples rather than clocks. Sample k is the k-th
+sample_valid strobe after reset, strobes come every `spacing` clocks
+(1 = back-to-back), and audio_in holds its value between strobes and after the
+last one. Under those rules every pipeline register reduces to a fixed sample
+offset:
+
+    buf[k]  = x[k]                                       (mode 0)
+    buf[k]  = sat(x[k-1] + (buf[k-L-D] * fb >>> FW))     (mode 1)
+    y[k]    = ((dry * x[k+F] + wet * buf[k-D]) >>> 8)[DW-1:0]
+
+where buf is what gets written to RAM address k, D is delay_samples,
+L = ceil(8 / spacing) is the feedback loop latency in samples and
+F = 3 // spacing is how far the dry path runs ahead of the wet one. The
+feedback adds the previous input because feedback_sum uses dry_aligned_stg[0]
+one clock late, and the dry/wet gains are $signed() 8-bit values, so
+effect_amount >= 128 gives a negative wet gain and <= 127 a negative dry gain.
+y[k] appears on audio_out OUTPUT_LATENCY clocks after its strobe.
+
+Feedforward mode is one vectorized slice of the history; feedback mode is a
+recurrence whose shortest dependency is L + D samples, so it is solved in
+chunks of that length, each chunk being one vectorized step.
+"""
+
+import numpy as np
+
+OUTPUT_LATENCY = 9  # clocks from sample_valid to audio_out_valid
+
+
+def _wrap(values, bits):
+    """Two's complement wrap of int64 values to a signed bits-wide field"""
+    values = np.asarray(values, dtype=np.int64)
+    return ((values + (1 << (bits - 1))) & ((1 << bits) - 1)) - (1 << (bits - 1))
+
+
+def _signed8(value):
+    value &= 0xFF
+    return value - 256 if value & 0x80 else value
+
+
+def mix_gains(effect_amount):
+    """(dry_gain, wet_gain) as the RTL multiplies them: $signed(8'd255 - effect) and $signed(effect)"""
+    return _signed8(255 - effect_amount), _signed8(effect_amount)
+
+
+def loop_latency(spacing=1):
+    """L: samples between a delayed sample leaving the buffer and feeding back into it"""
+    return -(-8 // spacing)
+
+
+def dry_lookahead(spacing=1):
+    """F: how many samples ahead of the wet sample the dry path is when they are mixed"""
+    return 3 // spacing
+
+
+class DelayEffectModel:
+    """Block-at-a-time model of one delay_effect instance with fixed controls.
+
+    process(x) takes the next block of input samples and returns the outputs
+    that are complete so far; with back-to-back strobes the dry path needs
+    the next F inputs, so the last F outputs of a block come out with the next
+    block (or from flush(), which assumes audio_in holds the last sample).
+    """
+
+    def __init__(self, delay_samples, feedback_amount=0, effect_amount=255, mode=0, spacing=1,
+                 addr_width=16, data_width=32, feedback_width=8):
+        self.delay = int(delay_samples) & ((1 << addr_width) - 1)
+        self.feedback = int(feedback_amount) & ((1 << feedback_width) - 1)
+        self.mode = int(mode) & 1
+        self.data_width = data_width
+        self.feedback_width = feedback_width
+        self.dry_gain, self.wet_gain = mix_gains(int(effect_amount))
+        self.loop = loop_latency(spacing) + self.delay
+        self.lookahead = dry_lookahead(spacing)
+        self.max_positive = (1 << (data_width - 1)) - 1
+        self.max_negative = -(1 << (data_width - 1))
+        # Written buffer samples still reachable by a read (RAM starts out zeroed)
+        self._buf = np.zeros(self.loop if self.mode else self.delay, dtype=np.int64)
+        self._last_x = 0
+        self._pending_wet = np.zeros(0, dtype=np.int64)
+
+    def _feedback_block(self, x):
+        m = self.loop
+        x_prev = np.concatenate(([self._last_x], x[:-1]))
+        ext = np.concatenate((self._buf, np.zeros(len(x), dtype=np.int64)))
+        # ext[k] is buf[k - m] for block sample k, so a chunk of m samples only reads earlier chunks
+        for start in range(0, len(x), m):
+            end = min(start + m, len(x))
+            scaled = _wrap(ext[start:end] * self.feedback, self.data_width + self.feedback_width)
+            feedback = _wrap(scaled >> self.feedback_width, self.data_width)
+            ext[m + start:m + end] = np.clip(x_prev[start:end] + feedback, self.max_negative, self.max_positive)
+        return ext
+
+    def process(self, x):
+        """Feed a block of samples (any integer array), return the finished outputs as int64"""
+        x = _wrap(np.asarray(x, dtype=np.int64), self.data_width)
+        if len(x) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self.mode:
+            ext = self._feedback_block(x)
+        else:
+            ext = np.concatenate((self._buf, x))
+        # buf[k - D] for every sample of the block
+        history = len(ext) - len(x)
+        wet = ext[history - self.delay:len(ext) - self.delay]
+        self._buf = ext[len(ext) - len(self._buf):] if len(self._buf) else self._buf
+        self._last_x = int(x[-1])
+
+        # Sample j mixes with x[j + F]: pending samples get the first dry values of this block
+        skip = self.lookahead - len(self._pending_wet)
+        wet = np.concatenate((self._pending_wet, wet))
+        ready = max(len(wet) - self.lookahead, 0)
+        self._pending_wet = wet[ready:]
+        return self._mix(x[skip:skip + ready], wet[:ready])
+
+    def flush(self):
+        """Outputs still waiting on dry samples, with audio_in held at the last sample"""
+        wet = self._pending_wet
+        self._pending_wet = np.zeros(0, dtype=np.int64)
+        return self._mix(np.full(len(wet), self._last_x, dtype=np.int64), wet)
+
+    def _mix(self, dry, wet):
+        total = _wrap(dry * self.dry_gain + wet * self.wet_gain, self.data_width + 8)
+        return _wrap(total >> 8, self.data_width)
+
+
+def delay_effect(x, delay_samples, feedback_amount=0, effect_amount=255, mode=0, spacing=1,
+                 addr_width=16, data_width=32, feedback_width=8, block_size=1 << 16):
+    """audio_out for every sample of x (one output per input), processed block by block"""
+    model = DelayEffectModel(delay_samples, feedback_amount, effect_amount, mode, spacing,
+                             addr_width, data_width, feedback_width)
+    x = np.asarray(x)
+    out = [model.process(x[i:i + block_size]) for i in range(0, len(x), block_size)]
+    out.append(model.flush())
+    return np.concatenate(out)
@@ -0,0 +1,94 @@
+"""Bit-accurate NumPy model of effect_mux.sv: bitcrush, then delay, each optional.
+
+bitcrush_effect keeps the top bit_depth + 1 bits:
+
+    y = (x >>> s) << s        s = (DATA_WIDTH - 1 - bit_depth)[4:0]
+
+which for DATA_WIDTH = 32 is x with its low s bits cleared (bit_depth 31
+passes x through, bit_depth 0 keeps only the sign). bit_depth is used
+combinationally, so it applies to the sample strobed with it.
+
+The delay stage is delay_effect in feedback mode (mode is tied to 1) and is
+modelled by delay_model. Both stages have a bypass_effect beside them and
+the enables only pick which one reaches the next stage, so the outputs only
+depend on the enables and controls, never on previous enable settings. The
+bypasses are meant to match the effects' latency, but the delay bypass is 7
+clocks and delay_effect's output comes OUTPUT_LATENCY (9) clocks after its
+strobe, so the chain is two clocks longer with the delay on; latency() gives
+the clocks from sample_valid to audio_out_valid for each combination.
+"""
+
+import numpy as np
+
+import delay_model
+
+DATA_WIDTH = 32
+BIT_DEPTHS = 32
+BITCRUSH_LATENCY = 1
+BITCRUSH_BYPASS_LATENCY = 1
+DELAY_LATENCY = delay_model.OUTPUT_LATENCY
+DELAY_BYPASS_LATENCY = 7
+OUTPUT_REGISTER = 1
+
+
+def _wrap(values, bits):
+    """Two's complement wrap of int64 values to a signed bits-wide field"""
+    values = np.asarray(values, dtype=np.int64)
+    return ((values + (1 << (bits - 1))) & ((1 << bits) - 1)) - (1 << (bits - 1))
+
+
+def shift_amount(bit_depth, data_width=DATA_WIDTH):
+    """The 5-bit shift_amount bitcrush_effect derives from bit_depth"""
+    return (data_width - 1 - (np.asarray(bit_depth, dtype=np.int64) & 0x1F)) & 0x1F
+
+
+def bitcrush(x, bit_depth, data_width=DATA_WIDTH):
+    """bitcrush_effect's audio_out for x, broadcast against bit_depth (e.g. bit_depth[:, None] for a sweep)"""
+    shift = shift_amount(bit_depth, data_width)
+    x = _wrap(x, data_width)
+    return _wrap((x >> shift) << shift, data_width)
+
+
+def latency(enable_bitcrush, enable_delay):
+    """Clocks from sample_valid to audio_out_valid (broadcasts)"""
+    stage1 = np.where(enable_bitcrush, BITCRUSH_LATENCY, BITCRUSH_BYPASS_LATENCY)
+    stage2 = np.where(enable_delay, DELAY_LATENCY, DELAY_BYPASS_LATENCY)
+    return stage1 + stage2 + OUTPUT_REGISTER
+
+
+def effect_mux(x, enable_bitcrush, enable_delay, bit_depth=31, delay_num_samples=0,
+               delay_feedback_amount=0, delay_effect_amount=255, spacing=1, data_width=DATA_WIDTH):
+    """audio_out for every sample of x; bit_depth may be one value or one per sample"""
+    stage1 = bitcrush(x, bit_depth, data_width) if enable_bitcrush else _wrap(x, data_width)
+    stage1 = np.broadcast_to(stage1, np.shape(x))
+    if not enable_delay:
+        return stage1.copy()
+    return delay_model.delay_effect(stage1, delay_num_samples, delay_feedback_amount, delay_effect_amount,
+                                    mode=1, spacing=spacing, data_width=data_width)
+
+
+def sweep(x, bit_depths=range(BIT_DEPTHS), spacing=1, data_width=DATA_WIDTH, **delay):
+    """Outputs for every enable combination and bit depth: shape (2, 2, len(bit_depths), len(x)).
+
+    Index as [enable_bitcrush, enable_delay, depth, sample]. The bitcrush is
+    one broadcast over all depths; the delay runs once per distinct input.
+    """
+    depths = np.asarray(list(bit_depths))
+    x = _wrap(x, data_width)
+    stage1 = np.stack([np.broadcast_to(x, (len(depths), len(x))), bitcrush(x, depths[:, None], data_width)])
+    out = np.empty((2, 2, len(depths), len(x)), dtype=np.int64)
+    out[:, 0] = stage1
+    # Without the bitcrush every depth feeds the delay the same stream
+    out[0, 1] = delay_model.delay_effect(x, mode=1, spacing=spacing, data_width=data_width, **_delay_args(delay))
+    for i, crushed in enumerate(stage1[1]):
+        out[1, 1, i] = delay_model.delay_effect(crushed, mode=1, spacing=spacing, data_width=data_width,
+                                                **_delay_args(delay))
+    return out
+
+
+def _delay_args(delay):
+    return {
+        "delay_samples": delay.get("delay_num_samples", 0),
+        "feedback_amount": delay.get("delay_feedback_amount", 0),
+        "effect_amount": delay.get("delay_effect_amount", 255),
+    }
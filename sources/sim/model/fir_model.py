@@ -0,0 +1,91 @@
+"""Bit-accurate NumPy model of audio_fir.sv.
+
+audio_fir is a transposed-form filter: on every data_in_valid strobe
+
+    sums[N-1] <= x * c[N-1]
+    sums[i]   <= sums[i+1] + x * c[i]        i = N-2 .. 0
+
+with (DATA_WIDTH + COEFF_WIDTH)-bit signed sums, and data_out is
+sums[0][DATA_WIDTH-1:0], combinational, so
+
+    y[n] = (sum_k c[k] * x[n-k])[DATA_WIDTH-1:0]
+
+where x[n] is the n-th strobe after reset (zeros before it). The sums wrap,
+but dropping high bits commutes with adding, so only the final truncation to
+DATA_WIDTH matters; there is no scaling, a Q1.15 tap set needs the gain
+taken out before the filter. data_out_valid follows each strobe by LATENCY
+clocks and data_out holds between strobes.
+
+The model accumulates in uint64, whose wrap-around is exact modulo 2^64, so
+any DATA_WIDTH up to 64 comes out bit for bit without Python integers.
+"""
+
+import numpy as np
+
+DATA_WIDTH = 32
+NUM_COEFFS = 64
+COEFF_WIDTH = 16
+LATENCY = 1  # clocks from data_in_valid to data_out_valid
+
+
+def _wrap(values, bits):
+    """Two's complement wrap of uint64/int64 values to a signed bits-wide field"""
+    values = np.asarray(values).astype(np.uint64) & np.uint64((1 << bits) - 1)
+    signed = values.astype(np.int64)
+    if bits == 64:
+        return signed
+    return np.where(values >> np.uint64(bits - 1), signed - (1 << bits), signed)
+
+
+def quantize(coeffs, width=COEFF_WIDTH):
+    """Signed integer taps checked against width"""
+    coeffs = np.asarray(coeffs, dtype=np.int64)
+    low, high = -(1 << (width - 1)), (1 << (width - 1)) - 1
+    if np.any((coeffs < low) | (coeffs > high)):
+        raise ValueError(f"coefficients must fit {width}-bit signed, got {coeffs.min()}..{coeffs.max()}")
+    return coeffs
+
+
+def pack_coeffs(coeffs, width=COEFF_WIDTH):
+    """The coeffs port as one integer: tap i in bits [i*width +: width]"""
+    packed = 0
+    for i, c in enumerate(quantize(coeffs, width).tolist()):
+        packed |= (c & ((1 << width) - 1)) << (i * width)
+    return packed
+
+
+def unpack_coeffs(packed, num_coeffs=NUM_COEFFS, width=COEFF_WIDTH):
+    """Inverse of pack_coeffs"""
+    taps = np.array([(packed >> (i * width)) & ((1 << width) - 1) for i in range(num_coeffs)], dtype=np.int64)
+    return np.where(taps >> (width - 1), taps - (1 << width), taps)
+
+
+class FirModel:
+    """Streaming model of one audio_fir with fixed taps.
+
+    process(x) takes the next block of strobed inputs and returns data_out
+    after each of them; the last N-1 inputs carry over between blocks.
+    """
+
+    def __init__(self, coeffs, data_width=DATA_WIDTH, coeff_width=COEFF_WIDTH):
+        self.coeffs = quantize(coeffs, coeff_width)
+        self.data_width = data_width
+        self.history = np.zeros(len(self.coeffs) - 1, dtype=np.int64)
+
+    def process(self, x):
+        x = _wrap(np.asarray(x, dtype=np.int64), self.data_width)
+        padded = np.concatenate((self.history, x)).astype(np.uint64)
+        taps = len(self.coeffs)
+        acc = np.zeros(len(x), dtype=np.uint64)
+        # One vectorized multiply-add per tap over the whole block
+        for k, c in enumerate(self.coeffs.tolist()):
+            if c:
+                acc += padded[taps - 1 - k:taps - 1 - k + len(x)] * np.uint64(c & 0xFFFFFFFFFFFFFFFF)
+        if taps > 1:
+            self.history = padded[len(padded) - (taps - 1):].astype(np.int64)
+        return _wrap(acc, self.data_width)
+
+
+def fir(x, coeffs, data_width=DATA_WIDTH, coeff_width=COEFF_WIDTH):
+    """data_out after each strobe for a whole stream starting from reset"""
+    return FirModel(coeffs, data_width, coeff_width).process(x)
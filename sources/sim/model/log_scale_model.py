@@ -0,0 +1,61 @@
+"""Bit-accurate NumPy model of log_scale.sv and the magnitude sets used to verify it.
+
+log_out = {leading_one[4:0], mantissa[2:0]}: the position of the highest set
+bit of mag_squared (0 for both 0 and 1) and the three bits right below it,
+taken from mag_squared << (31 - leading_one). log_valid and log_last follow
+mag_valid and mag_last LATENCY clocks later.
+
+The DUT has 2^32 possible inputs, which is too many to stream in one
+simulation, so verification runs either a stratified set (every boundary
+plus the same number of random values for each bit length) or the full
+range split into shards that can run as separate simulations.
+"""
+
+import numpy as np
+
+LATENCY = 2  # clocks from mag_valid to log_valid
+
+
+def leading_one(mag_squared):
+    """Priority encoder output: highest set bit, 0 when mag_squared is 0"""
+    mag = np.asarray(mag_squared, dtype=np.uint32)
+    # frexp is exact for 32-bit integers: mag = m * 2**e with 0.5 <= m < 1
+    return np.maximum(np.frexp(mag.astype(np.float64))[1] - 1, 0).astype(np.uint32)
+
+
+def log_scale(mag_squared):
+    """log_out for uint32 mag_squared values, as uint8"""
+    mag = np.asarray(mag_squared, dtype=np.uint32)
+    position = leading_one(mag)
+    mantissa = (mag << (np.uint32(31) - position)) >> np.uint32(29)
+    return ((position << np.uint32(3)) | mantissa).astype(np.uint8)
+
+
+def boundary_magnitudes():
+    """Every value where log_out steps, and its neighbours on either side"""
+    edges = [0, 1, 2, 3, 0xFFFFFFFF]
+    for position in range(2, 32):
+        for mantissa in range(8):
+            # Smallest value with this leading one and mantissa (low mantissa bits drop below bit 0)
+            edge = ((8 | mantissa) << position) >> 3
+            edges += [edge - 1, edge, edge + 1]
+    edges = np.array(edges, dtype=np.int64)
+    return np.unique(edges[(edges >= 0) & (edges <= 0xFFFFFFFF)]).astype(np.uint32)
+
+
+def stratified_magnitudes(count, seed=0):
+    """Boundaries plus random values spread evenly over the 33 bit lengths, in random order"""
+    rng = np.random.default_rng(seed)
+    bits = rng.integers(0, 33, size=count)
+    low = np.left_shift(1, np.maximum(bits - 1, 0), dtype=np.int64)
+    values = np.where(bits > 0, low + (rng.integers(0, 1 << 32, size=count, dtype=np.int64) & (low - 1)), 0)
+    values = np.concatenate((boundary_magnitudes(), values.astype(np.uint32)))
+    return rng.permutation(values)
+
+
+def exhaustive_magnitudes(shard=0, shards=1, chunk=1 << 16):
+    """Contiguous uint32 chunks covering one shard of the full 2^32 input range"""
+    start = (shard << 32) // shards
+    stop = ((shard + 1) << 32) // shards
+    for low in range(start, stop, chunk):
+        yield np.arange(low, min(low + chunk, stop), dtype=np.uint32)
@@ -0,0 +1,69 @@
+"""Byte-level model of the UART MIDI receiver in sim/midi_rx.sv.
+
+midi_rx keeps the last three bytes it received and decodes on every byte,
+looking only at their positions, never at whether they start a message:
+
+    last_byte is 0xCn                    wave_out <= current_byte[1:0]
+    second_last_byte is 0x9n             note on: the lowest free voice gets
+                                         note last_byte, velocity current_byte[7:5]
+    second_last_byte is 0x8n             note off: every voice playing
+                                         last_byte turns off
+
+so it needs a status byte per message (no running status) and treats a note
+on with velocity 0 as a note on. free_channel only reaches voices 0 to 14:
+its last term tests on_out[3] instead of on_out[15], so voice 15 is never
+handed out and a sixteenth held note is dropped.
+"""
+
+NUM_VOICES = 16
+ALLOCATABLE = 15
+
+
+class MidiRx:
+    """on_out, note_out, velocity_out and wave_out after each received byte"""
+
+    def __init__(self, num_voices=NUM_VOICES):
+        self.num_voices = num_voices
+        self.reset()
+
+    def reset(self):
+        self.ons = [0] * self.num_voices
+        self.notes = [0] * self.num_voices
+        self.velocities = [0] * self.num_voices
+        self.wave = 0
+        self._bytes = [0, 0, 0]  # second_last_byte, last_byte, current_byte
+
+    def free_voice(self):
+        """free_channel, or None when it points past the last voice"""
+        for i in range(min(ALLOCATABLE, self.num_voices)):
+            if not self.ons[i]:
+                return i
+        return None
+
+    def receive(self, byte):
+        second_last, last, current = self._bytes = self._bytes[1:] + [byte & 0xFF]
+        if last >> 4 == 0xC:
+            self.wave = current & 0x3
+        elif second_last >> 4 == 0x9:
+            voice = self.free_voice()
+            if voice is not None:
+                self.ons[voice] = 1
+                self.notes[voice] = last & 0x7F
+                self.velocities[voice] = current >> 5
+        elif second_last >> 4 == 0x8:
+            for i in range(self.num_voices):
+                if self.ons[i] and self.notes[i] == last:
+                    self.ons[i] = 0
+
+    def send(self, data):
+        for byte in data:
+            self.receive(byte)
+
+    @property
+    def on_out(self):
+        return sum(on << i for i, on in enumerate(self.ons))
+
+    @property
+    def note_out(self):
+        """note_out packed the way the port reads: voice i in bits [7i +: 7]"""
+        return sum(note << (7 * i) for i, note in enumerate(self.notes))
@@ -0,0 +1,120 @@
+"""Bit-accurate NumPy model of the oscillator bank.
+
+Reproduces oscillator.sv together with sine.sv (sine_generator + sine_lut),
+square.sv, sawtooth.sv and triangle.sv. Phase accumulators are evaluated in
+closed form as uint32 arrays (uint32 multiplication wraps exactly like the
+32-bit phase register), so whole banks of notes can be generated at once.
+
+Cycle convention used throughout: index k is the value of a signal right
+after the k-th rising clock edge following reset release, i.e. what a
+testbench reads on the falling edge after that rising edge. Per-cycle inputs
+(step_in, wave_type) are the values sampled on rising edge k.
+"""
+
+import math
+import numpy as np
+
+PHASE_BITS = 32
+MAX_POSITIVE = 2**31 - 1
+MAX_NEGATIVE = -2**31
+
+# wave_type encoding in oscillator.sv
+SINE = 0
+SQUARE = 1
+SAWTOOTH = 2
+TRIANGLE = 3
+
+# Quarter-wave ROM from sine_lut: round(sin(i * pi / 512) * (2^31 - 1))
+SINE_ROM = np.array(
+    [round(math.sin(i * math.pi / 512) * MAX_POSITIVE) for i in range(256)],
+    dtype=np.int64
+)
+
+
+def note_phase_incr(notes=None, sample_rate=48000, bits=PHASE_BITS):
+    """PHASE_INCR for MIDI notes (12-TET, A4 = 440 Hz), same formula as calc_phase_incr.py"""
+    notes = np.arange(128) if notes is None else np.asarray(notes)
+    freqs = 440.0 * 2.0 ** ((notes - 69) / 12.0)
+    return np.round(freqs * 2.0**bits / sample_rate).astype(np.uint32)
+
+
+def phase_accumulator(phase_incr, num_cycles, step_in=None):
+    """Phase register value after each of num_cycles clock edges.
+
+    phase_incr is a scalar or an array of shape (..., 1) to run a whole bank of
+    accumulators in one call; the result broadcasts to (..., num_cycles).
+    step_in is an optional per-cycle enable (default: step every cycle).
+    """
+    incr = np.asarray(phase_incr, dtype=np.uint32)
+    if step_in is None:
+        steps = np.arange(1, num_cycles + 1, dtype=np.uint32)
+    else:
+        steps = np.cumsum(np.broadcast_to(np.asarray(step_in, dtype=np.uint32), (num_cycles,)),
+                          dtype=np.uint32)
+    return incr * steps
+
+
+def sine_lut(phase):
+    """Combinational value of sine_lut for a phase register value (before its output register)"""
+    phase = np.asarray(phase, dtype=np.uint32)
+    index = phase >> np.uint32(22)
+    quadrant = index >> np.uint32(8)
+    quarter_phase = np.where(quadrant & 1, ~index & np.uint32(0xFF), index & np.uint32(0xFF))
+    quarter_amp = SINE_ROM[quarter_phase]
+    return np.where(quadrant & 2, -quarter_amp, quarter_amp).astype(np.int32)
+
+
+def square(phase):
+    """amp_out of square_generator for a phase register value"""
+    phase = np.asarray(phase, dtype=np.uint32)
+    return np.where(phase >> np.uint32(31), MAX_NEGATIVE, MAX_POSITIVE).astype(np.int32)
+
+
+def sawtooth(phase):
+    """amp_out of sawtooth_generator for a phase register value"""
+    phase = np.asarray(phase, dtype=np.uint32)
+    return (phase ^ np.uint32(0x80000000)).astype(np.int32)
+
+
+def triangle(phase):
+    """amp_out of triangle_generator for a phase register value"""
+    phase = np.asarray(phase, dtype=np.uint32)
+    lower = phase & np.uint32(0x7FFFFFFF)
+    folded = np.where(phase >> np.uint32(31), ~lower & np.uint32(0x7FFFFFFF), lower)
+    return ((folded << np.uint32(1)) ^ np.uint32(0x80000000)).astype(np.int32)
+
+
+# Indexed by wave_type
+WAVEFORMS = (sine_lut, square, sawtooth, triangle)
+
+# Register stages between the phase register and each generator's amp_out
+GENERATOR_LATENCY = (1, 0, 0, 0)
+
+
+def _delay(values, cycles):
+    """Shift along the last axis by cycles, filling with the reset value (phase = 0)"""
+    if cycles == 0:
+        return values
+    fill = np.zeros(values.shape[:-1] + (cycles,), dtype=values.dtype)
+    return np.concatenate((fill, values[..., :-cycles]), axis=-1)
+
+
+def generator_out(wave_type, phase_incr, num_cycles, step_in=None):
+    """amp_out of a standalone generator module (sine_generator, square_generator, ...)"""
+    phase = phase_accumulator(phase_incr, num_cycles, step_in)
+    return WAVEFORMS[wave_type](_delay(phase, GENERATOR_LATENCY[wave_type]))
+
+
+def oscillator_out(phase_incr, num_cycles, wave_type=SINE, step_in=None):
+    """data_out of oscillator.sv after each of num_cycles clock edges.
+
+    wave_type is a scalar or a per-cycle array; data_out registers the
+    selected generator output, so it lags amp_out by one cycle.
+    """
+    phase = phase_accumulator(phase_incr, num_cycles, step_in)
+    wave_type = np.asarray(wave_type)
+    if wave_type.ndim == 0:
+        wave = int(wave_type)
+        return WAVEFORMS[wave](_delay(phase, GENERATOR_LATENCY[wave] + 1))
+    outputs = [WAVEFORMS[w](_delay(phase, GENERATOR_LATENCY[w] + 1)) for w in range(4)]
+    return np.select([wave_type == w for w in range(4)], outputs).astype(np.int32)
@@ -0,0 +1,138 @@
+"""NumPy reference for the spectrogram display chain.
+
+Audio goes through the same stages as the block design:
+
+    fft_input_handler -> xfft_0 -> fft_bin_filter -> fft_magnitude -> log_scale
+        -> waterfall_buffer -> log_x_map -> color_map
+
+Every stage is a vectorized function over whole arrays of frames, so a
+minute of audio renders in about half a second. Every stage except the FFT
+reproduces the RTL exactly.
+
+xfft_0 is the Xilinx FFT v9.1 (1024 points, pipelined streaming, 16-bit
+scaled, truncation, natural order, config channel unused). The model takes
+the exact DFT, applies the scaling schedule's total right shift and
+truncates once. The core truncates after every stage, so its bins can
+differ by a few LSBs. For a bit-exact check of everything after the FFT,
+feed its captured output to spectrogram_from_fft().
+
+Display conventions follow waterfall_buffer and video_handler: row 0 is the
+newest complete frame, HEIGHT rows fill the screen from WATERFALL_TOP down,
+and rows never written read as zero (dark blue).
+"""
+
+import numpy as np
+
+from log_scale_model import log_scale
+
+FFT_SIZE = 1024
+BINS = 512
+INPUT_WIDTH = 32
+FFT_WIDTH = 16
+# Total right shift of xfft_0's scaling schedule (1/N for a 1024-point transform)
+FFT_SCALE_SHIFT = 10
+
+# hdmi_control / video_handler / waterfall_buffer geometry
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+WATERFALL_TOP = 300
+HEIGHT = 300
+
+
+def _wrap(values, bits):
+    values = np.asarray(values, dtype=np.int64)
+    return ((values + (1 << (bits - 1))) & ((1 << bits) - 1)) - (1 << (bits - 1))
+
+
+def scale_input(audio, input_width=INPUT_WIDTH, fft_width=FFT_WIDTH):
+    """Real part sent to the FFT by fft_input_handler: audio_in >>> (INPUT_WIDTH - FFT_WIDTH)"""
+    audio = _wrap(audio, input_width)
+    return _wrap(audio >> (input_width - fft_width), fft_width)
+
+
+def frames(samples, fft_size=FFT_SIZE):
+    """Split into the complete frames fft_input_handler marks with tlast (a partial last frame is dropped)"""
+    samples = np.asarray(samples)
+    count = len(samples) // fft_size
+    return samples[:count * fft_size].reshape(count, fft_size)
+
+
+def fft(frames_re, scale_shift=FFT_SCALE_SHIFT, width=FFT_WIDTH):
+    """(re, im) int64 arrays of xfft_0's output for frames of real input"""
+    spectrum = np.fft.fft(np.asarray(frames_re, dtype=np.float64), axis=-1) / (1 << scale_shift)
+    # Round away float error first so exact integers are not truncated to the one below
+    re = np.floor(np.round(spectrum.real, 6)).astype(np.int64)
+    im = np.floor(np.round(spectrum.imag, 6)).astype(np.int64)
+    return _wrap(re, width), _wrap(im, width)
+
+
+def bin_filter(values, bins=BINS):
+    """fft_bin_filter: only the first half of every frame"""
+    return np.asarray(values)[..., :bins]
+
+
+def magnitude_squared(re, im, data_width=FFT_WIDTH):
+    """mag_squared of fft_magnitude: re*re + im*im in 2*DATA_WIDTH bits"""
+    re = _wrap(re, data_width)
+    im = _wrap(im, data_width)
+    return (re * re + im * im) & ((1 << (2 * data_width)) - 1)
+
+
+def x_map(width=SCREEN_WIDTH, bins=BINS):
+    """log_x_map's LUT: bin index shown at each pixel column (same formula as generate_log_mapping.py)"""
+    top = bins.bit_length() - 1
+    lut = [min(bins - 1, max(0, int((2 ** (top * x / (width - 1))) - 1))) for x in range(width)]
+    return np.array(lut, dtype=np.int64)
+
+
+def color_map(log_val):
+    """rgb of color_map (jet) as uint8 (..., 3) arrays of r, g, b"""
+    v = np.asarray(log_val, dtype=np.int64)
+    r = np.select([v < 128, v < 192], [0, (v - 128) << 2], 255)
+    g = np.select([v < 64, v < 192], [v << 2, 255], 255 - ((v - 192) << 2))
+    b = np.select([v < 64, v < 128], [255, 255 - ((v - 64) << 2)], 0)
+    return np.stack((r, g, b), axis=-1).astype(np.uint8)
+
+
+def spectrogram_from_fft(re, im):
+    """log_out rows (frames, BINS) written to waterfall_buffer for captured FFT output frames"""
+    return log_scale(magnitude_squared(bin_filter(re), bin_filter(im)))
+
+
+def spectrogram(audio, scale_shift=FFT_SCALE_SHIFT):
+    """log_out rows (frames, BINS), one per complete 1024-sample frame of audio_in"""
+    re, im = fft(frames(scale_input(audio)), scale_shift)
+    return spectrogram_from_fft(re, im)
+
+
+def waterfall_rows(log_rows, height=HEIGHT):
+    """What rd_row 0..height-1 read after the given rows were written: newest first, zeros when unwritten"""
+    log_rows = np.asarray(log_rows, dtype=np.uint8)
+    shown = log_rows[::-1][:height]
+    fill = np.zeros((height - len(shown), log_rows.shape[-1]), dtype=np.uint8)
+    return np.concatenate((shown, fill))
+
+
+def render(log_rows, width=SCREEN_WIDTH):
+    """RGB pixels (rows, width, 3) for rows of log values, through log_x_map and color_map"""
+    return color_map(np.asarray(log_rows)[:, x_map(width)])
+
+
+def waterfall_frame(audio, height=HEIGHT, scale_shift=FFT_SCALE_SHIFT):
+    """The (height, SCREEN_WIDTH, 3) RGB waterfall on screen once all of audio has been processed"""
+    audio = np.asarray(audio)
+    # Only the last height complete frames are still on screen
+    end = len(audio) // FFT_SIZE * FFT_SIZE
+    return render(waterfall_rows(spectrogram(audio[max(end - height * FFT_SIZE, 0):end], scale_shift), height))
+
+
+def screen_frame(audio, scale_shift=FFT_SCALE_SHIFT):
+    """The whole (SCREEN_HEIGHT, SCREEN_WIDTH, 3) screen: black above WATERFALL_TOP, waterfall below"""
+    screen = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH, 3), dtype=np.uint8)
+    screen[WATERFALL_TOP:] = waterfall_frame(audio, SCREEN_HEIGHT - WATERFALL_TOP, scale_shift)
+    return screen
+
+
+def history(audio, scale_shift=FFT_SCALE_SHIFT):
+    """Every frame as one RGB row, oldest first: the whole scrolling display as a single image"""
+    return render(spectrogram(audio, scale_shift))
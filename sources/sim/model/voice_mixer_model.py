@@ -0,0 +1,78 @@
+"""Bit-accurate NumPy model of voice_mixer.sv.
+
+voice_mixer sums its voices in a pipelined binary tree: stage s + 1 holds
+the saturated sums of adjacent pairs of stage s,
+
+    stage[s+1][i] = sat(stage[s][2i] + stage[s][2i+1])
+
+computed DATA_WIDTH + 1 bits wide and clamped to the signed DATA_WIDTH
+range, and mixed_out is the final sum >>> log2(NUM_VOICES). Every stage
+register only loads on the valid that travels beside it, so each strobe's
+voices come out unchanged by gaps, latency(num_voices) = log2(NUM_VOICES)
+clocks later. Saturation happens per pair, so the result is not the clipped
+total: max, max, min, 0 mix to (max + min) >>> 2 = -1, not the 2^29 or so
+their sum divided by four would give.
+
+voice_in_flat packs voice i into bits [i*DATA_WIDTH +: DATA_WIDTH]; pack()
+builds that integer for every sample so a testbench writes one value per
+clock.
+"""
+
+import numpy as np
+
+DATA_WIDTH = 32
+NUM_VOICES = 16
+
+
+def _wrap(values, bits):
+    """Two's complement wrap of int64 values to a signed bits-wide field"""
+    values = np.asarray(values, dtype=np.int64)
+    return ((values + (1 << (bits - 1))) & ((1 << bits) - 1)) - (1 << (bits - 1))
+
+
+def stages(num_voices):
+    """$clog2(NUM_VOICES), checking the voice count is a power of two"""
+    if num_voices < 1 or num_voices & (num_voices - 1):
+        raise ValueError(f"NUM_VOICES must be a power of two, got {num_voices}")
+    return num_voices.bit_length() - 1
+
+
+def latency(num_voices):
+    """Clocks from data_in_valid to data_out_valid"""
+    return stages(num_voices)
+
+
+def mix(voices, data_width=DATA_WIDTH):
+    """mixed_out for voices shaped (..., NUM_VOICES), any leading axes being samples"""
+    if data_width > 62:
+        raise ValueError("int64 needs DATA_WIDTH <= 62 to hold a pair sum")
+    level = _wrap(voices, data_width)
+    depth = stages(level.shape[-1])
+    low, high = -(1 << (data_width - 1)), (1 << (data_width - 1)) - 1
+    # One vectorized step per tree stage: every pair of every sample at once
+    for _ in range(depth):
+        level = np.clip(level[..., 0::2] + level[..., 1::2], low, high)
+    return level[..., 0] >> depth
+
+
+def pack(voices, data_width=DATA_WIDTH):
+    """voice_in_flat as a Python int per sample, for voices shaped (samples, NUM_VOICES)"""
+    voices = np.asarray(voices, dtype=np.int64)
+    mask = (1 << data_width) - 1
+    if data_width in (8, 16, 32):
+        # Little-endian words laid end to end are exactly the flattened vector
+        words = (voices & mask).astype(f"<u{data_width // 8}")
+        return [int.from_bytes(row.tobytes(), "little") for row in words]
+    packed = []
+    for row in voices.tolist():
+        value = 0
+        for i, v in enumerate(row):
+            value |= (v & mask) << (i * data_width)
+        packed.append(value)
+    return packed
+
+
+def unpack(packed, num_voices=NUM_VOICES, data_width=DATA_WIDTH):
+    """Inverse of pack for one sample"""
+    mask = (1 << data_width) - 1
+    return _wrap([(packed >> (i * data_width)) & mask for i in range(num_voices)], data_width)
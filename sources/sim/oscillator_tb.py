@@ -6,48 +6,108 @@ from math import log
 import logging
 from pathlib import Path
 import numpy as np
-from scipy.signal import lfilter
-import matplotlib.pyplot as plt
 from cocotb.clock import Clock
 from cocotb.triggers import Timer, ClockCycles, RisingEdge, FallingEdge
 from cocotb.triggers import ReadOnly,with_timeout, Edge, ReadWrite, NextTimeStep, First
 from cocotb.utils import get_sim_time as gst
-from cocotb.runner import get_runner
+from sim_runner import run_testbench
 test_file = os.path.basename(__file__).replace(".py","")
 
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import oscillator_model
+from audio_metrics import analyze, summary
+
+# Quality floors for the sine LUT (1024-entry table, so phase truncation spurs sit near -54 dBc)
+SINE_SFDR_FLOOR_DB = 50
+SINE_THD_CEILING_DB = -50
+
 @cocotb.test()
 async def test_a(dut):
-    my_output = np.zeros(4000)
-    """cocotb test for messing with verilog simulation"""
+    """Compare all four waveforms against the oscillator model sample for sample"""
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    phase_incr = 19777216
+    wave_types = np.repeat(np.arange(4), 1000)
+    my_output = np.zeros(len(wave_types), dtype=np.int64)
     dut.rst.value = 1
-    await RisingEdge(dut.clk)
-    await FallingEdge(dut.clk)
-    dut.rst.value = 0
-    dut.PHASE_INCR.value = 19777216
+    dut.PHASE_INCR.value = phase_incr
     dut.step_in.value = 1
     dut.wave_type.value = 0
+    await ClockCycles(dut.clk, 2)  # sine_lut's ROM register has no reset
     await FallingEdge(dut.clk)
-    await Timer(100, 'ns')
-    for i in range(1000):
-        my_output[i] = dut.data_out.value.signed_integer
-        await FallingEdge(dut.clk)
-    dut.wave_type.value = 1
-    for i in range(1000):
-        my_output[i+1000] = dut.data_out.value.signed_integer
+    dut.rst.value = 0
+    for i, wave_type in enumerate(wave_types):
+        dut.wave_type.value = int(wave_type)
         await FallingEdge(dut.clk)
-    dut.wave_type.value = 2
-    for i in range(1000):
-        my_output[i+2000] = dut.data_out.value.signed_integer
+        my_output[i] = dut.data_out.value.signed_integer
+
+    expected = oscillator_model.oscillator_out(phase_incr, len(wave_types), wave_types)
+    mismatches = np.flatnonzero(my_output != expected)
+    assert len(mismatches) == 0, (
+        f"{len(mismatches)} mismatches, first at sample {mismatches[0]} "
+        f"(wave_type {wave_types[mismatches[0]]}): got {my_output[mismatches[0]]}, "
+        f"expected {expected[mismatches[0]]}"
+    )
+
+
+@cocotb.test()
+async def test_step_in(dut):
+    """Phase only advances on step_in, as with the 48kHz sample_clk_en in synth"""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    phase_incr = int(oscillator_model.note_phase_incr(69))
+    step_in = np.array([random.random() < 0.25 for _ in range(2000)], dtype=np.uint32)
+    dut.rst.value = 1
+    dut.PHASE_INCR.value = phase_incr
+    dut.step_in.value = 0
+    dut.wave_type.value = oscillator_model.SINE
+    await ClockCycles(dut.clk, 2)  # sine_lut's ROM register has no reset
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+    my_output = np.zeros(len(step_in), dtype=np.int64)
+    for i, step in enumerate(step_in):
+        dut.step_in.value = int(step)
         await FallingEdge(dut.clk)
-    dut.wave_type.value = 3
-    for i in range(1000):
-        my_output[i+3000] = dut.data_out.value.signed_integer
+        my_output[i] = dut.data_out.value.signed_integer
+
+    expected = oscillator_model.oscillator_out(phase_incr, len(step_in), oscillator_model.SINE, step_in)
+    mismatches = np.flatnonzero(my_output != expected)
+    assert len(mismatches) == 0, f"{len(mismatches)} mismatches, first at sample {mismatches[0]}"
+
+
+@cocotb.test()
+async def test_sine_quality(dut):
+    """Sine SFDR and THD floors: a few notes captured from the DUT, every MIDI note from the model"""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    notes = [45, 60, 69, 96, 117]
+    num_samples = 8192
+    captured = np.zeros((len(notes), num_samples), dtype=np.int64)
+    for row, note in enumerate(notes):
+        dut.rst.value = 1
+        dut.PHASE_INCR.value = int(oscillator_model.note_phase_incr(note))
+        dut.step_in.value = 1  # one 48kHz sample per clock
+        dut.wave_type.value = oscillator_model.SINE
+        await ClockCycles(dut.clk, 2)  # sine_lut's ROM register has no reset
         await FallingEdge(dut.clk)
-    
-    plt.figure()
-    plt.plot(np.array(my_output))
-    plt.show()
+        dut.rst.value = 0
+        for i in range(num_samples):
+            await FallingEdge(dut.clk)
+            captured[row, i] = dut.data_out.value.signed_integer
+
+    freqs = 440.0 * 2.0 ** ((np.arange(128) - 69) / 12.0)
+    dut_metrics = analyze(captured, fundamental=freqs[notes])
+    dut._log.info("DUT sine:\n" + summary(dut_metrics))
+    assert np.all(dut_metrics["sfdr_db"] >= SINE_SFDR_FLOOR_DB), f"SFDR {dut_metrics['sfdr_db']} for notes {notes}"
+    assert np.all(dut_metrics["thd_db"] <= SINE_THD_CEILING_DB), f"THD {dut_metrics['thd_db']} for notes {notes}"
+
+    # Long enough that even note 0 (8 Hz) has a few periods
+    phase = oscillator_model.phase_accumulator(oscillator_model.note_phase_incr()[:, None], 1 << 16)
+    metrics = analyze(oscillator_model.sine_lut(phase), fundamental=freqs)
+    worst = int(np.argmin(metrics["sfdr_db"]))
+    dut._log.info(f"Worst model note {worst}: " + summary(metrics, worst))
+    low = np.flatnonzero(metrics["sfdr_db"] < SINE_SFDR_FLOOR_DB)
+    assert len(low) == 0, f"SFDR below {SINE_SFDR_FLOOR_DB} dB for notes {low.tolist()}"
+    high = np.flatnonzero(metrics["thd_db"] > SINE_THD_CEILING_DB)
+    assert len(high) == 0, f"THD above {SINE_THD_CEILING_DB} dB for notes {high.tolist()}"
+    assert np.all(np.abs(metrics["signal_dbfs"]) < 0.1), "Sine is not full scale"
 
 
 def test_runner():
@@ -60,22 +120,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "oscillator"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
  
 if __name__ == "__main__":
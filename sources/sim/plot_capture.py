@@ -0,0 +1,210 @@
+"""Deferred, headless plotting for the cocotb testbenches.
+
+A testbench marks its plotting code with @deferred_plot and calls it with the
+arrays to plot. During the simulation that call only saves the arrays to a
+compressed .npz in the run's plot directory; no figure is drawn.
+After the simulator exits, run_testbench renders every plot the run saved
+in a process pool with the Agg backend, so no window ever opens and the
+simulation never waits on a figure.
+
+Each run_testbench call gets its own plot directory, <test_dir>/plots (the
+build directory when there is no test_dir), emptied before the run and
+passed to the simulator as PLOT_DIR, so parallel regression jobs and sweep
+variants never see each other's archives. Relative image paths land in the
+sim directory for a plain run and in the test_dir when there is one
+(PLOT_OUTPUT_DIR), so each regression job and sweep variant keeps its own.
+Archives and images are written to a temporary name and renamed into place,
+so a render never reads half a file.
+
+    @deferred_plot("test_3_echo.png")
+    def plot_echo(cycles, outputs):
+        plt.plot(cycles, outputs)
+
+    plot_echo(cycles=np.arange(100), outputs=outputs)   # inside a cocotb test
+
+PLOTS picks the behaviour:
+
+    PLOTS=defer    (default) save the .npz, render after the simulation
+    PLOTS=npz      only save the .npz; render later with python plot_capture.py
+    PLOTS=inline   render straight away inside the simulation (old behaviour)
+    PLOTS=off      skip plotting entirely
+
+    python plot_capture.py              # render every plot saved under sim_build
+    python plot_capture.py -k echo      # only plots whose name contains "echo"
+    python plot_capture.py regression   # or under other directories
+"""
+
+import argparse
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+SIM_DIR = Path(__file__).resolve().parent
+DEFAULT_PLOT_DIR = SIM_DIR / "sim_build" / "plots"
+_MODES = ("defer", "npz", "inline", "off")
+
+
+def plot_mode():
+    mode = os.getenv("PLOTS", "defer").strip().lower()
+    if mode in ("0", "no", "false", "none"):
+        return "off"
+    if mode not in _MODES:
+        raise ValueError(f"PLOTS={mode!r}: expected one of {', '.join(_MODES)}")
+    return mode
+
+
+def plot_dir():
+    """Where this process saves plots: PLOT_DIR, or sim_build/plots outside run_testbench"""
+    return Path(os.getenv("PLOT_DIR") or DEFAULT_PLOT_DIR)
+
+
+def output_path(output):
+    """Image path for output, resolving a relative one against PLOT_OUTPUT_DIR or the sim directory"""
+    output = Path(output)
+    if output.is_absolute():
+        return output
+    return Path(os.getenv("PLOT_OUTPUT_DIR") or SIM_DIR) / output
+
+
+def _atomic_write(path, write):
+    """Call write(file) on a temporary file next to path, then rename it into place"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def deferred_plot(output):
+    """Decorator for a function that draws a figure from keyword arrays.
+
+    output is the image path; a relative one is resolved by output_path.
+    The decorated function is called with keyword arguments only; draw always
+    gets them back as np.asarray arrays, with 0-d arrays as Python scalars.
+    """
+    def decorator(draw):
+        @functools.wraps(draw)
+        def wrapper(**data):
+            mode = plot_mode()
+            if mode == "off":
+                return None
+            if mode == "inline":
+                return _render(draw, _unpack({k: np.asarray(v) for k, v in data.items()}), output_path(output))
+            return save(draw, data, output)
+        wrapper.draw = draw
+        return wrapper
+    return decorator
+
+
+def save(draw, data, output):
+    """Write the plot's arrays and how to draw them to <plot_dir()>/<module>.<name>.npz"""
+    directory = plot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{draw.__module__}.{Path(output).stem}.npz"
+    meta = {"module": draw.__module__, "function": draw.__name__, "output": str(output_path(output))}
+    arrays = {k: np.asarray(v) for k, v in data.items()}
+    return _atomic_write(path, lambda f: np.savez_compressed(f, __plot__=json.dumps(meta), **arrays))
+
+
+def _unpack(arrays):
+    return {k: (v.item() if v.ndim == 0 else v) for k, v in arrays.items()}
+
+
+def _render(draw, data, output):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        draw(**data)
+        _atomic_write(output, lambda f: plt.savefig(f, format=output.suffix[1:] or "png", dpi=150,
+                                                    bbox_inches="tight"))
+    finally:
+        plt.close("all")
+    return output
+
+
+def render(path):
+    """Render one saved .npz plot, returning the image path"""
+    for p in (str(SIM_DIR), str(SIM_DIR / "model")):
+        if p not in sys.path:
+            sys.path.append(p)
+    with np.load(path) as saved:
+        meta = json.loads(saved["__plot__"].item())
+        data = _unpack({k: v for k, v in saved.items() if k != "__plot__"})
+    module = importlib.import_module(meta["module"])
+    return _render(getattr(module, meta["function"]).draw, data, meta["output"])
+
+
+def render_all(paths, jobs=None):
+    """Render saved plots in a process pool, returning the image paths (failures are reported, not raised)"""
+    paths = [Path(p) for p in paths]
+    if not paths:
+        return []
+    outputs = []
+    try:
+        with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count(), len(paths))) as pool:
+            futures = [(p, pool.submit(render, p)) for p in paths]
+            for path, future in futures:
+                try:
+                    outputs.append(future.result())
+                except Exception as e:
+                    print(f"WARNING: could not render {path.name}: {e}")
+    except (OSError, RuntimeError):
+        # No pool available (e.g. already inside a daemon worker); render here instead
+        outputs = [render(p) for p in paths]
+    for output in outputs:
+        print(f"INFO: Plot saved to {output}")
+    return outputs
+
+
+def saved(*roots):
+    """Every .npz plot under the given directories"""
+    return sorted(p for root in roots if Path(root).is_dir() for p in Path(root).rglob("*.npz"))
+
+
+def run_env(run_dir, test_dir=None):
+    """(plot directory, environment) for one run_testbench call, emptying the directory first"""
+    directory = Path(run_dir) / "plots"
+    for old in directory.glob("*.npz"):
+        old.unlink()
+    env = {"PLOT_DIR": str(directory)}
+    if test_dir is not None:
+        env["PLOT_OUTPUT_DIR"] = str(test_dir)
+    return directory, env
+
+
+def render_pending(directory):
+    """What run_testbench calls once the simulator is done: render the run's plots under PLOTS=defer"""
+    if plot_mode() == "defer":
+        return render_all(saved(directory))
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dirs", nargs="*", default=[SIM_DIR / "sim_build"],
+                        help="directories to look for saved plots in (default: sim_build)")
+    parser.add_argument("-k", "--pattern", default=None, help="only plots whose name contains this")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+    paths = [p for p in saved(*args.dirs) if not args.pattern or args.pattern in p.stem]
+    start = time.perf_counter()
+    render_all(paths, args.jobs)
+    print(f"{len(paths)} plots in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Trigger helpers for waiting on the ADSR millisecond pulse.
+
+Instead of polling ms_pulse on every clock, these sleep on the edges of
+ms_pulse itself and skip whole pulse periods with a single ClockCycles, so a
+500 ms envelope costs a handful of awaits rather than 50 million.
+"""
+
+from cocotb.triggers import RisingEdge, FallingEdge, ClockCycles, with_timeout
+from cocotb.result import SimTimeoutError
+
+# localparam DIVIDER in adsr_envelope.sv (clocks per ms_pulse in simulation)
+ADSR_DIVIDER = 1000
+CLK_PERIOD_NS = 10
+
+
+async def wait_for_pulse(dut, timeout_cycles=150_000, clk_period_ns=CLK_PERIOD_NS):
+    """Wait until the next ms_pulse has been consumed by the envelope.
+
+    Returns on the clock edge where ms_pulse falls, which is the edge the
+    ADSR state machine acts on it, so envelope_out already holds the new value.
+    """
+    timeout_ns = timeout_cycles * clk_period_ns
+    try:
+        if dut.ms_pulse.value != 1:
+            await with_timeout(RisingEdge(dut.ms_pulse), timeout_ns, "ns")
+        await with_timeout(FallingEdge(dut.ms_pulse), timeout_ns, "ns")
+    except SimTimeoutError:
+        raise AssertionError(f"Timeout waiting for ms_pulse after {timeout_cycles} cycles")
+
+
+async def wait_n_pulses(dut, n_pulses, divider=ADSR_DIVIDER, timeout_per_pulse=150_000):
+    """Wait for n millisecond pulses.
+
+    Synchronises on the first pulse, skips the pulses in between with one
+    ClockCycles on the known divider, and lands on the last one with
+    wait_for_pulse again so the result does not depend on the count being exact.
+    """
+    if n_pulses <= 0:
+        return
+    await wait_for_pulse(dut, timeout_per_pulse)
+    if n_pulses == 1:
+        return
+    # Stop halfway between pulse n-1 and pulse n
+    await ClockCycles(dut.clk, (n_pulses - 2) * divider + divider // 2)
+    await wait_for_pulse(dut, timeout_per_pulse)
@@ -6,36 +6,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from cocotb.clock import Clock
 from cocotb.triggers import Timer, RisingEdge, FallingEdge
-from cocotb.runner import get_runner
+from sim_runner import run_testbench
 test_file = os.path.basename(__file__).replace(".py","")
 
-async def send_midi_byte(dut, byte_data):
-    """Send a single MIDI byte with start and stop bits"""
-    dut.midi_in.value = 0
-    await Timer(32000, 'ns')
-    for i in range(7, -1, -1):
-        bit = (byte_data >> i) & 1
-        dut.midi_in.value = bit
-        await Timer(32000, 'ns')
-    dut.midi_in.value = 1
-    await Timer(32000, 'ns')
-
-async def send_midi_message(dut, status, data1, data2):
-    """Send a complete 3-byte MIDI message"""
-    await send_midi_byte(dut, status)
-    await send_midi_byte(dut, data1)
-    await send_midi_byte(dut, data2)
-
-async def send_note_on(dut, channel, note, velocity):
-    """Send a MIDI Note On message"""
-    status = 0x90 | (channel & 0x0F)
-    await send_midi_message(dut, status, note & 0x7F, velocity & 0x7F)
-
-async def send_program_change(dut, channel, wave_type):
-    """Send a MIDI Program Change message to set wave type"""
-    status = 0xC0 | (channel & 0x0F)
-    await send_midi_byte(dut, status)
-    await send_midi_byte(dut, wave_type & 0x03)
+from midi_driver import MidiDriver, BIT_PERIOD_NS, note_on, program_change
 
 @cocotb.test()
 async def quick_waveform_test(dut):
@@ -46,7 +20,7 @@ async def quick_waveform_test(dut):
 
     # Reset
     dut.rst.value = 1
-    dut.midi_in.value = 1
+    midi = MidiDriver(dut.midi_in)
     dut.octave_on.value = 0
     await RisingEdge(dut.clk)
     await FallingEdge(dut.clk)
@@ -61,12 +35,11 @@ async def quick_waveform_test(dut):
     for wave_idx, wave_name in enumerate(wave_types):
         dut._log.info(f"Testing {wave_name} wave")
 
-        # Set wave type
-        await send_program_change(dut, 0, wave_idx)
-        await Timer(500, 'ns')
-
-        # Send note on
-        await send_note_on(dut, 0, test_note, 7)
+        # Set wave type, then note on 500 ns after the 2-byte program change has finished
+        await midi.send([
+            (0, program_change(wave_idx)),
+            (2 * 10 * BIT_PERIOD_NS + 500, note_on(test_note, 7)),
+        ])
         await Timer(500, 'ns')
 
         # Capture 400 samples (about 2 periods at 262Hz)
@@ -123,22 +96,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "synth"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+"""Run every cocotb testbench in sources/sim as one parallel regression.
+
+Testbenches are discovered by importing each module that calls run_testbench
+and running its runner function in collect mode. Every unique build (same
+cache key in sim_runner) is compiled once, then each cocotb test runs as its
+own job in a process pool against a private hard-linked copy of that build,
+so parallel runs never share dump or results files.
+
+Results go to <out>/regression.xml (JUnit) and <out>/regression.json, with the
+wall time of every test; per-test logs and any wave dumps sit next to them.
+WAVES is honoured as for a single testbench (see sim_runner); --waves forces
+full dumps for every test.
+
+    python run_regression.py                 # everything, one job per core
+    python run_regression.py -j 4 -k adsr    # only modules/tests matching "adsr"
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import cocotb
+
+from sim_runner import SIM_DIR, build, build_key, build_waves, collect_testbenches, run_testbench
+
+DEFAULT_OUT_DIR = SIM_DIR / "regression"
+# Not part of the testbenches themselves
+_SKIP_MODULES = {"sim_runner", "run_regression", "run_sweep", "sim_speed", "bench_throughput"}
+# Files a run writes into its build directory; never hard-link these between jobs
+_RUN_OUTPUTS = ("*.fst", "*.vcd", "*.xml", "*.log")
+
+
+def discover(pattern=None):
+    """Return (jobs, skipped) for every cocotb test in the sim directory.
+
+    A job is a dict holding the module name, test name and the run_testbench
+    arguments the module's runner function would use.
+    """
+    for path in (SIM_DIR, SIM_DIR / "model"):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+    jobs = []
+    skipped = []
+    for path in sorted(SIM_DIR.glob("*.py")):
+        if path.stem in _SKIP_MODULES or "run_testbench(" not in path.read_text():
+            continue
+        module = importlib.import_module(path.stem)
+        runners = [fn for name, fn in inspect.getmembers(module, inspect.isfunction)
+                   if name.endswith("runner") and fn.__module__ == module.__name__]
+        tests = {name: obj for name, obj in vars(module).items() if isinstance(obj, cocotb.test)}
+        for runner_fn in runners:
+            for config in collect_testbenches(runner_fn):
+                if config["test_file"] != module.__name__:
+                    continue
+                for name, test in tests.items():
+                    if pattern and pattern not in f"{module.__name__}.{name}":
+                        continue
+                    job = {"module": module.__name__, "testcase": name, "config": config}
+                    # Naming a test in TESTCASE overrides skip=, so honour it here
+                    (skipped if test.skip else jobs).append(job)
+    return jobs, skipped
+
+
+def variant_name(parameters):
+    """Directory-safe name for a parameter set, e.g. DATA_WIDTH32_NUM_VOICES8"""
+    return "_".join(f"{k}{v}" for k, v in sorted(parameters.items())) or "default"
+
+
+def job_dirs(test_jobs):
+    """Directory of each job under the output directory, checked to be unique.
+
+    A job's own "dir" wins; otherwise it is <module>/<testcase>, with the
+    parameter set in between when a runner builds the module more than once
+    (test_voice_mixer runs every test for several NUM_VOICES).
+    """
+    builds = {}
+    for job in test_jobs:
+        builds.setdefault((job["module"], job["testcase"]), []).append(job)
+    dirs = []
+    for job in test_jobs:
+        if "dir" in job:
+            dirs.append(job["dir"])
+        elif len(builds[(job["module"], job["testcase"])]) > 1:
+            dirs.append(f"{job['module']}/{variant_name(job['config']['parameters'])}/{job['testcase']}")
+        else:
+            dirs.append(f"{job['module']}/{job['testcase']}")
+    seen = {}
+    for job, job_dir in zip(test_jobs, dirs):
+        if job_dir in seen:
+            raise ValueError(f"{job['module']}.{job['testcase']}: two jobs would share {job_dir} "
+                             f"(parameters {seen[job_dir]} and {job['config']['parameters']})")
+        seen[job_dir] = job["config"]["parameters"]
+    return dirs
+
+
+def _config_key(config):
+    return build_key(config["sim"], config["hdl_toplevel"], config["sources"], config["parameters"],
+                     config["build_args"], config["includes"], config["defines"],
+                     config["timescale"], build_waves(config["waves"], config["sim"]))
+
+
+def _build_job(config, log_file):
+    """Worker: build (or reuse) one configuration, returning its build directory"""
+    _, build_dir, cache_hit = build(config["hdl_toplevel"], config["sources"], config["parameters"],
+                                    config["build_args"], config["includes"], config["defines"],
+                                    config["timescale"], build_waves(config["waves"], config["sim"]),
+                                    config["sim"], log_file=log_file)
+    return str(build_dir), cache_hit
+
+
+def _private_build(build_dir, job_dir):
+    """Hard-linked copy of a finished build, falling back to a real copy across filesystems"""
+    target = job_dir / "build"
+    shutil.rmtree(target, ignore_errors=True)
+    ignore = shutil.ignore_patterns(*_RUN_OUTPUTS)
+    try:
+        shutil.copytree(build_dir, target, symlinks=True, ignore=ignore, copy_function=os.link)
+    except OSError:
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(build_dir, target, symlinks=True, ignore=ignore)
+    return target
+
+
+def _test_job(job, build_dir, job_dir):
+    """Worker: run one cocotb test and return its result record"""
+    job_dir = Path(job_dir)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    results_xml = job_dir / "results.xml"
+    log_file = job_dir / "test.log"
+    results_xml.unlink(missing_ok=True)
+    start = time.perf_counter()
+    error = None
+    try:
+        run_testbench(**job["config"], testcase=job["testcase"], test_dir=job_dir,
+                      build_dir=_private_build(build_dir, job_dir), results_xml=str(results_xml),
+                      log_file=log_file)
+    except (Exception, SystemExit) as e:
+        # The runner exits when a test fails; the reason is in results.xml or the log
+        error = str(e)
+    wall_s = time.perf_counter() - start
+    # Icarus writes full dumps into the build directory; keep them before dropping the copy
+    for dump in (job_dir / "build").glob("*.fst"):
+        shutil.move(str(dump), job_dir / dump.name)
+    shutil.rmtree(job_dir / "build", ignore_errors=True)
+
+    status, message, sim_time_ns = "error", error, None
+    if results_xml.is_file():
+        for case in ET.parse(results_xml).iter("testcase"):
+            if case.get("name") != job["testcase"]:
+                continue
+            sim_time_ns = float(case.get("sim_time_ns", 0))
+            failure = case.find("failure")
+            if failure is None:
+                failure = case.find("error")
+            if case.find("skipped") is not None:
+                status, message = "skipped", None
+            elif failure is not None:
+                status, message = "failed", failure.get("message") or error
+            else:
+                status, message = "passed", None
+    return {
+        "module": job["module"],
+        "testcase": job["testcase"],
+        "toplevel": job["config"]["hdl_toplevel"],
+        "parameters": job["config"]["parameters"],
+        "status": status,
+        "message": message,
+        "wall_s": round(wall_s, 3),
+        "sim_time_ns": sim_time_ns,
+        "log": str(log_file),
+    }
+
+
+def write_junit(results, path):
+    suites = ET.Element("testsuites")
+    for module in sorted({r["module"] for r in results}):
+        cases = [r for r in results if r["module"] == module]
+        suite = ET.SubElement(suites, "testsuite", name=module, tests=str(len(cases)),
+                              failures=str(sum(r["status"] == "failed" for r in cases)),
+                              errors=str(sum(r["status"] == "error" for r in cases)),
+                              skipped=str(sum(r["status"] == "skipped" for r in cases)),
+                              time=f"{sum(r['wall_s'] for r in cases):.3f}")
+        for r in cases:
+            case = ET.SubElement(suite, "testcase", classname=module, name=r["testcase"],
+                                 time=f"{r['wall_s']:.3f}")
+            if r["status"] in ("failed", "error"):
+                ET.SubElement(case, "failure" if r["status"] == "failed" else "error",
+                              message=r["message"] or "").text = r["log"]
+            elif r["status"] == "skipped":
+                ET.SubElement(case, "skipped")
+    ET.ElementTree(suites).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def run_jobs(test_jobs, skipped=(), jobs=None, out_dir=DEFAULT_OUT_DIR):
+    """Build every unique configuration once, run the tests in a process pool and return their records.
+
+    Each test runs in its own out_dir/<dir> (see job_dirs).
+    """
+    out_dir = Path(out_dir)
+    dirs = job_dirs(test_jobs)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    configs = {}
+    for job in test_jobs:
+        job["key"] = _config_key(job["config"])
+        configs.setdefault(job["key"], job["config"])
+    print(f"{len(test_jobs)} tests over {len(configs)} builds ({len(skipped)} skipped)")
+
+    results = [{"module": j["module"], "testcase": j["testcase"], "toplevel": j["config"]["hdl_toplevel"],
+                "parameters": j["config"]["parameters"], "status": "skipped", "message": None,
+                "wall_s": 0.0, "sim_time_ns": None, "log": None} for j in skipped]
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        builds = {pool.submit(_build_job, config, out_dir / f"build_{key[:16]}.log"): key
+                  for key, config in configs.items()}
+        build_dirs = {}
+        for future in as_completed(builds):
+            key = builds[future]
+            try:
+                build_dirs[key], cache_hit = future.result()
+                print(f"{'cached' if cache_hit else 'built '} {configs[key]['hdl_toplevel']} ({key[:16]})")
+            except (Exception, SystemExit) as e:
+                print(f"FAILED build {configs[key]['hdl_toplevel']}: {e}")
+
+        runs = {}
+        for job, job_dir in zip(test_jobs, dirs):
+            job_dir = out_dir / job_dir
+            if job["key"] not in build_dirs:
+                results.append({"module": job["module"], "testcase": job["testcase"],
+                                "toplevel": job["config"]["hdl_toplevel"],
+                                "parameters": job["config"]["parameters"], "status": "error",
+                                "message": "build failed", "wall_s": 0.0, "sim_time_ns": None,
+                                "log": str(out_dir / f"build_{job['key'][:16]}.log")})
+                continue
+            runs[pool.submit(_test_job, job, build_dirs[job["key"]], job_dir)] = job
+        for future in as_completed(runs):
+            result = future.result()
+            results.append(result)
+            print(f"{result['status'].upper():8s} {result['module']}.{result['testcase']} "
+                  f"({result['wall_s']:.1f} s)")
+    return results
+
+
+def run_regression(pattern=None, jobs=None, out_dir=DEFAULT_OUT_DIR, waves=False):
+    """Build and run everything, returning the list of result records"""
+    out_dir = Path(out_dir)
+    test_jobs, skipped = discover(pattern)
+    if waves:
+        for job in test_jobs + skipped:
+            job["config"]["waves"] = True
+
+    start = time.perf_counter()
+    results = run_jobs(test_jobs, skipped, jobs, out_dir)
+    results.sort(key=lambda r: (r["module"], r["testcase"]))
+    summary = {
+        "sim": os.getenv("SIM", "icarus"),
+        "wall_s": round(time.perf_counter() - start, 3),
+        "counts": {s: sum(r["status"] == s for r in results)
+                   for s in ("passed", "failed", "error", "skipped")},
+        "tests": results,
+    }
+    (out_dir / "regression.json").write_text(json.dumps(summary, indent=2))
+    write_junit(results, out_dir / "regression.xml")
+    print(f"{summary['counts']} in {summary['wall_s']:.1f} s -> {out_dir}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-k", "--pattern", default=None, help="only run module.test names containing this")
+    parser.add_argument("-o", "--out", default=DEFAULT_OUT_DIR, help="results directory")
+    parser.add_argument("--waves", action="store_true", help="dump whole runs for every test (default: WAVES)")
+    args = parser.parse_args()
+    results = run_regression(args.pattern, args.jobs, args.out, args.waves)
+    sys.exit(any(r["status"] in ("failed", "error") for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Run testbenches over a grid of HDL parameter values.
+
+Each -p NAME=v1,v2,... adds one axis to the grid. Every testbench whose
+toplevel declares at least one of the swept parameters is run once per
+combination of the values it declares, on top of the parameters its runner
+already passes; parameters a toplevel does not have are left out of its
+variants. Variants are built once each (through the sim_runner cache) and
+all tests run in one process pool, as in run_regression.
+
+The table in <out>/sweep.md (also printed) has one row per toplevel and
+parameter set, with pass/fail counts and run time; <out>/sweep.json holds
+every test record.
+
+    python run_sweep.py -k voice_mixer -p NUM_VOICES=4,8,16,32
+    python run_sweep.py -k delay -p ADDR_WIDTH=10,16 -p FEEDBACK_WIDTH=8,12 -p LATENCY=7
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from run_regression import discover, run_jobs, variant_name, write_junit
+from sim_runner import SIM_DIR
+
+DEFAULT_OUT_DIR = SIM_DIR / "sweep"
+_PARAMETER = re.compile(r"parameter\s+(?:integer\s+|int\s+|logic\s+)?(\w+)\s*=\s*([^,;)\n/]+)")
+
+
+def parse_grid(specs):
+    """{"NAME": [values]} from "NAME=v1,v2" strings; numeric values become ints"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not name or not values:
+            raise ValueError(f"{spec!r}: expected NAME=v1,v2,...")
+        grid[name.strip()] = [_value(v.strip()) for v in values.split(",")]
+    return grid
+
+
+def _value(text):
+    """int for anything Python reads as an integer literal (10, -3, 0x1F, 0b101), else the string"""
+    try:
+        return int(text, 0)
+    except ValueError:
+        return text
+
+
+def toplevel_parameters(config):
+    """{name: default} for the parameters declared in the toplevel module's header"""
+    header = re.compile(rf"\bmodule\s+{re.escape(config['hdl_toplevel'])}\s*#\s*\((.*?)\)\s*\(", re.S)
+    for source in config["sources"]:
+        match = header.search(Path(source).read_text())
+        if match:
+            return {name: default.strip() for name, default in _PARAMETER.findall(match.group(1))}
+    return {}
+
+
+def variants(config, grid):
+    """One parameters dict per grid combination that applies to this toplevel"""
+    declared = toplevel_parameters(config)
+    axes = [name for name in grid if name in declared]
+    if not axes:
+        return []
+    return [{**config["parameters"], **dict(zip(axes, values))}
+            for values in itertools.product(*(grid[name] for name in axes))]
+
+
+def sweep_jobs(grid, pattern=None):
+    """(jobs, skipped) with one copy of every matching test per parameter variant.
+
+    Runner configs that only differed in a swept parameter become the same
+    variant once the grid overrides it, so each variant is kept once.
+    """
+    jobs, skipped = discover(pattern)
+    expanded = {"jobs": [], "skipped": []}
+    seen = set()
+    for kind, source in (("jobs", jobs), ("skipped", skipped)):
+        for job in source:
+            for parameters in variants(job["config"], grid):
+                config = dict(job["config"], parameters=parameters)
+                key = (job["testcase"], json.dumps(config, sort_keys=True, default=str))
+                if key in seen:
+                    continue
+                seen.add(key)
+                expanded[kind].append(dict(job, config=config,
+                                           dir=f"{job['module']}/{variant_name(parameters)}/{job['testcase']}"))
+    return expanded["jobs"], expanded["skipped"]
+
+
+def sweep_table(results, grid):
+    """Markdown table: one row per toplevel and swept parameter values"""
+    rows = {}
+    for r in results:
+        swept = {k: v for k, v in r["parameters"].items() if k in grid}
+        rows.setdefault((r["toplevel"], json.dumps(swept, sort_keys=True)), []).append(r)
+    lines = ["| toplevel | parameters | passed | failed | errors | skipped | wall s |",
+             "|---|---|---|---|---|---|---|"]
+    for (toplevel, swept), records in sorted(rows.items()):
+        counts = [sum(r["status"] == s for r in records) for s in ("passed", "failed", "error", "skipped")]
+        params = ", ".join(f"{k}={v}" for k, v in json.loads(swept).items())
+        lines.append(f"| {toplevel} | {params} | " + " | ".join(str(c) for c in counts)
+                     + f" | {sum(r['wall_s'] for r in records):.1f} |")
+    return "\n".join(lines)
+
+
+def run_sweep(grid, pattern=None, jobs=None, out_dir=DEFAULT_OUT_DIR):
+    """Run the whole sweep and return the list of result records"""
+    out_dir = Path(out_dir)
+    test_jobs, skipped = sweep_jobs(grid, pattern)
+    if not test_jobs and not skipped:
+        print(f"No testbench toplevel declares any of {', '.join(grid)}")
+        return []
+
+    start = time.perf_counter()
+    results = run_jobs(test_jobs, skipped, jobs, out_dir)
+    results.sort(key=lambda r: (r["module"], json.dumps(r["parameters"], sort_keys=True), r["testcase"]))
+    table = sweep_table(results, grid)
+    summary = {
+        "sim": os.getenv("SIM", "icarus"),
+        "grid": grid,
+        "wall_s": round(time.perf_counter() - start, 3),
+        "tests": results,
+    }
+    (out_dir / "sweep.json").write_text(json.dumps(summary, indent=2))
+    (out_dir / "sweep.md").write_text(table + "\n")
+    write_junit(results, out_dir / "sweep.xml")
+    print(table)
+    print(f"{len(results)} tests in {summary['wall_s']:.1f} s -> {out_dir}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-p", "--param", action="append", required=True, help="NAME=v1,v2,... (repeatable)")
+    parser.add_argument("-k", "--pattern", default=None, help="only module.test names containing this")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-o", "--out", default=DEFAULT_OUT_DIR, help="results directory")
+    args = parser.parse_args()
+    results = run_sweep(parse_grid(args.param), args.pattern, args.jobs, args.out)
+    sys.exit(any(r["status"] in ("failed", "error") for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Shared cocotb runner layer with a content-addressed build cache.
+
+Every testbench's runner function goes through run_testbench. The simulator,
+toplevel, parameters, build arguments, timescale, wave setting and the
+contents of every source file are hashed into a cache key, and each key gets
+its own directory under sim/sim_build. If that directory already holds a
+finished build for the key, compilation is skipped and the tests run straight
+against it, so re-running a single failing test costs no compile at all.
+
+Set SIM_REBUILD=1 to force a fresh build. SIM picks the simulator as before
+(icarus by default); SIM=verilator is much faster on the long testbenches and
+gets the extra flags in SIM_BUILD_ARGS on top of each testbench's own.
+
+Waveforms are off unless the WAVES environment variable asks for them:
+
+    WAVES=1            dump the whole run
+    WAVES=2000:2500    only dump between 2000 ns and 2500 ns (either end may
+                       be left out); Icarus only, other simulators dump it all
+    WAVES=fail         run without waves, then re-run only the failing tests
+                       with a full dump and the same RANDOM_SEED
+
+collect_testbenches runs a testbench's runner function without simulating
+anything and returns the run_testbench calls it would have made; this is how
+run_regression discovers what to build.
+
+Before each build the HDL lookup tables are brought up to date from their
+formulas (sources/scripts/lutgen), so the cache key sees the current tables.
+
+Plots the tests make through plot_capture.deferred_plot are rendered once
+the simulator has exited (PLOTS=off skips them; see plot_capture).
+"""
+
+import hashlib
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import cocotb
+from cocotb.runner import get_runner
+
+from plot_capture import render_pending, run_env
+
+SIM_DIR = Path(__file__).resolve().parent
+sys.path.append(str(SIM_DIR.parent / "scripts"))
+from lutgen import ensure_tables
+SIM_BUILD_DIR = SIM_DIR / "sim_build"
+DEFAULT_TIMESCALE = ("1ns", "1ps")
+STAMP_FILE = "build.key"
+
+# Added after a testbench's build_args. The testbenches pass -Wall for Icarus, which
+# under Verilator turns on lint and style warnings that are fatal by default;
+# keep real warnings visible but never fatal.
+SIM_BUILD_ARGS = {
+    "verilator": ["-Wno-lint", "-Wno-style", "-Wno-fatal"],
+}
+
+# Files under include directories that can change a build
+_INCLUDE_SUFFIXES = {".sv", ".svh", ".v", ".vh", ".mem"}
+
+# Dump module compiled in for WAVES=start:stop, driven by +wave_start/+wave_stop plusargs
+WAVE_WINDOW_MODULE = "sim_wave_window"
+_WAVE_WINDOW_SOURCE = """`timescale 1ns/1ps
+module {module}();
+reg [63:0] start_ns;
+reg [63:0] stop_ns;
+initial begin
+    $dumpfile("{toplevel}.fst");
+    $dumpvars(0, {toplevel});
+    if ($value$plusargs("wave_start=%d", start_ns) && start_ns > 0) begin
+        $dumpoff;
+        #(start_ns) $dumpon;
+    end
+end
+initial begin
+    if ($value$plusargs("wave_stop=%d", stop_ns)) begin
+        #(stop_ns) $dumpoff;
+    end
+end
+endmodule
+"""
+
+# Set by collect_testbenches: run_testbench records its arguments here instead of running
+_collected = None
+
+
+def wave_mode(waves=None):
+    """(mode, start_ns, stop_ns) from a waves argument, or from WAVES when it is None.
+
+    mode is "off", "all", "window" or "fail".
+    """
+    if waves is None:
+        waves = os.getenv("WAVES", "0")
+    if waves is True or waves is False:
+        return ("all" if waves else "off"), None, None
+    waves = str(waves).strip().lower()
+    if waves in ("", "0", "off", "no", "false"):
+        return "off", None, None
+    if waves in ("1", "on", "all", "yes", "true"):
+        return "all", None, None
+    if waves == "fail":
+        return "fail", None, None
+    if ":" in waves:
+        start, stop = waves.split(":", 1)
+        return "window", int(float(start)) if start else None, int(float(stop)) if stop else None
+    raise ValueError(f"WAVES={waves!r}: expected 0, 1, fail or start_ns:stop_ns")
+
+
+def build_waves(waves=None, sim=None):
+    """The waves value build() needs for a run: False, True or "window" (Icarus windows)"""
+    sim = sim or os.getenv("SIM", "icarus")
+    mode = wave_mode(waves)[0]
+    if mode == "window":
+        return "window" if sim == "icarus" else True
+    return mode == "all"
+
+
+def build_key(sim, hdl_toplevel, sources, parameters=None, build_args=None, includes=None,
+              defines=None, timescale=DEFAULT_TIMESCALE, waves=False):
+    """Hex digest identifying one build configuration"""
+    h = hashlib.sha256()
+    config = {
+        "sim": sim,
+        "cocotb": cocotb.__version__,
+        "hdl_toplevel": hdl_toplevel,
+        "parameters": dict(parameters or {}),
+        "build_args": [str(arg) for arg in build_args or []],
+        "defines": dict(defines or {}),
+        "timescale": list(timescale) if timescale else None,
+        "waves": waves if waves == "window" else bool(waves),
+    }
+    h.update(json.dumps(config, sort_keys=True, default=str).encode())
+    files = [Path(s).resolve() for s in sources]
+    for include in includes or []:
+        files += sorted(p for p in Path(include).resolve().rglob("*") if p.suffix in _INCLUDE_SUFFIXES)
+    for path in files:
+        h.update(str(path).encode())
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def build(hdl_toplevel, sources, parameters=None, build_args=None, includes=None, defines=None,
+          timescale=DEFAULT_TIMESCALE, waves=False, sim=None, log_file=None):
+    """Build (or reuse) a simulation, returning (runner, build_dir, cache_hit).
+
+    waves="window" (Icarus) compiles in a dump module that only records between
+    the +wave_start/+wave_stop plusargs, so moving the window needs no rebuild.
+    """
+    sim = sim or os.getenv("SIM", "icarus")
+    build_args = list(build_args or []) + SIM_BUILD_ARGS.get(sim, [])
+    ensure_tables()
+    key = build_key(sim, hdl_toplevel, sources, parameters, build_args, includes, defines,
+                    timescale, waves)
+    build_dir = SIM_BUILD_DIR / f"{hdl_toplevel}_{sim}_{key[:16]}"
+    stamp = build_dir / STAMP_FILE
+    runner = get_runner(sim)
+    if os.getenv("SIM_REBUILD", "0") != "1" and stamp.is_file() and stamp.read_text() == key:
+        print(f"INFO: Reusing cached build {build_dir}")
+        return runner, build_dir, True
+
+    # Only stamp after a successful build so a failed compile is never reused
+    stamp.unlink(missing_ok=True)
+    sources = list(sources)
+    if waves == "window":
+        build_dir.mkdir(parents=True, exist_ok=True)
+        window_source = build_dir / f"{WAVE_WINDOW_MODULE}.v"
+        window_source.write_text(_WAVE_WINDOW_SOURCE.format(module=WAVE_WINDOW_MODULE, toplevel=hdl_toplevel))
+        sources.append(window_source)
+        build_args += ["-s", WAVE_WINDOW_MODULE]
+    runner.build(
+        sources=sources,
+        hdl_toplevel=hdl_toplevel,
+        always=True,
+        build_dir=build_dir,
+        build_args=build_args,
+        parameters=dict(parameters or {}),
+        includes=list(includes or []),
+        defines=dict(defines or {}),
+        timescale=timescale,
+        waves=waves is True,
+        log_file=log_file
+    )
+    stamp.write_text(key)
+    return runner, build_dir, False
+
+
+def run_testbench(test_file, hdl_toplevel, sources, parameters=None, build_args=None, test_args=None,
+                  includes=None, defines=None, timescale=DEFAULT_TIMESCALE, waves=None, sim=None,
+                  testcase=None, test_dir=None, extra_env=None, hdl_toplevel_lang=None,
+                  build_dir=None, results_xml=None, log_file=None, seed=None):
+    """Build through the cache and run the cocotb tests in test_file.
+
+    waves=None follows WAVES (see the module docstring). Passing build_dir runs
+    against an existing build there instead of going through the cache.
+    Returns the results.xml path written by cocotb.
+    """
+    if _collected is not None:
+        _collected.append(dict(
+            test_file=test_file, hdl_toplevel=hdl_toplevel, sources=list(sources),
+            parameters=dict(parameters or {}), build_args=list(build_args or []),
+            test_args=list(test_args or []), includes=list(includes or []),
+            defines=dict(defines or {}), timescale=timescale, waves=waves,
+            sim=sim, extra_env=dict(extra_env or {}), hdl_toplevel_lang=hdl_toplevel_lang
+        ))
+        return None
+    # The simulator imports the test module and its helpers from these
+    for path in (SIM_DIR, SIM_DIR / "model"):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+    sim = sim or os.getenv("SIM", "icarus")
+    mode, start_ns, stop_ns = wave_mode(waves)
+    build_wave = build_waves(waves, sim)
+    if mode == "window" and build_wave != "window":
+        print(f"WARNING: WAVES windows need Icarus, dumping the whole run on {sim}")
+    plusargs = []
+    if build_wave == "window":
+        plusargs = ["-fst"] + [f"+wave_{name}={ns}" for name, ns in (("start", start_ns), ("stop", stop_ns))
+                               if ns is not None]
+    if build_dir is None:
+        runner, build_dir, _ = build(hdl_toplevel, sources, parameters, build_args, includes,
+                                     defines, timescale, build_wave, sim)
+    else:
+        runner = get_runner(sim)
+
+    error = None
+    plot_dir, plot_env = run_env(test_dir or build_dir, test_dir)
+    try:
+        results = runner.test(
+            hdl_toplevel=hdl_toplevel,
+            hdl_toplevel_lang=hdl_toplevel_lang or os.getenv("HDL_TOPLEVEL_LANG", "verilog"),
+            test_module=test_file,
+            test_args=list(test_args or []),
+            plusargs=plusargs,
+            parameters=dict(parameters or {}),
+            build_dir=build_dir,
+            test_dir=test_dir,
+            testcase=testcase,
+            seed=seed,
+            extra_env={**plot_env, **(extra_env or {})},
+            timescale=timescale,
+            waves=build_wave is True,
+            results_xml=results_xml,
+            log_file=log_file
+        )
+    except SystemExit as e:
+        # Under pytest the runner raises on failing tests; rerun those first
+        error = e
+        results = Path(runner.env["COCOTB_RESULTS_FILE"])
+    render_pending(plot_dir)
+
+    if mode == "fail":
+        failed, seed = failed_tests(results)
+        if failed:
+            print(f"INFO: Re-running {', '.join(failed)} with waves")
+            wave_dir = Path(test_dir or build_dir) / "waves_on_fail"
+            _, wave_build_dir, _ = build(hdl_toplevel, sources, parameters, build_args, includes,
+                                         defines, timescale, True, sim)
+            try:
+                run_testbench(test_file, hdl_toplevel, sources, parameters, build_args, test_args,
+                              includes, defines, timescale, True, sim, failed, wave_dir, extra_env,
+                              hdl_toplevel_lang, build_dir=wave_build_dir, seed=seed)
+            except SystemExit:
+                pass
+            # Icarus dumps next to the build, the other simulators into the test directory
+            print(f"INFO: Waves for the failing tests are in {wave_build_dir if sim == 'icarus' else wave_dir}")
+    if error is not None:
+        raise error
+    return results
+
+
+def failed_tests(results_xml):
+    """(names of the failing tests, RANDOM_SEED) from a cocotb results.xml"""
+    if not Path(results_xml).is_file():
+        return [], None
+    root = ET.parse(results_xml).getroot()
+    seed = None
+    for prop in root.iter("property"):
+        if prop.get("name") == "random_seed":
+            seed = prop.get("value")
+    failed = [case.get("name") for case in root.iter("testcase")
+              if case.find("failure") is not None or case.find("error") is not None]
+    return failed, seed
+
+
+def collect_testbenches(runner_fn):
+    """Call a runner function in collect mode and return its run_testbench arguments"""
+    global _collected
+    _collected = []
+    try:
+        runner_fn()
+        return _collected
+    finally:
+        _collected = None
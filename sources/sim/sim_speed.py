@@ -0,0 +1,142 @@
+"""Compare simulator speed (clock cycles per wall-clock second) per toplevel.
+
+Every toplevel used by a testbench is built with each simulator through the
+sim_runner cache and clocked for a fixed number of cycles out of reset, with
+nothing else driving it. The time is measured inside the simulation, so
+compile and start-up are not counted.
+
+    SIM=verilator python test_adsr.py        # any testbench, on Verilator
+    python sim_speed.py                      # table for every toplevel
+    python sim_speed.py -k adsr --cycles 200000 --sims icarus verilator
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+
+from sim_runner import SIM_BUILD_DIR, run_testbench
+
+test_file = os.path.basename(__file__).replace(".py", "")
+
+DEFAULT_CYCLES = 100_000
+# Executable that has to be on PATH for each simulator
+SIM_EXECUTABLES = {"icarus": "iverilog", "verilator": "verilator", "questa": "vsim", "xcelium": "xrun"}
+_RESET_NAMES = ("rst", "rst_in", "reset")
+
+
+@cocotb.test()
+async def test_clock_speed(dut):
+    """Clock the toplevel for SIM_SPEED_CYCLES cycles and record how long it took"""
+    cycles = int(os.getenv("SIM_SPEED_CYCLES", DEFAULT_CYCLES))
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    resets = [getattr(dut, name) for name in _RESET_NAMES if hasattr(dut, name)]
+    for rst in resets:
+        rst.value = 1
+    await ClockCycles(dut.clk, 2)
+    for rst in resets:
+        rst.value = 0
+
+    start = time.perf_counter()
+    await ClockCycles(dut.clk, cycles)
+    wall_s = time.perf_counter() - start
+
+    result = os.getenv("SIM_SPEED_RESULT")
+    if result:
+        Path(result).write_text(json.dumps({"cycles": cycles, "wall_s": wall_s}))
+    dut._log.info(f"{cycles} cycles in {wall_s:.2f} s ({cycles / wall_s:,.0f} cycles/s)")
+
+
+def available_sims():
+    return [sim for sim, exe in SIM_EXECUTABLES.items() if shutil.which(exe)]
+
+
+def toplevel_configs(pattern=None):
+    """One run_testbench configuration per (toplevel, parameters) used by the testbenches"""
+    from run_regression import discover
+
+    jobs, skipped = discover()
+    configs = {}
+    for job in jobs + skipped:
+        config = job["config"]
+        name = config["hdl_toplevel"]
+        if pattern and pattern not in f"{job['module']}.{name}":
+            continue
+        configs.setdefault((name, json.dumps(config["parameters"], sort_keys=True, default=str)), config)
+    return list(configs.values())
+
+
+def measure(config, sim, cycles=DEFAULT_CYCLES, out_dir=SIM_BUILD_DIR / "sim_speed"):
+    """Cycles per second for one configuration on one simulator (None if it did not run)"""
+    test_dir = Path(out_dir) / f"{config['hdl_toplevel']}_{sim}"
+    test_dir.mkdir(parents=True, exist_ok=True)
+    result = test_dir / "speed.json"
+    result.unlink(missing_ok=True)
+    try:
+        run_testbench(
+            test_file=test_file,
+            hdl_toplevel=config["hdl_toplevel"],
+            sources=config["sources"],
+            parameters=config["parameters"],
+            build_args=config["build_args"],
+            includes=config["includes"],
+            defines=config["defines"],
+            timescale=config["timescale"],
+            waves=False,
+            sim=sim,
+            test_dir=test_dir,
+            extra_env={"SIM_SPEED_CYCLES": str(cycles), "SIM_SPEED_RESULT": str(result)},
+            log_file=test_dir / "sim.log"
+        )
+    except (Exception, SystemExit) as e:
+        print(f"{config['hdl_toplevel']} on {sim} failed: {e}")
+    if not result.is_file():
+        return None
+    data = json.loads(result.read_text())
+    return data["cycles"] / data["wall_s"]
+
+
+def speed_table(pattern=None, sims=None, cycles=DEFAULT_CYCLES):
+    """Markdown table of cycles/s per toplevel and simulator"""
+    sims = sims or available_sims()
+    rows = []
+    for config in toplevel_configs(pattern):
+        speeds = [measure(config, sim, cycles) for sim in sims]
+        name = config["hdl_toplevel"]
+        if config["parameters"]:
+            name += " " + ",".join(f"{k}={v}" for k, v in config["parameters"].items())
+        rows.append((name, speeds))
+
+    header = "| toplevel | " + " | ".join(f"{sim} cycles/s" for sim in sims) + " |"
+    if len(sims) > 1:
+        header += f" {sims[-1]} / {sims[0]} |"
+    lines = [header, "|" + "---|" * (header.count("|") - 1)]
+    for name, speeds in rows:
+        cells = [f"{s:,.0f}" if s else "failed" for s in speeds]
+        if len(sims) > 1:
+            cells.append(f"{speeds[-1] / speeds[0]:.1f}x" if speeds[0] and speeds[-1] else "-")
+        lines.append(f"| {name} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--pattern", default=None, help="only toplevels/testbenches containing this")
+    parser.add_argument("--sims", nargs="+", default=None, help="simulators to compare (default: all found)")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument("-o", "--out", default=None, help="also write the table to this file")
+    args = parser.parse_args()
+    table = speed_table(args.pattern, args.sims, args.cycles)
+    print(table)
+    if args.out:
+        Path(args.out).write_text(table + "\n")
+
+
+if __name__ == "__main__":
+    main()
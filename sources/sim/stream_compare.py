@@ -0,0 +1,118 @@
+"""Latency-aware comparison of a DUT's output stream against a model.
+
+StrobeRecorder logs the clock and value of every strobe on a valid/data pair,
+sampled like axis.py (in the ReadOnly phase after each falling edge), so an
+input recorder and an output recorder on the same clock give each sample's
+latency in clocks directly:
+
+    inputs = StrobeRecorder(dut.clk, dut.sample_valid, dut.audio_in)
+    outputs = StrobeRecorder(dut.clk, dut.audio_out_valid, dut.audio_out)
+    cocotb.start_soon(inputs.run()); cocotb.start_soon(outputs.run())
+    ...drive the stream...
+    latency = learn_latency(inputs.cycles, outputs.cycles)
+    check(expected, outputs.values)
+
+learn_latency pairs the k-th input strobe with the k-th output strobe and
+insists the distance is constant. compare/check work on whole arrays, any
+leading axes being separate streams (a sweep), so one call checks all of
+them and reports the first mismatch of each.
+"""
+
+import numpy as np
+from cocotb.triggers import FallingEdge, ReadOnly
+
+
+class StrobeRecorder:
+    """Records (clock, value) for every clock valid is high"""
+
+    def __init__(self, clk, valid, data=None, signed=True):
+        self.clk = clk
+        self.valid = valid
+        self.data = data
+        self.signed = signed
+        self.cycle = 0
+        self._cycles = []
+        self._values = []
+
+    async def run(self):
+        while True:
+            await FallingEdge(self.clk)
+            await ReadOnly()
+            if self.valid.value == 1:
+                self._cycles.append(self.cycle)
+                if self.data is not None:
+                    value = self.data.value
+                    self._values.append(value.signed_integer if self.signed else value.integer)
+            self.cycle += 1
+
+    async def wait_for(self, count, timeout_cycles=1000):
+        """Wait until count strobes have been seen (more than timeout_cycles clocks apart is an error)"""
+        last, seen = self.cycle, len(self)
+        while len(self) < count:
+            await FallingEdge(self.clk)
+            if len(self) > seen:
+                last, seen = self.cycle, len(self)
+            elif self.cycle - last > timeout_cycles:
+                raise TimeoutError(f"Only {len(self)} of {count} strobes, none in the last {timeout_cycles} clocks")
+
+    def clear(self):
+        self._cycles.clear()
+        self._values.clear()
+
+    def __len__(self):
+        return len(self._cycles)
+
+    @property
+    def cycles(self):
+        return np.array(self._cycles, dtype=np.int64)
+
+    @property
+    def values(self):
+        return np.array(self._values, dtype=np.int64)
+
+
+def latencies(in_cycles, out_cycles):
+    """Clocks from each input strobe to the output strobe with the same index"""
+    count = min(len(in_cycles), len(out_cycles))
+    return np.asarray(out_cycles[:count], dtype=np.int64) - np.asarray(in_cycles[:count], dtype=np.int64)
+
+
+def learn_latency(in_cycles, out_cycles):
+    """The pipeline latency in clocks, checked to be the same for every strobe"""
+    delays = latencies(in_cycles, out_cycles)
+    if len(delays) == 0:
+        raise ValueError("no output strobes to learn the latency from")
+    values, counts = np.unique(delays, return_counts=True)
+    if len(values) > 1:
+        first = np.flatnonzero(delays != delays[0])[0]
+        raise AssertionError(f"latency is not constant: {dict(zip(values.tolist(), counts.tolist()))} clocks "
+                             f"(sample 0 took {delays[0]}, sample {first} took {delays[first]})")
+    return int(values[0])
+
+
+def compare(expected, actual):
+    """Mismatch mask of two stream sets (..., samples); lengths must match on every axis"""
+    expected, actual = np.asarray(expected), np.asarray(actual)
+    if expected.shape != actual.shape:
+        raise AssertionError(f"expected {expected.shape} samples, got {actual.shape}")
+    return expected != actual
+
+
+def check(expected, actual, labels=None):
+    """Assert two stream sets match, naming the first bad sample of every stream that does not"""
+    expected, actual = np.asarray(expected), np.asarray(actual)
+    mismatch = compare(expected, actual)
+    if not mismatch.any():
+        return
+    streams = mismatch.reshape(-1, mismatch.shape[-1])
+    flat_expected = expected.reshape(streams.shape)
+    flat_actual = actual.reshape(streams.shape)
+    bad = np.flatnonzero(streams.any(axis=-1))
+    first = streams[bad].argmax(axis=-1)
+    lines = []
+    for stream, sample in zip(bad.tolist(), first.tolist()):
+        index = tuple(int(i) for i in np.unravel_index(stream, mismatch.shape[:-1]))
+        name = labels[stream] if labels is not None else (str(index) if index else "stream")
+        lines.append(f"{name}: sample {sample}: DUT {flat_actual[stream, sample]}, "
+                     f"model {flat_expected[stream, sample]} ({streams[stream].sum()} mismatches)")
+    raise AssertionError(f"{len(bad)} of {len(streams)} streams differ\n" + "\n".join(lines))
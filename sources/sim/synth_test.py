@@ -12,12 +12,21 @@ from cocotb.clock import Clock
 from cocotb.triggers import Timer, ClockCycles, RisingEdge, FallingEdge
 from cocotb.triggers import ReadOnly,with_timeout, Edge, ReadWrite, NextTimeStep, First
 from cocotb.utils import get_sim_time as gst
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 test_file = os.path.basename(__file__).replace(".py","")
 
+from midi_driver import MidiDriver, NOTE_OFF, program_change
+from audio_capture import AudioCapture, SAMPLE_RATE
+
+@deferred_plot("synth_test_a.png")
+def plot_mix(mix):
+    plt.figure()
+    plt.plot(mix)
+
+
 @cocotb.test()
 async def test_a(dut):
-    my_output = []
     """cocotb test for messing with verilog simulation"""
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
     dut.rst.value = 1
@@ -26,54 +35,31 @@ async def test_a(dut):
     dut.rst.value = 0
     await FallingEdge(dut.clk)
     await Timer(100, 'ns')
-    note1 = [0,random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1)]
-    note2 = [0,random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1),random.randint(0,1)]
+    # One sample per data_valid (48 kHz) from every voice, streamed to a WAV as it runs
+    voices = [getattr(dut, f"voice_{v}_out") for v in range(1, 9)]
+    capture = AudioCapture(dut.clk, voices, valid=dut.data_valid, max_samples=SAMPLE_RATE,
+                           wav=Path(__file__).resolve().parent / "synth_test_a.wav")
+    capture.start()
+    midi = MidiDriver(dut.midi_in)
+    note1 = random.randint(0,127)
+    note2 = random.randint(0,127)
     for i in range(2):
-        input = [[1,1,0,0,0,0,0,0],[0,0,0,0,0,0,random.randint(0,1),random.randint(0,1)]]
-        dut._log.info(f"Sending Channel: {input[1]}")
-        for byte in input:
-            print('b')
-            dut.midi_in.value = 0
-            await Timer(32000, 'ns')
-            for i in range(8):
-                dut.midi_in.value = byte[7-i]
-                await Timer(32000, 'ns')
-            dut.midi_in.value = 1
-            await Timer(32000, 'ns')
-        dut.wave_type.value = i
-        vel = [0,0,0,0,0,0,0,0]
-        input_on = [[1,0,0,(i+1)%2,0,0,0,0], note1, vel]
-        input_off = [[1,0,0,(i+1)%2,0,0,0,0], note2, vel]
-        for byte in input_on:
-            print('b1')
-            dut.midi_in.value = 0
-            await Timer(32000, 'ns')
-            for i in range(8):
-                dut.midi_in.value = byte[7-i]
-                await Timer(32000, 'ns')
-            dut.midi_in.value = 1
-            await Timer(32000, 'ns')
-        print(dut.note_plays.value)
-        for _ in range(1000000):
-            await Timer(10, 'ns')
-            my_output.append(dut.audio_out.value.signed_integer)
-        for byte in input_off:
-            print('b0')
-            dut.midi_in.value = 0
-            await Timer(32000, 'ns')
-            for i in range(8):
-                dut.midi_in.value = byte[7-i]
-                await Timer(32000, 'ns')
-            dut.midi_in.value = 1
-            await Timer(32000, 'ns')
-        print(dut.note_plays.value)
-        for _ in range(1000000):
-            await Timer(10, 'ns')
-            my_output.append(dut.audio_out.value.signed_integer)
-    
-    plt.figure()
-    plt.plot(np.array(my_output))
-    plt.show()
+        channel = random.randint(0,3)
+        dut._log.info(f"Sending Channel: {channel}")
+        await midi.send([(0, program_change(channel))])
+        dut.wave_in.value = i
+        # note on for i == 0, note off for i == 1, both with velocity 0
+        status = NOTE_OFF | (((i+1)%2) << 4)
+        await midi.send([(0, [status, note1, 0])])
+        print(dut.ons_out.value)
+        await ClockCycles(dut.clk, 1000000)
+        await midi.send([(0, [status, note2, 0])])
+        print(dut.ons_out.value)
+        await ClockCycles(dut.clk, 1000000)
+    capture.stop()
+    dut._log.info(f"Captured {capture.count} samples")
+
+    plot_mix(mix=capture.samples.astype(np.int64).sum(axis=1))
 
 
 def test_runner():
@@ -86,22 +72,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "synth"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
  
 if __name__ == "__main__":
@@ -7,36 +7,23 @@ import matplotlib.pyplot as plt
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge
 from cocotb.utils import get_sim_time as gst
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 
 test_file = os.path.basename(__file__).replace(".py", "")
 
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import adsr_model
+from pulse_sync import wait_for_pulse, wait_n_pulses
 
-async def wait_for_pulse(dut, timeout_cycles=150_000):
-    """Wait for the ms_pulse to go high, with timeout"""
-    cycle_count = 0
-    pulse_seen = False
-    for _ in range(timeout_cycles):
-        if dut.ms_pulse.value == 1:
-            pulse_seen = True
-            break
-        await RisingEdge(dut.clk)
-        cycle_count += 1
 
-    if not pulse_seen:
-        raise AssertionError(f"Timeout waiting for ms_pulse after {cycle_count} cycles")
-
-    # Wait for pulse to go back low
-    while dut.ms_pulse.value == 1:
-        await RisingEdge(dut.clk)
-
-
-async def wait_n_pulses(dut, n_pulses, timeout_per_pulse=150_000):
-    """Wait for n millisecond pulses"""
-    for i in range(n_pulses):
-        await wait_for_pulse(dut, timeout_per_pulse)
-        if i % 10 == 0:
-            print(f"Completed {i} pulses")
+async def check_envelope(dut, expected, pulse):
+    """Read envelope_out after the given ms_pulse and compare it with the model"""
+    await FallingEdge(dut.clk)
+    envelope_val = dut.envelope_out.value.integer
+    assert envelope_val == expected[pulse], \
+        f"Pulse {pulse}: envelope {envelope_val}, model expected {int(expected[pulse])}"
+    return envelope_val
 
 
 @cocotb.test()
@@ -55,6 +42,19 @@ async def test_clk_divider_basic(dut):
     print("SUCCESS: Clock divider is working!")
 
 
+@deferred_plot("adsr_envelope_plot.png")
+def plot_envelope(expected, time_ms, dut_values):
+    plt.figure(figsize=(14, 7))
+    plt.plot(np.arange(len(expected)), expected, 'b-', linewidth=2, label='Model')
+    plt.plot(time_ms, dut_values, 'o', markersize=4, label='DUT checkpoints')
+    plt.xlabel('Time (ms)', fontsize=12)
+    plt.ylabel('Envelope Value', fontsize=12)
+    plt.title('ADSR Envelope Response (100ms Attack, 150ms Decay, 60% Sustain, 200ms Release)', fontsize=14, fontweight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.axvline(x=351, color='r', linestyle='--', linewidth=2, label='Note Off')
+    plt.legend(fontsize=11)
+
+
 @cocotb.test()
 async def test_adsr_basic(dut):
     """Test basic ADSR envelope behavior"""
@@ -72,108 +72,37 @@ async def test_adsr_basic(dut):
     await FallingEdge(dut.clk)
     dut.rst.value = 0
 
-    # Wait for envelope to settle - divider is 100,000 cycles per pulse
-    await wait_for_pulse(dut, timeout_cycles=150_000)
+    # Note on before pulse 1 (IDLE -> ATTACK), note off 350 pulses later
+    note_events = [(1, 1), (351, 0)]
+    num_pulses = 551
+    expected = adsr_model.adsr_envelope(100, 150, 60, 200, note_events, num_pulses)
+    checkpoints = {0, 1, 2, 100, 101, 102, 250, 251, 252, 351, 352, 353, 549, 550} | set(range(0, num_pulses, 10))
 
-    initial_envelope = dut.envelope_out.value.integer
+    # Wait for envelope to settle - divider is 1,000 cycles per pulse in simulation
+    await wait_for_pulse(dut, timeout_cycles=150_000)
+    initial_envelope = await check_envelope(dut, expected, 0)
     assert initial_envelope == 0, f"Expected initial envelope 0, got {initial_envelope}"
 
-    # Collect all envelope values for plotting
-    all_values = []
+    # Only read the DUT at the checkpoints and skip the pulses in between, the model covers every pulse
     time_ms = []
-    current_time = 0
-
-    # Trigger note on
-    dut.note_on.value = 1
-
-    # Wait for attack phase (100 pulses)
-    attack_values = []
-    for i in range(100):
-        await wait_for_pulse(dut, timeout_cycles=150_000)
-        # Read envelope after pulse is done processing
-        await RisingEdge(dut.clk)
-        envelope_val = dut.envelope_out.value.integer
-        attack_values.append(envelope_val)
-        all_values.append(envelope_val)
-        time_ms.append(current_time)
-        current_time += 1
-        if (i + 1) % 20 == 0:
-            print(f"Attack: {i+1}/100 pulses, envelope={envelope_val}")
-
-    # Check that envelope is increasing during attack
-    assert attack_values[-1] > attack_values[0], "Envelope should increase during attack"
-    print(f"Attack phase: Initial={attack_values[0]}, Final={attack_values[-1]}")
-
-    # Continue for decay phase (150 pulses)
-    decay_values = []
-    for i in range(150):
-        await wait_for_pulse(dut, timeout_cycles=150_000)
-        await RisingEdge(dut.clk)
-        envelope_val = dut.envelope_out.value.integer
-        decay_values.append(envelope_val)
-        all_values.append(envelope_val)
-        time_ms.append(current_time)
-        current_time += 1
-        if (i + 1) % 30 == 0:
-            print(f"Decay: {i+1}/150 pulses, envelope={envelope_val}")
-
-    # Check that envelope is decreasing during decay (after reaching max)
-    if decay_values[0] > decay_values[-1]:
-        print(f"Decay phase: Initial={decay_values[0]}, Final={decay_values[-1]}")
-
-    # Continue in sustain phase (100 pulses)
-    sustain_values = []
-    for i in range(100):
-        await wait_for_pulse(dut, timeout_cycles=150_000)
-        await RisingEdge(dut.clk)
-        envelope_val = dut.envelope_out.value.integer
-        sustain_values.append(envelope_val)
-        all_values.append(envelope_val)
-        time_ms.append(current_time)
-        current_time += 1
-        if (i + 1) % 25 == 0:
-            print(f"Sustain: {i+1}/100 pulses, envelope={envelope_val}")
-
-    # Check that sustain level is stable
-    if len(sustain_values) > 1:
-        print(f"Sustain phase: Stable at {sustain_values[0]}")
-
-    # Trigger note off
-    dut.note_on.value = 0
-    print(f"Note OFF triggered at time={current_time}ms")
-
-    # Collect release values (200 pulses)
-    release_values = []
-    for i in range(200):
-        await wait_for_pulse(dut, timeout_cycles=150_000)
-        await RisingEdge(dut.clk)
-        envelope_val = dut.envelope_out.value.integer
-        release_values.append(envelope_val)
-        all_values.append(envelope_val)
-        time_ms.append(current_time)
-        current_time += 1
-        if (i + 1) % 40 == 0:
-            print(f"Release: {i+1}/200 pulses, envelope={envelope_val}")
-
-    # Check that envelope decreases to 0 during release
-    assert release_values[-1] < release_values[0], "Envelope should decrease during release"
-    print(f"Release phase: Initial={release_values[0]}, Final={release_values[-1]}")
-
-    # Plot the envelope
-    plt.figure(figsize=(14, 7))
-    plt.plot(time_ms, all_values, 'b-', linewidth=2, marker='o', markersize=3)
-    plt.xlabel('Time (ms)', fontsize=12)
-    plt.ylabel('Envelope Value', fontsize=12)
-    plt.title('ADSR Envelope Response (100ms Attack, 150ms Decay, 60% Sustain, 200ms Release)', fontsize=14, fontweight='bold')
-    plt.grid(True, alpha=0.3)
-    plt.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
-    plt.legend(fontsize=11)
-
-    # Save and show
-    plot_path = Path(__file__).resolve().parent / "adsr_envelope_plot.png"
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    print(f"Envelope plot saved to {plot_path}")
-    plt.show()
+    dut_values = []
+    stops = sorted((checkpoints | {p - 1 for p, _ in note_events}) - {0})
+    pulse = 0
+    for stop in [0] + stops:
+        await wait_n_pulses(dut, stop - pulse)
+        pulse = stop
+        if pulse in checkpoints:
+            dut_values.append(await check_envelope(dut, expected, pulse))
+            time_ms.append(pulse)
+        for p, level in note_events:
+            if p == pulse + 1:
+                dut.note_on.value = level
+
+    assert expected[101] == adsr_model.max_envelope(), "Attack should end at MAX_ENVELOPE"
+    assert expected[251] == adsr_model.sustain_level(60), "Decay should end at the sustain level"
+    assert expected[-1] == 0, "Envelope should reach 0 after release"
+
+    plot_envelope(expected=expected, time_ms=time_ms, dut_values=dut_values)
 
 
 @cocotb.test()
@@ -192,20 +121,21 @@ async def test_adsr_fast_times(dut):
     await FallingEdge(dut.clk)
     dut.rst.value = 0
 
+    expected = adsr_model.adsr_envelope(5, 5, 75, 5, [(1, 1), (6, 0)], 11)
     await wait_for_pulse(dut)
 
     # Note on
     dut.note_on.value = 1
     await wait_n_pulses(dut, 5)  # Wait 5ms for attack
 
-    attack_envelope = dut.envelope_out.value.integer
+    attack_envelope = await check_envelope(dut, expected, 5)
     print(f"Fast attack - Envelope after 5ms: {attack_envelope}")
 
     # Note off quickly
     dut.note_on.value = 0
     await wait_n_pulses(dut, 5)  # Wait 5ms for release
 
-    final_envelope = dut.envelope_out.value.integer
+    final_envelope = await check_envelope(dut, expected, 10)
     print(f"Fast release - Envelope after 5ms: {final_envelope}")
 
     assert final_envelope < attack_envelope, "Envelope should decrease during release"
@@ -227,6 +157,7 @@ async def test_adsr_early_release(dut):
     await FallingEdge(dut.clk)
     dut.rst.value = 0
 
+    expected = adsr_model.adsr_envelope(20, 10, 50, 10, [(1, 1), (11, 0)], 21)
     await wait_for_pulse(dut)
 
     # Note on
@@ -234,13 +165,13 @@ async def test_adsr_early_release(dut):
 
     # Let it attack for a bit
     await wait_n_pulses(dut, 10)  # 10ms into attack
-    envelope_at_10ms = dut.envelope_out.value.integer
+    envelope_at_10ms = await check_envelope(dut, expected, 10)
 
     # Note off (early release during attack)
     dut.note_on.value = 0
     await wait_n_pulses(dut, 10)  # 10ms of release
 
-    final_envelope = dut.envelope_out.value.integer
+    final_envelope = await check_envelope(dut, expected, 20)
     print(f"Early release - Envelope at 10ms attack: {envelope_at_10ms}, After 10ms release: {final_envelope}")
 
     assert final_envelope < envelope_at_10ms, "Envelope should decrease when released early"
@@ -262,6 +193,7 @@ async def test_adsr_retrigger(dut):
     await FallingEdge(dut.clk)
     dut.rst.value = 0
 
+    expected = adsr_model.adsr_envelope(10, 10, 50, 20, [(1, 1), (21, 0), (31, 1)], 41)
     await wait_for_pulse(dut)
 
     # First note on/off cycle
@@ -271,14 +203,14 @@ async def test_adsr_retrigger(dut):
     dut.note_on.value = 0
     await wait_n_pulses(dut, 10)  # Partial release
 
-    envelope_during_release = dut.envelope_out.value.integer
+    envelope_during_release = await check_envelope(dut, expected, 30)
     print(f"Envelope during release: {envelope_during_release}")
 
     # Retrigger note before release completes
     dut.note_on.value = 1
     await wait_n_pulses(dut, 10)  # Re-attack from release point
 
-    envelope_after_retrigger = dut.envelope_out.value.integer
+    envelope_after_retrigger = await check_envelope(dut, expected, 40)
     print(f"Envelope after retrigger: {envelope_after_retrigger}")
 
     # Envelope should be increasing again
@@ -301,20 +233,22 @@ async def test_adsr_zero_time(dut):
     await FallingEdge(dut.clk)
     dut.rst.value = 0
 
+    # attack_time - 1 is compared at 32 bits, so a zero attack never finishes on its own
+    expected = adsr_model.adsr_envelope(0, 0, 100, 0, [(1, 1), (2, 0)], 3)
     await wait_for_pulse(dut)
 
     # Note on
     dut.note_on.value = 1
     await wait_for_pulse(dut)
 
-    envelope_on = dut.envelope_out.value.integer
+    envelope_on = await check_envelope(dut, expected, 1)
     print(f"Zero time envelope on: {envelope_on}")
 
     # Note off
     dut.note_on.value = 0
     await wait_for_pulse(dut)
 
-    envelope_off = dut.envelope_out.value.integer
+    envelope_off = await check_envelope(dut, expected, 2)
     print(f"Zero time envelope off: {envelope_off}")
 
 
@@ -331,22 +265,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "adsr_envelope"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale=('1ns', '1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
 
 
@@ -0,0 +1,66 @@
+import cocotb
+import os
+import sys
+from pathlib import Path
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, FallingEdge
+import numpy as np
+from axis import AxisSink, AxisSource
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import spectrogram_model
+
+test_file = os.path.basename(__file__).replace(".py","")
+
+@cocotb.test()
+async def test_color_map_all_values(dut):
+    """Every log value, one per clock, matches the jet colours of spectrogram_model"""
+
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+
+    # Reset
+    dut.rst.value = 1
+    dut.log_val.value = 0
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+    log_val = np.arange(256)
+    source = AxisSource(dut.clk, dut.log_val, dut.valid_in)
+    sink = AxisSink(dut.clk, dut.rgb, dut.valid_out)
+    cocotb.start_soon(source.send(log_val))
+    rgb, _ = await sink.collect(len(log_val))
+
+    expected = spectrogram_model.color_map(log_val).astype(np.int64)
+    expected = (expected[:, 0] << 16) | (expected[:, 1] << 8) | expected[:, 2]
+    mismatch = np.flatnonzero(rgb != expected)
+    assert len(mismatch) == 0, \
+        f"log_val={mismatch[0]}: rgb=0x{rgb[mismatch[0]]:06X} (expected 0x{expected[mismatch[0]]:06X})"
+    dut.log.info("PASS: all 256 colours match")
+
+
+def test_runner():
+    """Simulate the colour map using the Python runner."""
+    from sim_runner import run_testbench
+
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")
+    proj_path = Path(__file__).resolve().parent.parent
+    sys.path.append(str(proj_path / "sim"))
+
+    sources = [proj_path / "hdl" / "color_mapping.sv"]
+    hdl_toplevel = "color_map"
+    build_test_args = ["-Wall"]
+    parameters = {}
+
+    run_testbench(
+        test_file=test_file,
+        hdl_toplevel=hdl_toplevel,
+        sources=sources,
+        build_args=build_test_args,
+        parameters=parameters,
+        sim=sim
+    )
+
+if __name__ == "__main__":
+    test_runner()
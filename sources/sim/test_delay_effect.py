@@ -6,10 +6,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, ClockCycles
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 
 test_file = os.path.basename(__file__).replace(".py", "")
 
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import delay_model
+
 
 def to_signed_32bit(value):
     """Convert 32-bit unsigned to signed"""
@@ -37,7 +41,7 @@ async def test_simple_delay(dut):
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
 
     # Reset
-    dut.reset.value = 1
+    dut.rst.value = 1
     dut.sample_valid.value = 0
     dut.audio_in.value = 0
     dut.delay_samples.value = 5  # Set delay BEFORE releasing reset
@@ -46,7 +50,7 @@ async def test_simple_delay(dut):
     dut.mode.value = 0  # Feedforward
 
     await RisingEdge(dut.clk)
-    dut.reset.value = 0
+    dut.rst.value = 0
     await ClockCycles(dut.clk, 2)
 
     # Continuously stream samples: impulse followed by zeros
@@ -88,16 +92,20 @@ async def test_simple_delay(dut):
 
     assert impulse_found, "No impulse output found"
 
-    # Plot impulse response
+    plot_impulse(inputs=inputs, outputs=outputs, impulse_cycle=impulse_cycle)
+
+
+@deferred_plot("test_1_impulse.png")
+def plot_impulse(inputs, outputs, impulse_cycle):
     cycles = np.arange(len(outputs))
     fig, axes = plt.subplots(2, 1, figsize=(12, 8))
-    
+
     # Input
     axes[0].stem(cycles, inputs, linefmt='g-', markerfmt='go', basefmt='k-')
     axes[0].set_ylabel('Input Value')
     axes[0].set_title('Test 1: Input Impulse')
     axes[0].grid(True, alpha=0.3)
-    
+
     # Output
     axes[1].plot(cycles, outputs, 'b-o', linewidth=2, markersize=6, label='Output')
     axes[1].axhline(y=0, color='k', linestyle='--', alpha=0.3)
@@ -107,12 +115,8 @@ async def test_simple_delay(dut):
     axes[1].set_title(f'Test 1: Impulse Response (5 sample delay, 100% wet) - Found at sample {impulse_cycle}')
     axes[1].grid(True, alpha=0.3)
     axes[1].legend()
-    
+
     plt.tight_layout()
-    plot_path = Path(__file__).resolve().parent / "test_1_impulse.png"
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    print(f"Plot saved to {plot_path}")
-    plt.close()
 
 
 @cocotb.test()
@@ -121,7 +125,7 @@ async def test_continuous_ramp(dut):
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
 
     # Reset with delay already configured
-    dut.reset.value = 1
+    dut.rst.value = 1
     dut.sample_valid.value = 0
     dut.audio_in.value = 0
     dut.delay_samples.value = 8
@@ -130,7 +134,7 @@ async def test_continuous_ramp(dut):
     dut.mode.value = 0  # Feedforward
 
     await RisingEdge(dut.clk)
-    dut.reset.value = 0
+    dut.rst.value = 0
     await ClockCycles(dut.clk, 2)
 
     # Send ramp: 1000, 2000, 3000, ... (start at 1000 so we can detect non-zero)
@@ -162,11 +166,15 @@ async def test_continuous_ramp(dut):
     assert len(valid_outputs) > 0, "No valid outputs found"
     print(f"✓ Found {len(valid_outputs)} valid non-zero outputs")
 
-    # Plot ramp response
+    plot_ramp(inputs=inputs_log, outputs=outputs, valids=valids)
+
+
+@deferred_plot("test_2_ramp.png")
+def plot_ramp(inputs, outputs, valids):
     fig, axes = plt.subplots(2, 1, figsize=(14, 10))
     cycles = np.arange(len(outputs))
 
-    axes[0].plot(cycles, inputs_log, 'g-s', linewidth=2, markersize=6, label='Input Ramp')
+    axes[0].plot(cycles, inputs, 'g-s', linewidth=2, markersize=6, label='Input Ramp')
     axes[0].set_ylabel('Sample Value')
     axes[0].set_title('Test 2: Input Ramp Signal')
     axes[0].grid(True, alpha=0.3)
@@ -174,9 +182,7 @@ async def test_continuous_ramp(dut):
 
     axes[1].plot(cycles, outputs, 'b-o', linewidth=2, markersize=4, label='Output')
     # Color by validity
-    for i in range(len(cycles)):
-        color = 'g' if valids[i] == 1 else 'r'
-        axes[1].scatter(cycles[i], outputs[i], c=color, s=50, zorder=3)
+    axes[1].scatter(cycles, outputs, c=np.where(valids == 1, 'g', 'r'), s=50, zorder=3)
     axes[1].axhline(y=0, color='k', linestyle='--', alpha=0.3)
     axes[1].axvline(x=8, color='r', linestyle=':', alpha=0.5, label='Expected delay (8 samples)')
     axes[1].set_xlabel('Sample Number')
@@ -186,10 +192,6 @@ async def test_continuous_ramp(dut):
     axes[1].legend()
 
     plt.tight_layout()
-    plot_path = Path(__file__).resolve().parent / "test_2_ramp.png"
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    print(f"Plot saved to {plot_path}")
-    plt.close()
 
 
 @cocotb.test()
@@ -197,22 +199,28 @@ async def test_feedback_echo(dut):
     """Test feedback mode creates multiple echoes
     
     With feedback, the delayed signal is added back to the input,
-    creating repeating echoes that decay over time.
+    creating repeating echoes that decay over time. The gains are $signed
+    8-bit, so effect_amount=255 is a wet gain of -1/256 that leaves no echo
+    to see; 127 is the largest positive wet gain (127/256).
     """
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
 
     # Reset with configuration
-    dut.reset.value = 1
+    dut.rst.value = 1
     dut.sample_valid.value = 0
     dut.audio_in.value = 0
     dut.delay_samples.value = 10    # Longer delay to see distinct echoes
     dut.feedback_amount.value = 128  # ~50% feedback
-    dut.effect_amount.value = 255   # 100% wet
+    dut.effect_amount.value = 127   # wet gain 127/256 (255 would be -1/256)
     dut.mode.value = 1              # Feedback mode
+    # Reset does not clear the RAM; zero what this stream reads before writing it
+    ram = dut.delay_buf.ram_inst.BRAM
+    for address in list(range(110)) + list(range(len(ram) - 19, len(ram))):
+        ram[address].value = 0
 
     await RisingEdge(dut.clk)
-    dut.reset.value = 0
-    await ClockCycles(dut.clk, 2)
+    dut.rst.value = 0
+    await ClockCycles(dut.clk, 4)  # flush the unreset dry/feedback/RAM output registers
 
     # Send impulse followed by zeros - must keep streaming for feedback to work
     outputs = []
@@ -240,6 +248,14 @@ async def test_feedback_echo(dut):
 
     dut.sample_valid.value = 0
 
+    # Every valid output must match the model sample for sample
+    valid_outputs = np.array([o for v, o in zip(valids, outputs) if v == 1], dtype=np.int64)
+    expected = delay_model.delay_effect(np.array(inputs), delay_samples=10, feedback_amount=128,
+                                        effect_amount=127, mode=1)[:len(valid_outputs)]
+    mismatch = np.flatnonzero(valid_outputs != expected)
+    assert len(mismatch) == 0, \
+        f"Sample {mismatch[0]}: DUT {valid_outputs[mismatch[0]]}, model {expected[mismatch[0]]}"
+
     # Find all non-zero outputs (echoes)
     echoes = [(i, o) for i, (v, o) in enumerate(zip(valids, outputs))
               if v == 1 and abs(o) > 50]  # Threshold to ignore tiny values
@@ -250,30 +266,28 @@ async def test_feedback_echo(dut):
     
     assert len(echoes) >= 2, f"Expected multiple echoes, found {len(echoes)}"
 
-    # Plot echo decay
+    plot_echo(outputs=outputs, echo_cycles=[e[0] for e in echoes], echo_vals=[e[1] for e in echoes])
+
+
+@deferred_plot("test_3_echo.png")
+def plot_echo(outputs, echo_cycles, echo_vals):
     cycles = np.arange(len(outputs))
     plt.figure(figsize=(14, 6))
-    
+
     # Plot all outputs
     plt.plot(cycles, outputs, 'b-', linewidth=1, alpha=0.7, label='Output')
-    
+
     # Highlight echoes
-    echo_cycles = [e[0] for e in echoes]
-    echo_vals = [e[1] for e in echoes]
     plt.scatter(echo_cycles, echo_vals, c='r', s=80, zorder=3, label='Echoes')
-    
+
     plt.axhline(y=0, color='k', linestyle='--', alpha=0.3)
     plt.xlabel('Sample Number')
     plt.ylabel('Sample Value')
-    plt.title(f'Test 3: Feedback Echo (10 sample delay, 50% feedback) - {len(echoes)} echoes found')
+    plt.title(f'Test 3: Feedback Echo (10 sample delay, 50% feedback, 50% wet) - {len(echo_cycles)} echoes found')
     plt.grid(True, alpha=0.3)
     plt.legend()
-    
+
     plt.tight_layout()
-    plot_path = Path(__file__).resolve().parent / "test_3_echo.png"
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    print(f"Plot saved to {plot_path}")
-    plt.close()
 
 
 @cocotb.test()
@@ -286,7 +300,7 @@ async def test_zero_delay(dut):
     cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
 
     # Reset
-    dut.reset.value = 1
+    dut.rst.value = 1
     dut.sample_valid.value = 0
     dut.audio_in.value = 0
     dut.delay_samples.value = 0  # Zero delay
@@ -295,7 +309,7 @@ async def test_zero_delay(dut):
     dut.mode.value = 0  # Feedforward
 
     await RisingEdge(dut.clk)
-    dut.reset.value = 0
+    dut.rst.value = 0
     await ClockCycles(dut.clk, 2)
 
     # Stream samples continuously
@@ -335,6 +349,78 @@ async def test_zero_delay(dut):
     print(f"✓ Zero delay test passed, found {len(non_zero)} non-zero outputs starting at cycle {non_zero[0][0] if non_zero else 'N/A'}")
 
 
+async def stream_against_model(dut, x, delay_samples, feedback_amount, effect_amount, mode, spacing):
+    """Stream x with one strobe every spacing clocks and compare every valid output with delay_model"""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.rst.value = 1
+    dut.sample_valid.value = 0
+    dut.audio_in.value = 0
+    dut.delay_samples.value = delay_samples
+    dut.feedback_amount.value = feedback_amount
+    dut.effect_amount.value = effect_amount
+    dut.mode.value = mode
+    # Reset does not clear the RAM; zero what this stream reads before writing it, as at power-up
+    ram = dut.delay_buf.ram_inst.BRAM
+    for address in [0] + list(range(len(ram) - delay_samples - 9, len(ram))):
+        ram[address].value = 0
+    await ClockCycles(dut.clk, 2)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+    await ClockCycles(dut.clk, 4, rising=False)  # flush the unreset dry/feedback/RAM output registers
+
+    expected = delay_model.delay_effect(x, delay_samples, feedback_amount, effect_amount, mode, spacing)
+    outputs = []
+
+    async def monitor():
+        while len(outputs) < len(x):
+            await FallingEdge(dut.clk)
+            if dut.audio_out_valid.value == 1:
+                outputs.append(dut.audio_out.value.signed_integer)
+
+    done = cocotb.start_soon(monitor())
+    for sample in x.tolist():
+        dut.audio_in.value = sample  # held until the next strobe, as the model assumes
+        dut.sample_valid.value = 1
+        await FallingEdge(dut.clk)
+        dut.sample_valid.value = 0
+        if spacing > 1:
+            await ClockCycles(dut.clk, spacing - 1, rising=False)
+    await done
+
+    outputs = np.array(outputs, dtype=np.int64)
+    mismatch = np.flatnonzero(outputs != expected)
+    assert len(mismatch) == 0, \
+        f"Sample {mismatch[0]}: DUT {outputs[mismatch[0]]}, model {expected[mismatch[0]]} ({len(mismatch)} mismatches)"
+
+
+@cocotb.test()
+async def test_model_feedforward(dut):
+    """Back-to-back full-scale noise in feedforward mode matches delay_model"""
+    x = np.random.default_rng(1).integers(-2**31, 2**31, size=800)
+    await stream_against_model(dut, x, delay_samples=37, feedback_amount=0, effect_amount=200, mode=0, spacing=1)
+
+
+@cocotb.test()
+async def test_model_feedback(dut):
+    """Back-to-back feedback with saturation matches delay_model"""
+    x = np.random.default_rng(2).integers(-2**31, 2**31, size=800)
+    await stream_against_model(dut, x, delay_samples=20, feedback_amount=230, effect_amount=100, mode=1, spacing=1)
+
+
+@cocotb.test()
+async def test_model_feedback_spaced(dut):
+    """Feedback with a strobe every 3 clocks (shorter loop in samples) matches delay_model"""
+    x = np.random.default_rng(3).integers(-2**30, 2**30, size=300)
+    await stream_against_model(dut, x, delay_samples=5, feedback_amount=255, effect_amount=255, mode=1, spacing=3)
+
+
+@cocotb.test()
+async def test_model_feedback_sparse(dut):
+    """Feedback with a strobe every 10 clocks (one-sample loop latency) matches delay_model"""
+    x = np.random.default_rng(4).integers(-2**31, 2**31, size=300)
+    await stream_against_model(dut, x, delay_samples=0, feedback_amount=128, effect_amount=0, mode=1, spacing=10)
+
+
 def test_runner():
     """Run tests using cocotb runner"""
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
@@ -349,21 +435,13 @@ def test_runner():
     ]
 
     hdl_toplevel = "delay_effect"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=["-Wall"],
         parameters={},
-        timescale=('1ns', '1ps'),
-        waves=True
-    )
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        test_args=[],
-        waves=True
+        sim=sim
     )
 
 
@@ -0,0 +1,144 @@
+import cocotb
+import os
+import sys
+from pathlib import Path
+import numpy as np
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge
+from stream_compare import StrobeRecorder, check, learn_latency
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import effect_model
+
+test_file = os.path.basename(__file__).replace(".py", "")
+
+DELAY = {"delay_num_samples": 9, "delay_feedback_amount": 200, "delay_effect_amount": 160}
+COMBINATIONS = [(0, 0), (1, 0), (0, 1), (1, 1)]
+
+
+class Chain:
+    """Drives effect_mux stream by stream, recording its input and output strobes"""
+
+    def __init__(self, dut):
+        self.dut = dut
+        cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+        self.inputs = StrobeRecorder(dut.clk, dut.sample_valid, dut.audio_in)
+        self.outputs = StrobeRecorder(dut.clk, dut.audio_out_valid, dut.audio_out)
+        cocotb.start_soon(self.inputs.run())
+        cocotb.start_soon(self.outputs.run())
+
+    async def reset(self, enable_bitcrush, enable_delay, delay, written):
+        dut = self.dut
+        dut.rst.value = 1
+        dut.sample_valid.value = 0
+        dut.audio_in.value = 0
+        dut.bit_depth.value = 31
+        dut.enable_bitcrush.value = enable_bitcrush
+        dut.enable_delay.value = enable_delay
+        dut.delay_num_samples.value = delay["delay_num_samples"]
+        dut.delay_feedback_amount.value = delay["delay_feedback_amount"]
+        dut.delay_effect_amount.value = delay["delay_effect_amount"]
+        # Reset does not clear the RAM; zero what the last stream wrote and what this one reads first
+        ram = dut.delay_inst.delay_buf.ram_inst.BRAM
+        for address in list(range(written + 2)) + list(range(len(ram) - delay["delay_num_samples"] - 9, len(ram))):
+            ram[address].value = 0
+        await ClockCycles(dut.clk, 2)
+        await FallingEdge(dut.clk)
+        dut.rst.value = 0
+        await ClockCycles(dut.clk, 4, rising=False)  # flush the delay's unreset registers
+        self.inputs.clear()
+        self.outputs.clear()
+
+    async def stream(self, x, bit_depth, enable_bitcrush, enable_delay, delay=DELAY, spacing=1):
+        """(latency in clocks, audio_out per sample) for x with one strobe every spacing clocks"""
+        await self.reset(enable_bitcrush, enable_delay, delay, written=len(x))
+        dut = self.dut
+        for sample, depth in zip(np.asarray(x).tolist(), np.broadcast_to(bit_depth, np.shape(x)).tolist()):
+            dut.audio_in.value = sample  # held until the next strobe, as delay_model assumes
+            dut.bit_depth.value = depth
+            dut.sample_valid.value = 1
+            await FallingEdge(dut.clk)
+            dut.sample_valid.value = 0
+            if spacing > 1:
+                await ClockCycles(dut.clk, spacing - 1, rising=False)
+        await self.outputs.wait_for(len(x))
+        return learn_latency(self.inputs.cycles, self.outputs.cycles), self.outputs.values[:len(x)]
+
+
+@cocotb.test()
+async def test_every_depth_every_combination(dut):
+    """Full-scale noise with bit_depth stepping through 0..31 per sample, for all four enable settings"""
+    chain = Chain(dut)
+    x = np.random.default_rng(1).integers(-2**31, 2**31, size=32 * 20)
+    depths = np.arange(len(x)) % effect_model.BIT_DEPTHS
+    actual, expected, latency = [], [], {}
+    for enable_bitcrush, enable_delay in COMBINATIONS:
+        clocks, out = await chain.stream(x, depths, enable_bitcrush, enable_delay)
+        latency[enable_bitcrush, enable_delay] = clocks
+        actual.append(out)
+        expected.append(effect_model.effect_mux(x, enable_bitcrush, enable_delay, depths, **DELAY))
+    check(expected, actual, labels=[f"bitcrush={b} delay={d}" for b, d in COMBINATIONS])
+    model_latency = {combo: int(effect_model.latency(*combo)) for combo in COMBINATIONS}
+    assert latency == model_latency, f"latency {latency}, model {model_latency}"
+    dut.log.info(f"PASS: {len(COMBINATIONS)} x {len(x)} samples, latency {latency}")
+
+
+@cocotb.test()
+async def test_sweep(dut):
+    """Every enable combination at every fixed bit_depth matches effect_model.sweep in one check"""
+    chain = Chain(dut)
+    x = np.random.default_rng(2).integers(-2**31, 2**31, size=48)
+    expected = effect_model.sweep(x, **DELAY)
+    actual = np.empty_like(expected)
+    for enable_bitcrush, enable_delay in COMBINATIONS:
+        for depth in range(effect_model.BIT_DEPTHS):
+            clocks, actual[enable_bitcrush, enable_delay, depth] = await chain.stream(
+                x, depth, enable_bitcrush, enable_delay)
+            assert clocks == effect_model.latency(enable_bitcrush, enable_delay)
+    check(expected, actual)
+    dut.log.info(f"PASS: {expected[..., 0].size} streams of {len(x)} samples")
+
+
+@cocotb.test()
+async def test_spaced_strobes(dut):
+    """Strobes every 3 clocks through the feedback delay still match the model"""
+    chain = Chain(dut)
+    x = np.random.default_rng(3).integers(-2**30, 2**30, size=200)
+    depths = np.random.default_rng(4).integers(0, effect_model.BIT_DEPTHS, size=len(x))
+    delay = {"delay_num_samples": 4, "delay_feedback_amount": 255, "delay_effect_amount": 255}
+    clocks, out = await chain.stream(x, depths, 1, 1, delay, spacing=3)
+    check(effect_model.effect_mux(x, 1, 1, depths, spacing=3, **delay)[None], out[None])
+    assert clocks == effect_model.latency(1, 1)
+
+
+def test_runner():
+    """Simulate effect_mux using the Python runner."""
+    from sim_runner import run_testbench
+
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")
+    proj_path = Path(__file__).resolve().parent.parent
+    sys.path.append(str(proj_path / "sim" / "model"))
+
+    sources = [
+        proj_path / "hdl" / "xilinx_true_dual_port_read_first_2_clock_ram.v",
+        proj_path / "hdl" / "variable_delay_buffer.sv",
+        proj_path / "hdl" / "delay_effect.sv",
+        proj_path / "hdl" / "bitcrush_effect.sv",
+        proj_path / "hdl" / "bypass_effect.sv",
+        proj_path / "hdl" / "effect_mux.sv",
+    ]
+    hdl_toplevel = "effect_mux"
+
+    run_testbench(
+        test_file=test_file,
+        hdl_toplevel=hdl_toplevel,
+        sources=sources,
+        build_args=["-Wall"],
+        parameters={},
+        sim=sim
+    )
+
+
+if __name__ == "__main__":
+    test_runner()
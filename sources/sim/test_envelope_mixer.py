@@ -6,10 +6,15 @@ import matplotlib.pyplot as plt
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 
 test_file = os.path.basename(__file__).replace(".py", "")
 
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import adsr_model
+from pulse_sync import wait_for_pulse, wait_n_pulses
+
 # 440 Hz sine wave samples at 100MHz clock (10ns per sample)
 # Period = 1/440 = 2.27ms, so we need samples at 100MHz
 # Generate 1 cycle worth of samples
@@ -19,29 +24,43 @@ SINE_LUT = [
 ]  # ~2.26us per cycle at 100MHz
 
 
-async def wait_for_pulse(dut, timeout_cycles=150_000):
-    """Wait for the ms_pulse to go high, with timeout"""
-    cycle_count = 0
-    pulse_seen = False
-    for _ in range(timeout_cycles):
-        if dut.ms_pulse.value == 1:
-            pulse_seen = True
-            break
-        await RisingEdge(dut.clk)
-        cycle_count += 1
+@deferred_plot("envelope_mixer_plot.png")
+def plot_envelope_mixer(time_ms, all_envelope, all_audio_out):
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(16, 12))
 
-    if not pulse_seen:
-        raise AssertionError(f"Timeout waiting for ms_pulse after {cycle_count} cycles")
+    # Envelope samples are at the checked pulses
+    envelope_time = np.concatenate(([0], time_ms))
 
-    # Wait for pulse to go back low
-    while dut.ms_pulse.value == 1:
-        await RisingEdge(dut.clk)
+    # Plot envelope
+    ax1.plot(envelope_time, all_envelope, 'b-', linewidth=2, marker='o', markersize=3)
+    ax1.set_xlabel('Time (ms)', fontsize=12)
+    ax1.set_ylabel('Envelope Value', fontsize=12)
+    ax1.set_title('ADSR Envelope (50ms Attack, 100ms Decay, 70% Sustain, 150ms Release)',
+                  fontsize=14, fontweight='bold')
+    ax1.grid(True, alpha=0.3)
+    ax1.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
+    ax1.legend(fontsize=11)
 
+    # Plot raw audio signal (440 Hz sine wave input)
+    ax2.plot(time_ms, all_audio_out, 'gray', linewidth=0.5, alpha=0.7)
+    ax2.set_xlabel('Time (ms)', fontsize=12)
+    ax2.set_ylabel('Raw Audio Input (440Hz Sine)', fontsize=12)
+    ax2.set_title('Input: 440 Hz Sine Wave', fontsize=14, fontweight='bold')
+    ax2.grid(True, alpha=0.3)
+    ax2.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
+    ax2.legend(fontsize=11)
 
-async def wait_n_pulses(dut, n_pulses, timeout_per_pulse=150_000):
-    """Wait for n millisecond pulses"""
-    for i in range(n_pulses):
-        await wait_for_pulse(dut, timeout_per_pulse)
+    # Plot modulated audio output
+    ax3.plot(time_ms, all_audio_out, 'g-', linewidth=0.8)
+    ax3.set_xlabel('Time (ms)', fontsize=12)
+    ax3.set_ylabel('Audio Output (Envelope-Modulated)', fontsize=12)
+    ax3.set_title('Output: 440 Hz Sine Wave After Envelope Mixer',
+                  fontsize=14, fontweight='bold')
+    ax3.grid(True, alpha=0.3)
+    ax3.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
+    ax3.legend(fontsize=11)
+
+    plt.tight_layout()
 
 
 @cocotb.test()
@@ -67,8 +86,13 @@ async def test_envelope_mixer_basic(dut):
     initial_envelope = dut.envelope_out.value.integer
     assert initial_envelope == 0, f"Expected initial envelope 0, got {initial_envelope}"
 
+    # Expected envelope for every pulse: note on before pulse 1, note off before pulse 251
+    note_events = [(1, 1), (251, 0)]
+    num_pulses = 401
+    expected = adsr_model.adsr_envelope(50, 100, 70, 150, note_events, num_pulses)
+
     # Collect all values for plotting
-    all_envelope = []
+    all_envelope = [initial_envelope]
     all_audio_out = []
     time_ms = []
     sine_index = 0
@@ -77,59 +101,35 @@ async def test_envelope_mixer_basic(dut):
     dut.note_on.value = 1
 
     print("Collecting samples...")
-
-    # Collect samples until we have 400 milliseconds of envelope data
-    pulse_count = 0
-    while pulse_count < 400:
-        # Feed in continuous sine wave samples
+    # Skip ahead 5 pulses at a time and check one mixed sample after each stop
+    pulse = 0
+    while pulse < num_pulses - 1:
+        step = min(5, num_pulses - 1 - pulse)
+        if pulse < 250 < pulse + step:
+            step = 250 - pulse
+        await wait_n_pulses(dut, step)
+        pulse += step
+        if pulse == 250:
+            print(f"Sustain complete, triggering note off at {pulse}ms")
+            dut.note_on.value = 0
+
+        # Feed one sine sample; audio_out registers audio_in * envelope on the next edge
         audio_sample = int(SINE_LUT[sine_index % len(SINE_LUT)])
-        sine_index += 1
+        sine_index += 37
         dut.audio_in.value = audio_sample
-
-        await RisingEdge(dut.clk)
-
-        # Collect audio output every cycle
-        try:
-            audio_out_val = dut.audio_out.value.signed_integer
-            all_audio_out.append(audio_out_val)
-            time_ms_val = pulse_count + (sine_index % len(SINE_LUT)) / len(SINE_LUT)
-            time_ms.append(time_ms_val)
-        except ValueError:
-            # Skip undefined values
-            pass
-
-        # Detect ms_pulse rising edge to collect envelope data
-        if dut.ms_pulse.value == 1:
-            pulse_count += 1
-            try:
-                envelope_val = dut.envelope_out.value.integer
-                all_envelope.append(envelope_val)
-            except ValueError:
-                all_envelope.append(0)
-
-            if pulse_count == 50:
-                print(f"Attack complete at {pulse_count}ms")
-            elif pulse_count == 150:
-                print(f"Decay complete at {pulse_count}ms")
-            elif pulse_count == 250:
-                print(f"Sustain complete, triggering note off at {pulse_count}ms")
-                dut.note_on.value = 0
-            elif pulse_count == 400:
-                print(f"Release complete at {pulse_count}ms")
-
-            # Wait for pulse to go low
-            while dut.ms_pulse.value == 1:
-                audio_sample = int(SINE_LUT[sine_index % len(SINE_LUT)])
-                sine_index += 1
-                dut.audio_in.value = audio_sample
-                await RisingEdge(dut.clk)
-                try:
-                    audio_out_val = dut.audio_out.value.signed_integer
-                    all_audio_out.append(audio_out_val)
-                    time_ms_val = pulse_count + (sine_index % len(SINE_LUT)) / len(SINE_LUT)
-                    time_ms.append(time_ms_val)
-                except ValueError:
-                    pass
+        await FallingEdge(dut.clk)
+        envelope_val = dut.envelope_out.value.integer
+        await FallingEdge(dut.clk)
+        audio_out_val = dut.audio_out.value.signed_integer
+        assert envelope_val == expected[pulse], \
+            f"Pulse {pulse}: envelope {envelope_val}, model expected {int(expected[pulse])}"
+        # product[62:31] of the signed 64-bit product
+        expected_audio = (audio_sample * int(expected[pulse])) >> 31
+        assert audio_out_val == expected_audio, \
+            f"Pulse {pulse}: audio_out {audio_out_val}, expected {expected_audio}"
+        all_envelope.append(envelope_val)
+        all_audio_out.append(audio_out_val)
+        time_ms.append(pulse)
 
     # Plot results
     if not all_audio_out or not all_envelope:
@@ -138,48 +138,7 @@ async def test_envelope_mixer_basic(dut):
 
     print(f"Collected {len(all_audio_out)} audio samples and {len(all_envelope)} envelope samples")
 
-    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(16, 12))
-
-    # Create envelope plot with proper time mapping
-    # Envelope samples are at millisecond boundaries
-    envelope_time = list(range(len(all_envelope)))
-
-    # Plot envelope
-    ax1.plot(envelope_time, all_envelope, 'b-', linewidth=2, marker='o', markersize=3)
-    ax1.set_xlabel('Time (ms)', fontsize=12)
-    ax1.set_ylabel('Envelope Value', fontsize=12)
-    ax1.set_title('ADSR Envelope (50ms Attack, 100ms Decay, 70% Sustain, 150ms Release)',
-                  fontsize=14, fontweight='bold')
-    ax1.grid(True, alpha=0.3)
-    ax1.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
-    ax1.legend(fontsize=11)
-
-    # Plot raw audio signal (440 Hz sine wave input)
-    ax2.plot(time_ms, all_audio_out, 'gray', linewidth=0.5, alpha=0.7)
-    ax2.set_xlabel('Time (ms)', fontsize=12)
-    ax2.set_ylabel('Raw Audio Input (440Hz Sine)', fontsize=12)
-    ax2.set_title('Input: 440 Hz Sine Wave', fontsize=14, fontweight='bold')
-    ax2.grid(True, alpha=0.3)
-    ax2.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
-    ax2.legend(fontsize=11)
-
-    # Plot modulated audio output
-    ax3.plot(time_ms, all_audio_out, 'g-', linewidth=0.8)
-    ax3.set_xlabel('Time (ms)', fontsize=12)
-    ax3.set_ylabel('Audio Output (Envelope-Modulated)', fontsize=12)
-    ax3.set_title('Output: 440 Hz Sine Wave After Envelope Mixer',
-                  fontsize=14, fontweight='bold')
-    ax3.grid(True, alpha=0.3)
-    ax3.axvline(x=250, color='r', linestyle='--', linewidth=2, label='Note Off')
-    ax3.legend(fontsize=11)
-
-    plt.tight_layout()
-
-    # Save plot
-    plot_path = Path(__file__).resolve().parent / "envelope_mixer_plot.png"
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    print(f"Envelope mixer plot saved to {plot_path}")
-    plt.show()
+    plot_envelope_mixer(time_ms=time_ms, all_envelope=all_envelope, all_audio_out=all_audio_out)
 
     print("Test completed successfully!")
 
@@ -199,22 +158,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     sys.path.append(str(proj_path / "sim"))
     hdl_toplevel = "envelope_mixer_tb"
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters={},
-        timescale=('1ns', '1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
 
 
@@ -4,6 +4,8 @@ import sys
 from pathlib import Path
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
+import numpy as np
+from axis import AxisSink, AxisSource, cycle_pattern, frame_last
 
 test_file = os.path.basename(__file__).replace(".py","")
 
@@ -216,9 +218,39 @@ async def test_fft_bin_filter_edge_cases(dut):
     dut.log.info("Edge cases test passed!")
 
 
+async def stream_frames(dut, valid_pattern=None, frames=3, seed=0):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.rst.value = 1
+    dut.fft_data.value = 0
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+    bins = np.random.default_rng(seed).integers(0, 2**32, size=(frames, 1024))
+    source = AxisSource(dut.clk, dut.fft_data, dut.fft_valid, dut.fft_last, valid_pattern=valid_pattern)
+    sink = AxisSink(dut.clk, dut.out_data, dut.out_valid, dut.out_last)
+    cocotb.start_soon(source.send(bins.ravel(), last=1024))
+    data, last = await sink.collect(frames * 512)
+
+    assert np.array_equal(data, bins[:, :512].ravel()), "Output is not the first 512 bins of every frame"
+    assert np.array_equal(last, frame_last(frames * 512, 512)), "out_last not on bin 511"
+
+
+@cocotb.test()
+async def test_fft_bin_filter_full_rate(dut):
+    """Three frames back to back at one bin per clock"""
+    await stream_frames(dut)
+
+
+@cocotb.test()
+async def test_fft_bin_filter_throttled(dut):
+    """Three frames with a repeating valid gap pattern"""
+    await stream_frames(dut, valid_pattern=cycle_pattern([1, 1, 0, 1, 0, 0]), seed=1)
+
+
 def test_runner():
     """Simulate the FFT bin filter using the Python runner."""
-    from cocotb.runner import get_runner
+    from sim_runner import run_testbench
 
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")
@@ -230,22 +262,13 @@ def test_runner():
     build_test_args = ["-Wall"]
     parameters = {}
 
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters=parameters,
-        timescale=('1ns','1ps'),
-        waves=True
-    )
-
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        test_args=[],
-        waves=True
+        sim=sim
     )
 
 if __name__ == "__main__":
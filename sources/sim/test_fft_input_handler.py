@@ -3,8 +3,9 @@ import os
 import sys
 from pathlib import Path
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, FallingEdge, Timer
+from cocotb.triggers import RisingEdge, FallingEdge, Timer, ClockCycles
 import numpy as np
+from axis import AxisSink, AxisSource, frame_last, random_pattern
 
 test_file = os.path.basename(__file__).replace(".py","")
 
@@ -227,9 +228,59 @@ async def test_fft_input_handler_sine_wave(dut):
     dut.log.info("Sine wave test passed!")
 
 
+async def reset_full_rate(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.rst.value = 1
+    dut.audio_in.value = 0
+    dut.audio_valid.value = 0
+    dut.m_axis_tready.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+
+@cocotb.test()
+async def test_fft_input_handler_full_rate(dut):
+    """Three back-to-back frames at one sample per clock"""
+    await reset_full_rate(dut)
+    audio = np.random.default_rng(3).integers(-2**31, 2**31, size=3 * 1024)
+    source = AxisSource(dut.clk, dut.audio_in, dut.audio_valid)
+    sink = AxisSink(dut.clk, dut.m_axis_tdata, dut.m_axis_tvalid, dut.m_axis_tlast, dut.m_axis_tready)
+
+    cocotb.start_soon(source.send(audio))
+    data, last = await sink.collect(len(audio))
+
+    assert np.array_equal(data, (audio >> 16) & 0xFFFF), "m_axis_tdata is not audio_in >>> 16"
+    assert np.array_equal(last, frame_last(len(audio), 1024)), \
+        f"tlast at beats {np.flatnonzero(last).tolist()}, expected every 1024th"
+    assert sink.cycles <= len(audio) + 1, f"{len(audio)} beats took {sink.cycles} clocks"
+
+
+@cocotb.test(expect_fail=True)
+async def test_fft_input_handler_tready_throttled(dut):
+    """Random tready: every sample should still reach the sink.
+
+    Expected to fail: the handler registers audio_valid straight into tvalid
+    and never holds a beat while tready is low, so throttled beats are lost.
+    """
+    await reset_full_rate(dut)
+    audio = np.random.default_rng(4).integers(-2**31, 2**31, size=1024)
+    source = AxisSource(dut.clk, dut.audio_in, dut.audio_valid)
+    sink = AxisSink(dut.clk, dut.m_axis_tdata, dut.m_axis_tvalid, dut.m_axis_tlast, dut.m_axis_tready,
+                    ready_pattern=random_pattern(0.7, seed=4))
+
+    collect = cocotb.start_soon(sink.collect(len(audio)))
+    await source.send(audio)
+    await ClockCycles(dut.clk, 4)
+    assert collect.done(), "Beats were dropped while tready was low"
+    data, last = collect.result()
+    assert np.array_equal(data, (audio >> 16) & 0xFFFF)
+    assert last[-1] and not last[:-1].any()
+
+
 def test_runner():
     """Simulate the FFT input handler using the Python runner."""
-    from cocotb.runner import get_runner
+    from sim_runner import run_testbench
 
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")
@@ -245,22 +296,13 @@ def test_runner():
         "FFT_SIZE": 1024
     }
 
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters=parameters,
-        timescale=('1ns','1ps'),
-        waves=True
-    )
-
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        test_args=[],
-        waves=True
+        sim=sim
     )
 
 if __name__ == "__main__":
@@ -4,6 +4,8 @@ import sys
 from pathlib import Path
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
+import numpy as np
+from axis import AxisSink, AxisSource, frame_last, random_pattern
 
 test_file = os.path.basename(__file__).replace(".py","")
 
@@ -107,9 +109,50 @@ async def test_fft_magnitude(dut):
     dut.log.info("All tests passed!")
 
 
+def pack_re_im(re, im):
+    """{im, re} 16-bit pairs as s_axis_tdata words"""
+    return ((im & 0xFFFF) << 16) | (re & 0xFFFF)
+
+
+async def stream_magnitudes(dut, valid_pattern=None, frames=2, frame_size=256, seed=0):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+    rng = np.random.default_rng(seed)
+    re, im = rng.integers(-2**15, 2**15, size=(2, frames * frame_size))
+    source = AxisSource(dut.clk, dut.s_axis_tdata, dut.s_axis_tvalid, dut.s_axis_tlast,
+                        dut.s_axis_tready, valid_pattern=valid_pattern)
+    sink = AxisSink(dut.clk, dut.mag_squared, dut.mag_valid, dut.mag_last)
+    cocotb.start_soon(source.send(pack_re_im(re, im), last=frame_size))
+    mag, last = await sink.collect(len(re))
+
+    expected = (re * re + im * im) & 0xFFFFFFFF
+    mismatch = np.flatnonzero(mag != expected)
+    assert len(mismatch) == 0, \
+        f"Beat {mismatch[0]}: re={re[mismatch[0]]} im={im[mismatch[0]]} mag_squared={mag[mismatch[0]]}"
+    assert np.array_equal(last, frame_last(len(re), frame_size)), "mag_last not on the frame ends"
+    return sink
+
+
+@cocotb.test()
+async def test_fft_magnitude_full_rate(dut):
+    """Random bins at one beat per clock, including -32768 components"""
+    sink = await stream_magnitudes(dut)
+    assert sink.cycles <= 2 * 256 + 2, f"512 beats took {sink.cycles} clocks"
+
+
+@cocotb.test()
+async def test_fft_magnitude_gaps(dut):
+    """Random idle cycles between beats"""
+    await stream_magnitudes(dut, valid_pattern=random_pattern(0.6, seed=5), seed=5)
+
+
 def test_runner():
     """Simulate the FFT magnitude using the Python runner."""
-    from cocotb.runner import get_runner
+    from sim_runner import run_testbench
 
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")
@@ -121,22 +164,13 @@ def test_runner():
     build_test_args = ["-Wall"]
     parameters = {"DATA_WIDTH": 16}
 
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters=parameters,
-        timescale=('1ns','1ps'),
-        waves=True
-    )
-
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        test_args=[],
-        waves=True
+        sim=sim
     )
 
 if __name__ == "__main__":
@@ -6,18 +6,27 @@ import logging
 from pathlib import Path
 from cocotb.triggers import Timer, ClockCycles, RisingEdge, FallingEdge, ReadOnly,with_timeout, First, Join, ReadWrite, Edge
 from cocotb.utils import get_sim_time as gst
-from cocotb.runner import get_runner
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
 from cocotb.clock import Clock
 import numpy as np
 
-from scipy.signal import lfilter
 from matplotlib import pyplot as plt
+from axis import AxisSink, AxisSource, random_pattern
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import fir_model
 
 
  
 #cheap way to get the name of current file for runner:
 test_file = os.path.basename(__file__).replace(".py","")
 
+# Samples for test_fir_full_rate; raise for long runs, e.g. FIR_SAMPLES=500000
+FIR_SAMPLES = int(os.getenv("FIR_SAMPLES", "20000"))
+# Samples compared per block, bounding memory on long runs
+CHUNK = 1 << 14
+
 
 
 def generate_signed_8bit_sine_waves(sample_rate, duration,frequencies, amplitudes):
@@ -58,6 +67,61 @@ async def reset(rst_wire):
     rst_wire.value = 0
 
 
+@deferred_plot("fir_output.png")
+def plot_fir(t, si, model_output, filtered_signal):
+    plt.figure()
+    plt.subplot(3,1,1)
+    plt.plot(t, si)
+    plt.title("Input Signal")
+    plt.xlabel("Time [s]")
+    plt.ylabel("Amplitude")
+    plt.grid()
+    plt.subplot(3,1,2)
+    plt.plot(t, model_output)
+    plt.title("FIR Filter Output (Model)")
+    plt.xlabel("Time [s]")
+    plt.ylabel("Amplitude")
+    plt.grid()
+    plt.subplot(3,1,3)
+    plt.plot(t, filtered_signal)
+    plt.title("FIR Filter Output (HDL)")
+    plt.xlabel("Time [s]")
+    plt.ylabel("Amplitude")
+    plt.grid()
+    plt.tight_layout()
+
+
+async def start(dut, coeffs):
+    """Clock, reset and load every tap with one packed write to coeffs"""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.data_in_valid.value = 0
+    dut.data_in.value = 0
+    dut.coeffs.value = fir_model.pack_coeffs(coeffs)
+    await reset(dut.rst)
+    await FallingEdge(dut.clk)
+
+
+def random_taps(seed, num_coeffs=fir_model.NUM_COEFFS):
+    return np.random.default_rng(seed).integers(-2**15, 2**15, size=num_coeffs)
+
+
+async def stream_against_model(dut, coeffs, x, valid_pattern=None, chunk=CHUNK):
+    """Push x through the DUT a chunk at a time and compare every output with fir_model"""
+    model = fir_model.FirModel(coeffs)
+    source = AxisSource(dut.clk, dut.data_in, dut.data_in_valid, valid_pattern=valid_pattern)
+    sink = AxisSink(dut.clk, dut.data_out, dut.data_out_valid, signed=True)
+    for start_index in range(0, len(x), chunk):
+        block = x[start_index:start_index + chunk]
+        cocotb.start_soon(source.send(block))
+        outputs, _ = await sink.collect(len(block))
+        expected = model.process(block)
+        mismatch = np.flatnonzero(outputs != expected)
+        assert len(mismatch) == 0, \
+            f"Sample {start_index + mismatch[0]}: DUT {outputs[mismatch[0]]}, model {expected[mismatch[0]]} " \
+            f"({len(mismatch)} mismatches in this chunk)"
+    return source.cycles
+
+
 @cocotb.test()
 async def fir_test(dut):
     #time and signal input:
@@ -65,6 +129,7 @@ async def fir_test(dut):
     coeffs = [-2,-3,-4,0,9,21,32,36,32,21,9,0,-4,-3,-2]
     #coeffs = [-3,14,-20,6,16,-5,-41,68,-41,-5,16,6,-20,14,-3]
     coeffs = [0,0,0,0,0,0,0,0,0,0,0,0,0,-4,4]
+    coeffs = coeffs + [0] * (fir_model.NUM_COEFFS - len(coeffs))
 
     #coeffs = [1] + [0]*(NUM_COEFFS-1)
     t,si = generate_signed_8bit_sine_waves(
@@ -76,12 +141,7 @@ async def fir_test(dut):
 
 
     filtered_signal = np.zeros(len(si))
-    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
-    await reset(dut.rst)
-    for i in range(15):
-        for b in range(8):
-            dut.coeffs[b+8*i].value = (coeffs[i]>>b)&0x1 
-    await Timer(10,units="ns")
+    await start(dut, coeffs)
     for i in range(len(si)):
         await FallingEdge(dut.clk)
 
@@ -95,75 +155,74 @@ async def fir_test(dut):
         dut.data_in_valid.value = 0
         await Timer(20, units="ns")
         #print(f"At time {gst(units='ns')} ns, input {si[i]} output {dut.sample_out.value}")
-    model_output = lfilter(coeffs, [1.0], si)
-    
+    model_output = fir_model.fir(si, coeffs)
+    mismatch = np.flatnonzero(filtered_signal != model_output)
+    assert len(mismatch) == 0, \
+        f"Sample {mismatch[0]}: DUT {filtered_signal[mismatch[0]]}, model {model_output[mismatch[0]]}"
 
-    plt.figure()
-    plt.subplot(3,1,1)
-    plt.plot(t, si)
-    plt.title("Input Signal")
-    plt.xlabel("Time [s]")
-    plt.ylabel("Amplitude")
-    plt.grid()
-    plt.subplot(3,1,2)
-    plt.plot(t, model_output)
-    plt.title("FIR Filter Output (Model)")
-    plt.xlabel("Time [s]")
-    plt.ylabel("Amplitude")
-    plt.grid()
-    plt.subplot(3,1,3)
-    plt.plot(t, filtered_signal)
-    plt.title("FIR Filter Output (HDL)")
-    plt.xlabel("Time [s]")
-    plt.ylabel("Amplitude")
-    plt.grid()
-    plt.tight_layout()
-    plt.show()
-    plt.savefig("fir_output.png")
+    plot_fir(t=t, si=si, model_output=model_output, filtered_signal=filtered_signal)
 
 
+@cocotb.test()
+async def test_fir_full_rate(dut):
+    """Full-scale noise through 64 random taps, one sample per clock (FIR_SAMPLES samples)"""
+    coeffs = random_taps(1)
+    await start(dut, coeffs)
+    x = np.random.default_rng(2).integers(-2**31, 2**31, size=FIR_SAMPLES)
+    cycles = await stream_against_model(dut, coeffs, x)
+    dut._log.info(f"{len(x)} samples in {cycles} clocks")
+
+
+@cocotb.test()
+async def test_fir_gaps(dut):
+    """Random gaps between strobes: the sums hold and the output still matches the model"""
+    coeffs = random_taps(3)
+    await start(dut, coeffs)
+    x = np.random.default_rng(4).integers(-2**31, 2**31, size=4000)
+    await stream_against_model(dut, coeffs, x, valid_pattern=random_pattern(0.3, seed=5))
+
+
+@cocotb.test()
+async def test_fir_impulse(dut):
+    """An impulse reads the taps back in order, including the extremes of Q1.15"""
+    coeffs = random_taps(6)
+    coeffs[:2] = [-2**15, 2**15 - 1]
+    await start(dut, coeffs)
+    x = np.zeros(2 * len(coeffs), dtype=np.int64)
+    x[0] = 1
+    await stream_against_model(dut, coeffs, x)
+
 
 
 
-    
 
 
 
-    
-    
- 
 """the code below should largely remain unchanged in structure, though the specific files and things
 specified should get updated for different simulations.
 """
 
-def spi_tx_runner():
-    """Simulate the led_controller using the Python runner."""
+def test_runner():
+    """Simulate audio_fir using the Python runner."""
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")
     proj_path = Path(__file__).resolve().parent.parent
     sys.path.append(str(proj_path / "sim" / "model"))
     sources = [proj_path / "hdl" / "audio_fir.sv"] #grow/modify this as needed.
-    hdl_toplevel = "fir_15"
+    hdl_toplevel = "audio_fir"
     build_test_args = ["-Wall"]#,"COCOTB_RESOLVE_X=ZEROS"]
     parameters = {} #!!!change these to do different versions
     sys.path.append(str(proj_path / "sim"))
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_test_args = []
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters=parameters,
-        timescale = ('1ns','1ps'),
-        waves=True
-    )
-    run_test_args = []
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
         test_args=run_test_args,
-        waves=True
+        sim=sim
     )
  
 if __name__ == "__main__":
-    spi_tx_runner()
\ No newline at end of file
+    test_runner()
\ No newline at end of file
@@ -4,6 +4,11 @@ import sys
 from pathlib import Path
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
+import numpy as np
+from axis import AxisSink, AxisSource, frame_last
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import log_scale_model
 
 test_file = os.path.basename(__file__).replace(".py","")
 
@@ -138,9 +143,74 @@ async def test_log_scale(dut):
     dut.log.info("All tests passed!")
 
 
+@cocotb.test()
+async def test_log_scale_full_rate(dut):
+    """Magnitudes of every bit length at one per clock"""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+    rng = np.random.default_rng(6)
+    mag = rng.integers(0, 2**32, size=4096) >> rng.integers(0, 33, size=4096)
+    source = AxisSource(dut.clk, dut.mag_squared, dut.mag_valid, dut.mag_last)
+    sink = AxisSink(dut.clk, dut.log_out, dut.log_valid, dut.log_last)
+    cocotb.start_soon(source.send(mag, last=512))
+    log_out, last = await sink.collect(len(mag))
+
+    expected = log_scale_model.log_scale(mag)
+    mismatch = np.flatnonzero(log_out != expected)
+    assert len(mismatch) == 0, \
+        f"mag_squared=0x{mag[mismatch[0]]:08X}: log_out=0x{log_out[mismatch[0]]:02X} " \
+        f"(expected 0x{expected[mismatch[0]]:02X}, {len(mismatch)} mismatches)"
+    assert np.array_equal(last, frame_last(len(mag), 512)), "log_last not on the frame ends"
+    assert sink.cycles <= len(mag) + 2, f"{len(mag)} beats took {sink.cycles} clocks"
+
+
+# test_log_scale_bulk streams LOG_SCALE_COUNT stratified magnitudes (boundaries plus
+# random values per bit length) by default. LOG_SCALE_VALUES=exhaustive covers all 2^32
+# instead; LOG_SCALE_SHARD=i/n runs only shard i of n, so the range can be split over jobs.
+CHUNK = 1 << 16
+
+
+def magnitude_chunks():
+    shard, shards = (int(n) for n in os.getenv("LOG_SCALE_SHARD", "0/1").split("/"))
+    if os.getenv("LOG_SCALE_VALUES", "stratified") == "exhaustive":
+        yield from log_scale_model.exhaustive_magnitudes(shard, shards, CHUNK)
+        return
+    values = log_scale_model.stratified_magnitudes(int(os.getenv("LOG_SCALE_COUNT", 20000)))[shard::shards]
+    for start in range(0, len(values), CHUNK):
+        yield values[start:start + CHUNK]
+
+
+@cocotb.test()
+async def test_log_scale_bulk(dut):
+    """Stream magnitudes at one per clock and compare each chunk with log_scale_model"""
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+
+    source = AxisSource(dut.clk, dut.mag_squared, dut.mag_valid, dut.mag_last)
+    sink = AxisSink(dut.clk, dut.log_out, dut.log_valid, dut.log_last)
+    checked = 0
+    for mag in magnitude_chunks():
+        cocotb.start_soon(source.send(mag))
+        log_out, _ = await sink.collect(len(mag))
+        expected = log_scale_model.log_scale(mag)
+        mismatch = np.flatnonzero(log_out != expected)
+        assert len(mismatch) == 0, \
+            f"Value {checked + mismatch[0]}: mag_squared=0x{mag[mismatch[0]]:08X} log_out=0x{log_out[mismatch[0]]:02X} " \
+            f"(expected 0x{expected[mismatch[0]]:02X}, {len(mismatch)} mismatches in this chunk)"
+        checked += len(mag)
+    dut.log.info(f"PASS: {checked} magnitudes match log_scale_model")
+
+
 def test_runner():
     """Simulate the log scale using the Python runner."""
-    from cocotb.runner import get_runner
+    from sim_runner import run_testbench
 
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")
@@ -151,23 +221,22 @@ def test_runner():
     hdl_toplevel = "log_scale"
     build_test_args = ["-Wall"]
     parameters = {}
-
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    # Shards get their own results directory so several can run at once
+    shard = os.getenv("LOG_SCALE_SHARD")
+    test_dir = None
+    if shard:
+        from sim_runner import SIM_BUILD_DIR
+        test_dir = SIM_BUILD_DIR / f"log_scale_shard_{shard.replace('/', '_of_')}"
+        test_dir.mkdir(parents=True, exist_ok=True)
+
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters=parameters,
-        timescale=('1ns','1ps'),
-        waves=True
-    )
-
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        test_args=[],
-        waves=True
+        sim=sim,
+        test_dir=test_dir
     )
 
 if __name__ == "__main__":
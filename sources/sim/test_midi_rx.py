@@ -0,0 +1,159 @@
+import itertools
+import os
+import random
+import sys
+from pathlib import Path
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge
+from sim_runner import run_testbench
+from midi_driver import MidiDriver, UartFramer, note_on, note_off, program_change
+from midi_file import midi_messages, VoiceMonitor
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import midi_rx_model
+
+test_file = os.path.basename(__file__).replace(".py", "")
+
+# Random messages test_note_stream adds after the directed ones, e.g. MIDI_RX_MESSAGES=100.
+# Every three-byte message is about 96000 clocks of UART, so they are not cheap.
+NUM_MESSAGES = int(os.getenv("MIDI_RX_MESSAGES", "0"))
+
+
+class VoiceChecker:
+    """on_message callback: feeds each message to midi_rx_model and compares the DUT's voices with it.
+
+    The DUT decodes a byte in the middle of its stop bit, so at the end of
+    the stop bit (when MidiDriver calls back) on_out, note_out and wave_out
+    already hold the message's result.
+    """
+
+    def __init__(self, dut, running_status=False):
+        self.dut = dut
+        self.model = midi_rx_model.MidiRx(len(dut.on_out))
+        self.framer = UartFramer(running_status=running_status)
+        self.monitor = VoiceMonitor(dut.on_out, num_voices=len(dut.on_out), notes=dut.note_out)
+        self.messages = 0
+        self.dropped = 0
+        self.mismatches = []
+
+    def __call__(self, time_ns, data):
+        full = self.model.free_voice() is None
+        self.model.send(self.framer.message_bytes(data))
+        if data[0] & 0xF0 == 0x90 and full:
+            self.dropped += 1
+        self.monitor(time_ns, data)
+        actual = (self.dut.on_out.value.integer, self.dut.note_out.value.integer, self.dut.wave_out.value.integer)
+        expected = (self.model.on_out, self.model.note_out, self.model.wave)
+        if actual != expected:
+            self.mismatches.append((self.messages, list(data), actual, expected))
+        self.messages += 1
+
+    def check(self):
+        assert self.messages > 0, "No messages were sent"
+        if self.mismatches:
+            index, data, actual, expected = self.mismatches[0]
+            raise AssertionError(
+                f"{len(self.mismatches)} of {self.messages} messages left the wrong voice state; first is "
+                f"message {index} {[hex(b) for b in data]}: DUT on_out=0x{actual[0]:04x} wave_out={actual[2]}, "
+                f"model on_out=0x{expected[0]:04x} wave_out={expected[2]}"
+                + ("" if actual[1] == expected[1] else " (note_out differs)"))
+        report = self.monitor.report()
+        assert report["dropped"] == self.dropped, f"VoiceMonitor saw {report['dropped']} drops, model {self.dropped}"
+        assert report["steals"] == 0, "midi_rx never steals a voice"
+
+
+async def reset(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+    midi = MidiDriver(dut.data_in)
+    dut.rst.value = 1
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.rst.value = 0
+    await FallingEdge(dut.clk)
+    return midi
+
+
+def directed_messages():
+    """Fill every voice midi_rx hands out, overflow it, then free and reuse voices"""
+    yield None, program_change(2)
+    for note in range(60, 60 + midi_rx_model.ALLOCATABLE):
+        yield None, note_on(note, 100)
+    yield None, note_on(90, 100)  # no free voice: dropped
+    yield None, note_off(62)
+    yield None, note_on(60, 40)  # takes voice 2, so note 60 now plays twice
+    yield None, note_off(60)  # frees both
+    yield None, program_change(1)
+
+
+def random_messages(count, seed=0):
+    """Note ons and offs from a small pool of notes (so offs find their voices), some program changes"""
+    rng = random.Random(seed)
+    held = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            data = program_change(rng.randrange(4))
+        elif roll < 0.6 or not held:
+            note = rng.randrange(48, 72)
+            held.append(note)
+            data = note_on(note, rng.randrange(1, 128))
+        else:
+            data = note_off(held.pop(rng.randrange(len(held))))
+        yield None, data
+
+
+@cocotb.test()
+async def test_note_stream(dut):
+    """Note on/off and program change messages leave on_out, note_out and wave_out as the model says"""
+    midi = await reset(dut)
+    checker = VoiceChecker(dut)
+    messages = itertools.chain(directed_messages(), random_messages(NUM_MESSAGES, seed=NUM_MESSAGES))
+    await midi.send(messages, on_message=checker)
+    dut._log.info(f"{checker.messages} messages: {checker.monitor.report()}")
+    checker.check()
+    assert checker.monitor.max_polyphony == midi_rx_model.ALLOCATABLE, "stream never filled every voice"
+    assert checker.dropped >= 1, "stream never overflowed the voices"
+
+
+@cocotb.test(skip=os.getenv("MIDI_FILE") is None)
+async def test_midi_file(dut):
+    """Play a Standard MIDI File (MIDI_FILE) into midi_rx and check its voices after every message.
+
+    MIDI_TIME_SCALE compresses the song (default 0.01), MIDI_MAX_MESSAGES
+    caps how much of it is played (default: all of it) and MIDI_RUNNING_STATUS=1
+    sends with running status, which midi_rx does not decode (the model
+    reproduces what it does instead).
+    """
+    midi = await reset(dut)
+    max_messages = os.getenv("MIDI_MAX_MESSAGES")
+    messages = midi_messages(
+        os.getenv("MIDI_FILE"),
+        time_scale=float(os.getenv("MIDI_TIME_SCALE", "0.01")),
+        max_messages=int(max_messages) if max_messages else None,
+    )
+    running_status = os.getenv("MIDI_RUNNING_STATUS", "0") == "1"
+    checker = VoiceChecker(dut, running_status=running_status)
+    await midi.send(messages, running_status=running_status, on_message=checker)
+    dut._log.info(f"MIDI file playback: {checker.monitor.report()}")
+    checker.check()
+
+
+def test_runner():
+    """Simulate the UART midi_rx (sim/midi_rx.sv) using the Python runner."""
+    sim = os.getenv("SIM", "icarus")
+    proj_path = Path(__file__).resolve().parent.parent
+    sources = [proj_path / "sim" / "midi_rx.sv"]
+    run_testbench(
+        test_file=test_file,
+        hdl_toplevel="midi_rx",
+        sources=sources,
+        build_args=["-Wall"],
+        parameters={},
+        test_args=[],
+        sim=sim
+    )
+
+
+if __name__ == "__main__":
+    test_runner()
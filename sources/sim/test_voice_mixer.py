@@ -5,81 +5,66 @@ import numpy as np
 import matplotlib.pyplot as plt
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge
-from cocotb.runner import get_runner
+from cocotb.triggers import FallingEdge, RisingEdge
+from axis import AxisSink, AxisSource, random_pattern
+from plot_capture import deferred_plot
+from sim_runner import run_testbench
+
+sys.path.append(str(Path(__file__).resolve().parent / "model"))
+import voice_mixer_model
 
 test_file = os.path.basename(__file__).replace(".py", "")
 
 # Generate sine wave samples
 SAMPLE_RATE = 100e6  # 100 MHz clock
-FREQUENCIES = [440, 880, 1320, 1760, 2200, 2640, 3080, 3520]  # Hz for 8 voices
+FREQUENCIES = [440 * (k + 1) for k in range(32)]  # Hz, harmonics of A4 for up to 32 voices
 AMPLITUDE = 0x10000000  # ~0.125 of max int32
-
-def generate_sine_samples(frequency, num_samples):
-    """Generate sine wave samples at SAMPLE_RATE"""
-    t = np.arange(num_samples) / SAMPLE_RATE
-    samples = AMPLITUDE * np.sin(2 * np.pi * frequency * t)
+# Samples per test; the sine test used to run 100000, e.g. VOICE_MIXER_SAMPLES=100000
+NUM_SAMPLES = int(os.getenv("VOICE_MIXER_SAMPLES", "20000"))
+# Builds the runner checks; NUM_VOICES must be a power of two
+VOICE_COUNTS = (8, 16, 32)
+
+def generate_sine_samples(frequencies, num_samples):
+    """Sine samples at SAMPLE_RATE, shaped (num_samples, voices)"""
+    t = np.arange(num_samples)[:, None] / SAMPLE_RATE
+    samples = AMPLITUDE * np.sin(2 * np.pi * np.asarray(frequencies) * t)
     return samples.astype(np.int32)
 
 
-@cocotb.test()
-async def test_voice_mixer_sine_waves(dut):
-    """Test voice mixer with sine wave inputs and plot output"""
-    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
+def geometry(dut):
+    """(DATA_WIDTH, NUM_VOICES) of the build, read off the port widths"""
+    data_width = len(dut.mixed_out)
+    return data_width, len(dut.voice_in_flat) // data_width
+
 
-    # Reset
+async def reset(dut):
+    cocotb.start_soon(Clock(dut.clk, 10, units="ns").start(start_high=False))
     dut.rst.value = 1
     dut.data_in_valid.value = 0
-    for i in range(8):
-        dut.voice_in[i].value = 0
-
+    dut.voice_in_flat.value = 0
     await RisingEdge(dut.clk)
     await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
     dut.rst.value = 0
-    await RisingEdge(dut.clk)
 
-    # Generate sine wave samples for each voice
-    num_samples = 100000  # ~1ms of audio at 100MHz
-    voice_samples = [
-        generate_sine_samples(FREQUENCIES[i], num_samples)
-        for i in range(8)
-    ]
-
-    # Collect output data
-    collected_outputs = []
-    collected_valid = []
-    sample_indices = [0] * 8
-
-    print("\nFeeding sine wave data and collecting output...")
-    print(f"Sampling {num_samples} samples ({num_samples/SAMPLE_RATE*1e3:.2f}ms at 100MHz)")
-    print(f"Voice frequencies: {FREQUENCIES} Hz")
-
-    # Feed in samples and collect output
-    for sample_idx in range(num_samples + 10):  # +10 to drain pipeline
-        dut.data_in_valid.value = 1 if sample_idx < num_samples else 0
-
-        # Set voice inputs
-        if sample_idx < num_samples:
-            for voice_idx in range(8):
-                dut.voice_in[voice_idx].value = int(voice_samples[voice_idx][sample_idx])
-
-        await RisingEdge(dut.clk)
-
-        # Collect output
-        if dut.data_out_valid.value == 1:
-            output = dut.mixed_out.value.signed_integer
-            collected_outputs.append(output)
-            collected_valid.append(True)
-        else:
-            collected_valid.append(False)
-
-    print(f"Collected {len(collected_outputs)} valid output samples\n")
-
-    # Plot results
-    if not collected_outputs:
-        print("ERROR: No valid output data collected!")
-        return
 
+async def stream_against_model(dut, voices, valid_pattern=None):
+    """Drive voices (samples, NUM_VOICES) one packed voice_in_flat write per beat, check mixed_out"""
+    data_width, _ = geometry(dut)
+    source = AxisSource(dut.clk, dut.voice_in_flat, dut.data_in_valid, valid_pattern=valid_pattern)
+    sink = AxisSink(dut.clk, dut.mixed_out, dut.data_out_valid, signed=True)
+    cocotb.start_soon(source.send(voice_mixer_model.pack(voices, data_width)))
+    outputs, _ = await sink.collect(len(voices))
+
+    expected = voice_mixer_model.mix(voices, data_width)
+    mismatch = np.flatnonzero(outputs != expected)
+    assert len(mismatch) == 0, \
+        f"Sample {mismatch[0]}: DUT {outputs[mismatch[0]]}, model {expected[mismatch[0]]} ({len(mismatch)} mismatches)"
+    return outputs
+
+
+@deferred_plot("voice_mixer_output.png")
+def plot_voice_mixer(voice_samples, collected_outputs):
     # Create time array (in microseconds)
     time_us = np.arange(len(collected_outputs)) * 10 / 1000  # 10ns per sample -> us
 
@@ -90,7 +75,7 @@ async def test_voice_mixer_sine_waves(dut):
     detail_time_us = np.arange(detail_samples) * 10 / 1000
 
     for voice_idx in range(8):
-        detail_samples_data = voice_samples[voice_idx][:detail_samples]
+        detail_samples_data = voice_samples[:detail_samples, voice_idx]
         axes[0].plot(
             detail_time_us, detail_samples_data,
             label=f"Voice {voice_idx} ({FREQUENCIES[voice_idx]}Hz)",
@@ -123,24 +108,51 @@ async def test_voice_mixer_sine_waves(dut):
 
     plt.tight_layout()
 
-    # Save plot
-    plot_path = Path(__file__).resolve().parent / "voice_mixer_output.png"
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    print(f"Plot saved to {plot_path}")
-    plt.show()
 
-    # Print statistics
-    min_val = min(collected_outputs)
-    max_val = max(collected_outputs)
-    mean_val = np.mean(collected_outputs)
-    std_val = np.std(collected_outputs)
+@cocotb.test()
+async def test_voice_mixer_sine_waves(dut):
+    """Sine wave voices, one per clock, match voice_mixer_model (plotted for the 8-voice build)"""
+    await reset(dut)
+    _, num_voices = geometry(dut)
+
+    # Generate sine wave samples for each voice
+    voice_samples = generate_sine_samples(FREQUENCIES[:num_voices], NUM_SAMPLES)
+
+    print(f"\nSampling {NUM_SAMPLES} samples ({NUM_SAMPLES/SAMPLE_RATE*1e3:.2f}ms at 100MHz)")
+    print(f"Voice frequencies: {FREQUENCIES[:num_voices]} Hz")
+
+    collected_outputs = await stream_against_model(dut, voice_samples)
+    if num_voices == 8:
+        plot_voice_mixer(voice_samples=voice_samples, collected_outputs=collected_outputs)
 
     print(f"\nOutput Statistics:")
-    print(f"  Min: {min_val}")
-    print(f"  Max: {max_val}")
-    print(f"  Mean: {mean_val:.2f}")
-    print(f"  Std Dev: {std_val:.2f}")
-    print(f"\nTest completed successfully!")
+    print(f"  Min: {collected_outputs.min()}")
+    print(f"  Max: {collected_outputs.max()}")
+    print(f"  Mean: {collected_outputs.mean():.2f}")
+    print(f"  Std Dev: {collected_outputs.std():.2f}")
+
+
+@cocotb.test()
+async def test_voice_mixer_full_scale(dut):
+    """Full-scale random voices, which saturate at every stage, match the model bit for bit"""
+    await reset(dut)
+    data_width, num_voices = geometry(dut)
+    rng = np.random.default_rng(num_voices)
+    voices = rng.integers(-2**(data_width - 1), 2**(data_width - 1), size=(NUM_SAMPLES, num_voices))
+    # Runs of voices pinned at the rails, where the pairwise saturation matters most
+    rails = np.array([-2**(data_width - 1), 2**(data_width - 1) - 1])
+    voices[::7] = rails[rng.integers(0, 2, size=voices[::7].shape)]
+    await stream_against_model(dut, voices)
+
+
+@cocotb.test()
+async def test_voice_mixer_gaps(dut):
+    """Random gaps between strobes: each stage only loads with its valid, so nothing changes"""
+    await reset(dut)
+    data_width, num_voices = geometry(dut)
+    voices = np.random.default_rng(1).integers(-2**(data_width - 1), 2**(data_width - 1),
+                                               size=(NUM_SAMPLES // 4, num_voices))
+    await stream_against_model(dut, voices, valid_pattern=random_pattern(0.4, seed=2))
 
 
 def test_runner():
@@ -154,22 +166,15 @@ def test_runner():
     build_test_args = ["-Wall"]
     hdl_toplevel = "voice_mixer"
 
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
-        hdl_toplevel=hdl_toplevel,
-        always=True,
-        build_args=build_test_args,
-        parameters={"DATA_WIDTH": 32, "NUM_VOICES": 8},
-        timescale=('1ns', '1ps'),
-        waves=True
-    )
-
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        waves=True
-    )
+    for num_voices in VOICE_COUNTS:
+        run_testbench(
+            test_file=test_file,
+            hdl_toplevel=hdl_toplevel,
+            sources=sources,
+            build_args=build_test_args,
+            parameters={"DATA_WIDTH": 32, "NUM_VOICES": num_voices},
+            sim=sim
+        )
 
 
 if __name__ == "__main__":
@@ -266,7 +266,7 @@ async def test_waterfall_buffer_cdc_stability(dut):
 
 def test_runner():
     """Simulate the waterfall buffer using the Python runner."""
-    from cocotb.runner import get_runner
+    from sim_runner import run_testbench
 
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")
@@ -282,22 +282,13 @@ def test_runner():
     build_test_args = ["-Wall"]
     parameters = {}
 
-    runner = get_runner(sim)
-    runner.build(
-        sources=sources,
+    run_testbench(
+        test_file=test_file,
         hdl_toplevel=hdl_toplevel,
-        always=True,
+        sources=sources,
         build_args=build_test_args,
         parameters=parameters,
-        timescale=('1ns','1ps'),
-        waves=True
-    )
-
-    runner.test(
-        hdl_toplevel=hdl_toplevel,
-        test_module=test_file,
-        test_args=[],
-        waves=True
+        sim=sim
     )
 
 if __name__ == "__main__":